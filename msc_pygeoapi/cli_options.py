@@ -225,6 +225,42 @@ def OPTION_BATCH_SIZE(*args, **kwargs):
     return click.option(*args, **kwargs)
 
 
+def OPTION_BULK_WORKERS(*args, **kwargs):
+
+    default_args = ['--bulk-workers']
+
+    default_kwargs = {
+        'type': click.IntRange(1, 64),
+        'required': False,
+        'help': 'Number of concurrent bulk requests to ES index',
+    }
+
+    if not args:
+        args = default_args
+
+    kwargs = {**default_kwargs, **kwargs} if kwargs else default_kwargs
+
+    return click.option(*args, **kwargs)
+
+
+def OPTION_RESUME(*args, **kwargs):
+
+    default_args = ['--resume']
+
+    default_kwargs = {
+        'is_flag': True,
+        'default': False,
+        'help': 'Resume an interrupted load from its checkpoint',
+    }
+
+    if not args:
+        args = default_args
+
+    kwargs = {**default_kwargs, **kwargs} if kwargs else default_kwargs
+
+    return click.option(*args, **kwargs)
+
+
 def OPTION_YES(**kwargs):
 
     default_kwargs = {
@@ -28,13 +28,25 @@
 #
 # =================================================================
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
+import threading
+import time
 
-from elasticsearch import Elasticsearch, logger as elastic_logger
-from elasticsearch.helpers import streaming_bulk, BulkIndexError
+from elasticsearch import ApiError, Elasticsearch, logger as elastic_logger
+from elasticsearch.helpers import expand_action, BulkIndexError
 
 from msc_pygeoapi.connector.base import BaseConnector
 from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_ES_BULK_INITIAL_BACKOFF,
+    MSC_PYGEOAPI_ES_BULK_MAX_BACKOFF,
+    MSC_PYGEOAPI_ES_BULK_MAX_BYTES,
+    MSC_PYGEOAPI_ES_BULK_MAX_RETRIES,
+    MSC_PYGEOAPI_ES_BULK_WORKERS,
+    MSC_PYGEOAPI_ES_BULK_SINK_MAX_BYTES,
+    MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS,
+    MSC_PYGEOAPI_ES_BULK_SINK_MAX_WAIT,
     MSC_PYGEOAPI_ES_USERNAME,
     MSC_PYGEOAPI_ES_PASSWORD,
     MSC_PYGEOAPI_ES_URL,
@@ -45,6 +57,97 @@ from msc_pygeoapi.env import (
 LOGGER = logging.getLogger(__name__)
 elastic_logger.setLevel(getattr(logging, MSC_PYGEOAPI_LOGGING_LOGLEVEL))
 
+# index settings applied while bulk loading a new index generation
+BULK_LOAD_SETTINGS = {
+    'refresh_interval': '-1',
+    'number_of_replicas': 0,
+    'translog.durability': 'async',
+    'translog.flush_threshold_size': '1gb'
+}
+
+
+def get_bulk_result(response):
+    """
+    helper function to get the result of a bulk API response item
+
+    :param response: `dict` of bulk API response item
+
+    :returns: `str` of result (created, updated, noop, etc.)
+    """
+
+    return next(iter(response.values())).get('result')
+
+
+def serialize_action(action, serializer):
+    """
+    helper function to serialize a bulk API action once, so that it can
+    be measured and sent without being serialized again
+
+    :param action: `dict` of bulk API action
+    :param serializer: JSON serializer of the Elasticsearch client
+
+    :returns: `tuple` of (`dict` of bulk API action header, `list` of
+              `bytes` of NDJSON lines)
+    """
+
+    header, data = expand_action(action)
+    lines = [serializer.dumps(header)]
+
+    if data is not None:
+        if not isinstance(data, (bytes, str)):
+            data = serializer.dumps(data)
+        lines.append(data)
+
+    lines = [line.encode('utf-8') if isinstance(line, str) else line
+             for line in lines]
+
+    return header, lines
+
+
+def get_action_size(action):
+    """
+    helper function to get the size of a serialized bulk API action
+
+    :param action: `tuple` of serialized bulk API action
+                   (see `serialize_action`)
+
+    :returns: `int` of size in bytes
+    """
+
+    return sum(len(line) + 1 for line in action[1])
+
+
+def chunk_actions(actions, max_docs, max_bytes):
+    """
+    helper function to split bulk API actions in chunks bounded by number
+    of documents and size
+
+    :param actions: Iterable of serialized bulk API actions
+                    (see `serialize_action`)
+    :param max_docs: maximum number of documents per chunk
+    :param max_bytes: maximum size (bytes) per chunk
+
+    :returns: Generator of `list` of serialized bulk API actions
+    """
+
+    chunk = []
+    size = 0
+
+    for action in actions:
+        action_size = get_action_size(action)
+
+        if chunk and (len(chunk) >= max_docs or
+                      size + action_size > max_bytes):
+            yield chunk
+            chunk = []
+            size = 0
+
+        chunk.append(action)
+        size += action_size
+
+    if chunk:
+        yield chunk
+
 
 class ElasticsearchConnector(BaseConnector):
     """Elasticsearch Connector"""
@@ -66,6 +169,8 @@ class ElasticsearchConnector(BaseConnector):
             self.url = 'http://localhost:9200'
 
         self.verify_certs = connector_def.get('verify_certs', True)
+        self.bulk_workers = connector_def.get(
+            'bulk_workers', MSC_PYGEOAPI_ES_BULK_WORKERS)
 
         if 'auth' in connector_def:
             self.auth = connector_def['auth']
@@ -218,7 +323,19 @@ class ElasticsearchConnector(BaseConnector):
         """
 
         if not self.Elasticsearch.indices.exists_alias(name=alias):
-            self.Elasticsearch.indices.put_alias(index=index, name=alias)
+            if self.Elasticsearch.indices.exists(index=alias):
+                # replace an (unversioned) index named like the alias
+                LOGGER.info(f'Replacing index {alias} by alias to {index}')
+                self.Elasticsearch.indices.update_aliases(
+                    body={
+                        'actions': [
+                            {'add': {'index': index, 'alias': alias}},
+                            {'remove_index': {'index': alias}},
+                        ]
+                    }
+                )
+            else:
+                self.Elasticsearch.indices.put_alias(index=index, name=alias)
         elif overwrite:
             self.Elasticsearch.indices.update_aliases(
                 body={
@@ -234,8 +351,197 @@ class ElasticsearchConnector(BaseConnector):
 
         return True
 
+    def create_generation(self, alias, version, mapping):
+        """
+        create a versioned index (generation) of an alias, with settings
+        optimized for bulk loading. An existing generation (e.g. of a
+        resumed load) is kept.
+
+        :param alias: `str` alias name
+        :param version: `str` version of index generation
+        :param mapping: `dict` mapping of index to create
+
+        :returns: `str` name of index generation
+        """
+
+        index_name = f'{alias}.{version}'
+
+        settings = {**mapping.get('settings', {}), **BULK_LOAD_SETTINGS}
+        if self.create(index_name, {**mapping, 'settings': settings}):
+            LOGGER.info(f'Created index {index_name}')
+
+        return index_name
+
+    def swap_alias(self, alias, index, settings={}):
+        """
+        swap an alias to a loaded index generation: restores production
+        settings, validates the index, atomically points the alias to it
+        and deletes older generations
+
+        :param alias: `str` alias name
+        :param index: `str` index generation name
+        :param settings: `dict` of production settings of index
+
+        :returns: `bool` of whether the alias was swapped
+        """
+
+        production_settings = {
+            key: settings.get(key) for key in BULK_LOAD_SETTINGS
+        }
+        self.Elasticsearch.indices.put_settings(
+            index=index, body=production_settings
+        )
+        self.Elasticsearch.indices.refresh(index=index)
+
+        count = self.Elasticsearch.count(index=index)['count']
+        if count == 0:
+            LOGGER.error(f'Index {index} is empty, not swapping alias {alias}')
+            return False
+
+        LOGGER.info(f'Setting alias {alias} to {index} ({count} documents)')
+        self.create_alias(alias, index, overwrite=True)
+
+        generations = [
+            generation for generation in self.get(f'{alias}.*')
+            if generation != index
+        ]
+        if generations:
+            self.delete(','.join(generations))
+
+        return True
+
+    def _serialize(self, actions):
+        """
+        helper function to serialize bulk API actions
+
+        :param actions: Iterable of bulk API actions
+
+        :returns: Generator of serialized bulk API actions
+        """
+
+        serializer = self.Elasticsearch.transport.serializers.get_serializer(
+            'application/json'
+        )
+
+        for action in actions:
+            yield serialize_action(action, serializer)
+
+    def _bulk_chunk(self, chunk, refresh=False):
+        """
+        helper function to submit a chunk of serialized bulk API actions,
+        retrying rejected (HTTP 429) actions with exponential backoff.
+        Unlike `elasticsearch.helpers.streaming_bulk`, which yields retried
+        actions after the rest of their chunk, results are returned in the
+        order of the chunk.
+
+        :param chunk: `list` of serialized bulk API actions
+        :param refresh: indicates whether to refresh the index
+
+        :returns: `list` of (`bool`, `dict`) of bulk API results
+        """
+
+        client = self.Elasticsearch.options(
+            request_timeout=MSC_PYGEOAPI_ES_TIMEOUT
+        )
+        max_retries = MSC_PYGEOAPI_ES_BULK_MAX_RETRIES
+        results = [None] * len(chunk)
+        pending = list(range(len(chunk)))
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                time.sleep(min(
+                    MSC_PYGEOAPI_ES_BULK_MAX_BACKOFF,
+                    MSC_PYGEOAPI_ES_BULK_INITIAL_BACKOFF * 2 ** (attempt - 1)
+                ))
+
+            operations = [line for i in pending for line in chunk[i][1]]
+
+            try:
+                items = client.bulk(
+                    operations=operations, refresh=refresh
+                )['items']
+            except ApiError as err:
+                items = []
+                for i in pending:
+                    op_type, meta = next(iter(chunk[i][0].items()))
+                    items.append({op_type: dict(
+                        meta, status=err.status_code, error=str(err),
+                        exception=err
+                    )})
+
+            retries = []
+
+            for i, item in zip(pending, items):
+                status = next(iter(item.values())).get('status', 500)
+
+                if status == 429 and attempt < max_retries:
+                    retries.append(i)
+                else:
+                    results[i] = (200 <= status < 300, item)
+
+            if not retries:
+                break
+
+            LOGGER.debug(f'Retrying {len(retries)} rejected actions')
+            pending = retries
+
+        return results
+
+    def _streaming_bulk(self, actions, request_size, refresh=False):
+        """
+        helper function to submit bulk API actions, retrying with
+        exponential backoff on rejected (HTTP 429) requests
+
+        :param actions: Iterable of bulk API actions
+        :param request_size: Number of documents to upload per request
+        :param refresh: indicates whether to refresh the index
+
+        :returns: Generator of (`bool`, `dict`) of bulk API results, in
+                  the order of the actions
+        """
+
+        chunks = chunk_actions(self._serialize(actions), request_size,
+                               MSC_PYGEOAPI_ES_BULK_MAX_BYTES)
+
+        for chunk in chunks:
+            yield from self._bulk_chunk(chunk, refresh)
+
+    def _parallel_bulk(self, package, request_size, workers, refresh=False):
+        """
+        helper function to submit bulk API actions with concurrent
+        in-flight requests.  Chunks are bounded by number of documents and
+        size, and reading from the package blocks while all workers are
+        busy.
+
+        :param package: Iterable of bulk API actions
+        :param request_size: Number of documents to upload per request
+        :param workers: Number of concurrent in-flight requests
+        :param refresh: indicates whether to refresh the index
+
+        :returns: Generator of (`bool`, `dict`) of bulk API results, in
+                  the order of the actions
+        """
+
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunks = chunk_actions(self._serialize(package), request_size,
+                                   MSC_PYGEOAPI_ES_BULK_MAX_BYTES)
+
+            for chunk in chunks:
+                if len(in_flight) >= workers:
+                    yield from in_flight.popleft().result()
+
+                in_flight.append(
+                    executor.submit(self._bulk_chunk, chunk, refresh)
+                )
+
+            while in_flight:
+                yield from in_flight.popleft().result()
+
     def submit_elastic_package(
-        self, package, request_size=10000, refresh=False
+        self, package, request_size=10000, refresh=False, workers=None,
+        callback=None
     ):
         """
         helper function to send an update request to Elasticsearch and
@@ -244,6 +550,11 @@ class ElasticsearchConnector(BaseConnector):
         :param package: Iterable of bulk API update actions.
         :param request_size: Number of documents to upload per request.
         :param refresh: indicates whether to refresh the index
+        :param workers: Number of concurrent in-flight requests (defaults
+                        to the connector's `bulk_workers`).
+        :param callback: function called with (`bool`, `dict`) of each
+                         bulk API result, in package order (retried
+                         actions included).
         :returns: `bool` of whether the operation was successful.
         """
 
@@ -252,19 +563,26 @@ class ElasticsearchConnector(BaseConnector):
         noops = 0
         errors = []
 
+        if workers is None:
+            workers = self.bulk_workers
+
+        if workers > 1:
+            LOGGER.debug(f'Submitting package with {workers} workers')
+            results = self._parallel_bulk(
+                package, request_size, workers, refresh
+            )
+        else:
+            results = self._streaming_bulk(package, request_size, refresh)
+
         try:
-            for ok, response in streaming_bulk(
-                self.Elasticsearch,
-                package,
-                chunk_size=request_size,
-                request_timeout=MSC_PYGEOAPI_ES_TIMEOUT,
-                raise_on_error=False,
-                refresh=refresh
-            ):
+            for ok, response in results:
+                if callback is not None:
+                    callback(ok, response)
+
                 if not ok:
                     errors.append(response)
                 else:
-                    status = response['update']['result']
+                    status = get_bulk_result(response)
 
                     if status == 'created':
                         inserts += 1
@@ -313,3 +631,192 @@ class ElasticsearchConnector(BaseConnector):
 
     def __repr__(self):
         return f'<ElasticsearchConnector> {self.url}'
+
+
+class ElasticsearchBulkSink:
+    """
+    Elasticsearch coalescing bulk sink
+
+    Gathers bulk API actions from many packages (e.g. one per realtime
+    file) and submits them in as few bulk requests as possible, flushing
+    on a document count, a byte size or a time deadline.
+    """
+
+    def __init__(self, conn, max_docs=MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS,
+                 max_bytes=MSC_PYGEOAPI_ES_BULK_SINK_MAX_BYTES,
+                 max_wait=MSC_PYGEOAPI_ES_BULK_SINK_MAX_WAIT):
+        """
+        initializer
+
+        :param conn: `msc_pygeoapi.connector.elasticsearch_.ElasticsearchConnector`
+        :param max_docs: number of buffered documents triggering a flush
+        :param max_bytes: size (bytes) of buffered documents triggering
+                          a flush
+        :param max_wait: maximum number of seconds a document is buffered
+
+        :returns: `msc_pygeoapi.connector.elasticsearch_.ElasticsearchBulkSink`
+        """  # noqa
+
+        self.conn = conn
+        self.max_docs = max(max_docs, 1)
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+
+        self._serializer = \
+            conn.Elasticsearch.transport.serializers.get_serializer(
+                'application/json'
+            )
+        self._lock = threading.Lock()
+        self._actions = []
+        self._bytes = 0
+        self._timer = None
+
+    def submit(self, package, key=None):
+        """
+        add a package of bulk API actions to the sink
+
+        :param package: Iterable of bulk API actions
+        :param key: identifier of the package (e.g. filepath) for reporting
+
+        :returns: `concurrent.futures.Future` resolving to a `bool` of
+                  whether all actions of the package were successful
+        """
+
+        entry = {
+            'key': key,
+            'future': Future(),
+            'remaining': 0,
+            'errors': []
+        }
+
+        actions = [serialize_action(action, self._serializer)
+                   for action in package]
+
+        if not actions:
+            entry['future'].set_result(True)
+            return entry['future']
+
+        entry['remaining'] = len(actions)
+
+        with self._lock:
+            for action in actions:
+                self._actions.append((entry, action))
+                self._bytes += get_action_size(action)
+
+            flush = any([len(self._actions) >= self.max_docs,
+                         self._bytes >= self.max_bytes])
+
+            if not flush and self._timer is None:
+                self._timer = threading.Timer(self.max_wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush:
+            self.flush()
+
+        return entry['future']
+
+    def flush(self):
+        """
+        submit all buffered actions to Elasticsearch
+
+        :returns: `bool` of whether all buffered actions were successful
+        """
+
+        with self._lock:
+            buffered = self._actions
+            self._actions = []
+            self._bytes = 0
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not buffered:
+            return True
+
+        entries = [entry for entry, action in buffered]
+        actions = [action for entry, action in buffered]
+        packages = len({id(entry) for entry in entries})
+
+        inserts = 0
+        updates = 0
+        noops = 0
+        errors = 0
+        done = 0
+
+        try:
+            # results are returned in the order of the actions
+            results = (
+                result
+                for chunk in chunk_actions(actions, len(actions),
+                                           self.max_bytes)
+                for result in self.conn._bulk_chunk(chunk)
+            )
+
+            for entry, (ok, response) in zip(entries, results):
+                status = get_bulk_result(response) if ok else None
+
+                if status == 'created':
+                    inserts += 1
+                elif status == 'updated':
+                    updates += 1
+                elif status == 'noop':
+                    noops += 1
+                else:
+                    if ok:
+                        LOGGER.error(f'Unhandled status code {status}')
+                    entry['errors'].append(response)
+                    errors += 1
+
+                self._resolve(entry)
+                done += 1
+        except Exception as err:
+            LOGGER.error(f'Unable to perform bulk insert due to: {err}')
+            for entry in entries[done:]:
+                entry['errors'].append(str(err))
+                self._resolve(entry)
+            return False
+
+        total = inserts + updates + noops
+        LOGGER.info(
+            f'Inserted {packages} packages of {total} documents '
+            f'({inserts} inserts, {updates} updates, {noops} no-ops)'
+        )
+
+        return errors == 0
+
+    def close(self):
+        """
+        flush buffered actions and stop the time deadline
+
+        :returns: `bool` of whether all buffered actions were successful
+        """
+
+        return self.flush()
+
+    @staticmethod
+    def _resolve(entry):
+        """
+        report the result of a package once all its actions are done
+
+        :param entry: `dict` of buffered package
+
+        :returns: `None`
+        """
+
+        entry['remaining'] -= 1
+
+        if entry['remaining'] > 0 or entry['future'].done():
+            return
+
+        if entry['errors']:
+            LOGGER.warning(
+                f'{len(entry["errors"])} errors encountered in bulk insert '
+                f'of {entry["key"]}: {entry["errors"]}'
+            )
+
+        entry['future'].set_result(not entry['errors'])
+
+    def __repr__(self):
+        return f'<ElasticsearchBulkSink> {self.conn.url}'
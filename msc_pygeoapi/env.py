@@ -47,6 +47,62 @@ MSC_PYGEOAPI_ES_URL = os.getenv('MSC_PYGEOAPI_ES_URL', None)
 MSC_PYGEOAPI_ES_TIMEOUT = int(os.getenv('MSC_PYGEOAPI_ES_TIMEOUT', 90))
 MSC_PYGEOAPI_CACHEDIR = os.getenv('MSC_PYGEOAPI_CACHEDIR', '/tmp')
 
+MSC_PYGEOAPI_ES_MAPPING_CACHE_TTL = float(
+    os.getenv('MSC_PYGEOAPI_ES_MAPPING_CACHE_TTL', 300))
+MSC_PYGEOAPI_ES_MAPPING_CACHE_WARM = os.getenv(
+    'MSC_PYGEOAPI_ES_MAPPING_CACHE_WARM', 'false').lower() == 'true'
+MSC_PYGEOAPI_ES_BULK_WORKERS = int(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_WORKERS', 1))
+MSC_PYGEOAPI_ES_BULK_MAX_BYTES = int(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_MAX_BYTES', 104857600))
+MSC_PYGEOAPI_ES_BULK_MAX_RETRIES = int(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_MAX_RETRIES', 3))
+MSC_PYGEOAPI_ES_BULK_INITIAL_BACKOFF = float(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_INITIAL_BACKOFF', 2))
+MSC_PYGEOAPI_ES_BULK_MAX_BACKOFF = float(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_MAX_BACKOFF', 600))
+MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS = int(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS', 0))
+MSC_PYGEOAPI_ES_BULK_SINK_MAX_BYTES = int(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_SINK_MAX_BYTES', 10485760))
+MSC_PYGEOAPI_ES_BULK_SINK_MAX_WAIT = float(
+    os.getenv('MSC_PYGEOAPI_ES_BULK_SINK_MAX_WAIT', 5))
+
+MSC_PYGEOAPI_LOADER_WORKERS = int(os.getenv('MSC_PYGEOAPI_LOADER_WORKERS', 0))
+MSC_PYGEOAPI_LOADER_POOL_TYPE = os.getenv('MSC_PYGEOAPI_LOADER_POOL_TYPE',
+                                          'thread')
+MSC_PYGEOAPI_LOADER_QUEUE_SIZE = int(
+    os.getenv('MSC_PYGEOAPI_LOADER_QUEUE_SIZE', 100))
+
+MSC_PYGEOAPI_XARRAY_CACHE_SIZE = int(
+    os.getenv('MSC_PYGEOAPI_XARRAY_CACHE_SIZE', 16))
+MSC_PYGEOAPI_XARRAY_CACHE_TTL = float(
+    os.getenv('MSC_PYGEOAPI_XARRAY_CACHE_TTL', 3600))
+
+MSC_PYGEOAPI_SOUNDING_WORKERS = int(
+    os.getenv('MSC_PYGEOAPI_SOUNDING_WORKERS', 8))
+MSC_PYGEOAPI_SOUNDING_CACHE_SIZE = int(
+    os.getenv('MSC_PYGEOAPI_SOUNDING_CACHE_SIZE', 0))
+MSC_PYGEOAPI_EXTRACT_RASTER_CACHE_TTL = float(
+    os.getenv('MSC_PYGEOAPI_EXTRACT_RASTER_CACHE_TTL', 60))
+MSC_PYGEOAPI_EXTRACT_RASTER_WORKERS = int(
+    os.getenv('MSC_PYGEOAPI_EXTRACT_RASTER_WORKERS', 8))
+MSC_PYGEOAPI_FILE_INDEX_TTL = float(
+    os.getenv('MSC_PYGEOAPI_FILE_INDEX_TTL', 60))
+MSC_PYGEOAPI_DATASET_POOL_SIZE = int(
+    os.getenv('MSC_PYGEOAPI_DATASET_POOL_SIZE', 64))
+MSC_PYGEOAPI_GDAL_CACHEMAX = os.getenv('MSC_PYGEOAPI_GDAL_CACHEMAX', None)
+MSC_PYGEOAPI_GDAL_DISABLE_READDIR_ON_OPEN = os.getenv(
+    'MSC_PYGEOAPI_GDAL_DISABLE_READDIR_ON_OPEN', None)
+MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH = os.getenv(
+    'MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH', None)
+MSC_PYGEOAPI_COVERAGE_WINDOW_MAX_PIXELS = int(
+    os.getenv('MSC_PYGEOAPI_COVERAGE_WINDOW_MAX_PIXELS', 16))
+MSC_PYGEOAPI_COVERAGE_RANGE_WORKERS = int(
+    os.getenv('MSC_PYGEOAPI_COVERAGE_RANGE_WORKERS', 4))
+MSC_PYGEOAPI_COVERAGE_RANGE_MAX_VALUES = int(
+    os.getenv('MSC_PYGEOAPI_COVERAGE_RANGE_MAX_VALUES', 100000000))
+
 MSC_PYGEOAPI_ES_USERNAME = os.getenv('MSC_PYGEOAPI_ES_USERNAME', None)
 MSC_PYGEOAPI_ES_PASSWORD = os.getenv('MSC_PYGEOAPI_ES_PASSWORD', None)
 
@@ -63,3 +119,7 @@ MSC_PYGEOAPI_BASEPATH = os.path.dirname(os.path.realpath(__file__))
 
 GEOMET_HPFX_BASEPATH = os.getenv('GEOMET_HPFX_BASEPATH', None)
 GEOMET_SCIENCE_BASEPATH = os.getenv('GEOMET_SCIENCE_BASEPATH', None)
+GEOMET_CLIMATE_POINT_STORE_BASEPATH = os.getenv(
+    'GEOMET_CLIMATE_POINT_STORE_BASEPATH', None)
+GEOMET_SOUNDING_PROFILE_BASEPATH = os.getenv(
+    'GEOMET_SOUNDING_PROFILE_BASEPATH', None)
@@ -33,7 +33,10 @@ class FileEvent:
 
     def __init__(self, parent):
         """initialize"""
-        pass
+
+        from msc_pygeoapi.handler.pool import LoaderDispatcher
+
+        self.dispatcher = LoaderDispatcher()
 
     def on_file(self, parent):
         """
@@ -45,18 +48,32 @@ class FileEvent:
         """
 
         try:
-            from msc_pygeoapi.handler.core import CoreHandler
-
             filepath = parent.msg.local_file
             parent.logger.debug(f'Filepath: {filepath}')
-            handler = CoreHandler(filepath)
-            result = handler.handle()
-            parent.logger.debug(f'Result: {result}')
-            return True
+
+            return self.dispatcher.dispatch(filepath)
         except Exception as err:
             parent.logger.warning(err)
             return False
 
+    def on_stop(self, parent):
+        """
+        sarracenia shutdown hook
+
+        :param parent: `sarra.sr_subscribe.sr_subscribe`
+
+        :returns: `bool` of result
+        """
+
+        failures = self.dispatcher.stop()
+
+        if failures:
+            parent.logger.error(
+                f'{len(failures)} files failed to load: {failures}')
+            return False
+
+        return True
+
     def __repr__(self):
         return '<Event>'
 
@@ -28,12 +28,84 @@
 # =================================================================
 
 import logging
+import threading
 
 from msc_pygeoapi.handler.base import BaseHandler
 from msc_pygeoapi.plugin import PLUGINS, load_plugin
 
 LOGGER = logging.getLogger(__name__)
 
+# loaders hold per-file state, so cached instances are kept per thread
+# (and hence per process)
+_LOADER_CACHE = threading.local()
+
+# all cached loaders of the current process, for flushing at shutdown
+_LOADERS = []
+_LOADERS_LOCK = threading.Lock()
+
+
+def get_plugin_key(filepath):
+    """
+    detect loader plugin key from filename pattern
+
+    :param filepath: path to file
+
+    :returns: `str` of plugin key (or `None` if no plugin matches)
+    """
+
+    plugin_key = None
+
+    LOGGER.debug('Detecting filename pattern')
+    for key, plugin_def in PLUGINS['loader'].items():
+        if plugin_def['filename_pattern'] in filepath:
+            plugin_key = key
+
+    return plugin_key
+
+
+def get_loader(key):
+    """
+    get cached loader instance for a plugin key, loading it on first use
+
+    :param key: loader plugin key
+
+    :returns: loader object
+    """
+
+    loaders = getattr(_LOADER_CACHE, 'loaders', None)
+    if loaders is None:
+        loaders = _LOADER_CACHE.loaders = {}
+
+    if key not in loaders:
+        plugin_def = PLUGINS['loader'][key]
+        LOGGER.debug(f'Loading plugin {plugin_def}')
+        loaders[key] = load_plugin('loader', plugin_def)
+
+        with _LOADERS_LOCK:
+            _LOADERS.append(loaders[key])
+
+    return loaders[key]
+
+
+def close_loaders():
+    """
+    flush the bulk sinks of the cached loaders of the current process
+
+    :returns: `bool` of whether all buffered actions were successful
+    """
+
+    with _LOADERS_LOCK:
+        loaders = list(_LOADERS)
+
+    result = True
+    for loader in loaders:
+        sink = getattr(loader, 'sink', None)
+        if sink is not None:
+            LOGGER.debug(f'Flushing bulk sink of {loader}')
+            result = sink.close() and result
+
+    return result
+
 
 class CoreHandler(BaseHandler):
     """base handler"""
@@ -48,6 +120,7 @@ class CoreHandler(BaseHandler):
         """
 
         self.plugin = None
+        self.status = None
 
         BaseHandler.__init__(self, filepath)
 
@@ -58,21 +131,19 @@ class CoreHandler(BaseHandler):
         :returns: `bool` of status result
         """
 
-        LOGGER.debug('Detecting filename pattern')
-        for key in PLUGINS['loader'].keys():
-            if PLUGINS['loader'][key]['filename_pattern'] in self.filepath:
-                plugin_def = PLUGINS['loader'][key]
-                LOGGER.debug(f'Loading plugin {plugin_def}')
-                self.plugin = load_plugin('loader', plugin_def)
+        key = get_plugin_key(self.filepath)
 
-        if self.plugin is None:
+        if key is None:
             msg = 'Plugin not found'
             LOGGER.error(msg)
             raise RuntimeError(msg)
 
+        self.plugin = get_loader(key)
+        self.plugin.reset()
+
         LOGGER.debug('Handling file')
-        status = self.plugin.load_data(self.filepath)
-        LOGGER.debug(f'Status: {status}')
+        self.status = self.plugin.load_data(self.filepath)
+        LOGGER.debug(f'Status: {self.status}')
 
         return True
 
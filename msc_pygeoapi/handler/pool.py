@@ -0,0 +1,354 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from concurrent.futures import (Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from functools import partial
+import logging
+import multiprocessing
+import multiprocessing.util
+import queue
+import threading
+
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_LOADER_POOL_TYPE,
+    MSC_PYGEOAPI_LOADER_QUEUE_SIZE,
+    MSC_PYGEOAPI_LOADER_WORKERS
+)
+from msc_pygeoapi.handler.core import CoreHandler, close_loaders
+
+LOGGER = logging.getLogger(__name__)
+
+POOL_TYPES = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor
+}
+
+# queue of files which failed to load, shared by the workers of the
+# current process
+_FAILURES = None
+
+
+def set_failures_queue(failures):
+    """
+    set the queue collecting the files which failed to load in the
+    current process
+
+    :param failures: `queue.Queue` or `multiprocessing.Queue`
+
+    :returns: `None`
+    """
+
+    global _FAILURES
+
+    _FAILURES = failures
+
+
+def init_worker(failures):
+    """
+    initialize a process pool worker
+
+    Process pool workers do not run `atexit` handlers: bulk sinks of
+    their loaders are flushed by a finalizer once the pool shuts down
+
+    :param failures: `multiprocessing.Queue` of files which failed to load
+
+    :returns: `None`
+    """
+
+    set_failures_queue(failures)
+    multiprocessing.util.Finalize(None, close_loaders, exitpriority=10)
+
+
+def report_failure(filepath):
+    """
+    report a file which failed to load
+
+    :param filepath: path to file
+
+    :returns: `None`
+    """
+
+    if _FAILURES is not None:
+        _FAILURES.put(filepath)
+
+
+def watch_status(filepath, status):
+    """
+    report the failure of a load once its buffered actions are submitted
+
+    :param filepath: path to file
+    :param status: status returned by the loader (`bool`, or
+                   `concurrent.futures.Future` resolving to it for loaders
+                   buffering actions in a bulk sink)
+
+    :returns: `None`
+    """
+
+    if isinstance(status, Future):
+        status.add_done_callback(partial(_on_loaded, filepath))
+
+
+def _on_loaded(filepath, future):
+    """
+    report a load whose buffered actions failed
+
+    :param filepath: path to file
+    :param future: `concurrent.futures.Future` of the load result
+
+    :returns: `None`
+    """
+
+    if future.cancelled() or future.exception() is not None or \
+            not future.result():
+        LOGGER.warning(f'Unable to load {filepath}: bulk insert failed')
+        report_failure(filepath)
+
+
+def handle_file(filepath):
+    """
+    handle a file with the resident loader of the current worker
+
+    :param filepath: path to file
+
+    :returns: `bool` of status result
+    """
+
+    try:
+        handler = CoreHandler(filepath)
+        result = handler.handle()
+    except Exception as err:
+        LOGGER.warning(f'Unable to load {filepath}: {err}')
+        report_failure(filepath)
+        return False
+
+    watch_status(filepath, handler.status)
+
+    return result
+
+
+class LoaderPool:
+    """resident loader worker pool fed by a bounded queue"""
+
+    def __init__(self, workers=MSC_PYGEOAPI_LOADER_WORKERS,
+                 pool_type=MSC_PYGEOAPI_LOADER_POOL_TYPE,
+                 queue_size=MSC_PYGEOAPI_LOADER_QUEUE_SIZE,
+                 failures=None):
+        """
+        initializer
+
+        :param workers: number of workers
+        :param pool_type: type of pool (`thread` or `process`)
+        :param queue_size: number of files allowed to wait for a worker
+                           before `submit` blocks
+        :param failures: queue collecting the files which failed to load
+                         (`multiprocessing.Queue` for a process pool)
+
+        :returns: `msc_pygeoapi.handler.pool.LoaderPool`
+        """
+
+        if pool_type not in POOL_TYPES:
+            msg = f'Invalid pool type {pool_type}'
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+        if workers < 1:
+            msg = f'Invalid number of workers {workers}'
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+        self.workers = workers
+        self.pool_type = pool_type
+        self.queue_size = queue_size
+
+        LOGGER.debug(f'Starting {pool_type} pool of {workers} workers')
+        if pool_type == 'process':
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker,
+                initargs=(failures,))
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def submit(self, filepath):
+        """
+        queue a file for loading, blocking while the queue is full
+
+        :param filepath: path to file
+
+        :returns: `concurrent.futures.Future` of the load result
+        """
+
+        self._slots.acquire()
+
+        try:
+            future = self.executor.submit(handle_file, filepath)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(partial(self._on_done, filepath))
+
+        return future
+
+    def _on_done(self, filepath, future):
+        """
+        release queue slot and log result of a completed load
+
+        :param filepath: path to file
+        :param future: `concurrent.futures.Future` of the load result
+
+        :returns: `None`
+        """
+
+        self._slots.release()
+
+        try:
+            LOGGER.debug(f'Result for {filepath}: {future.result()}')
+        except Exception as err:
+            LOGGER.warning(f'Unable to load {filepath}: {err}')
+            report_failure(filepath)
+
+    def shutdown(self, wait=True):
+        """
+        stop pool
+
+        :param wait: whether to wait for queued files to be loaded
+
+        :returns: `None`
+        """
+
+        self.executor.shutdown(wait=wait)
+
+    def __repr__(self):
+        return f'<LoaderPool> {self.pool_type} ({self.workers} workers)'
+
+
+class LoaderDispatcher:
+    """
+    dispatches files of sarracenia events to loaders, inline or through
+    a `LoaderPool`, and keeps track of the files which failed to load
+    """
+
+    def __init__(self, workers=MSC_PYGEOAPI_LOADER_WORKERS,
+                 pool_type=MSC_PYGEOAPI_LOADER_POOL_TYPE,
+                 queue_size=MSC_PYGEOAPI_LOADER_QUEUE_SIZE):
+        """
+        initializer
+
+        :param workers: number of workers (0 to load files inline)
+        :param pool_type: type of pool (`thread` or `process`)
+        :param queue_size: number of files allowed to wait for a worker
+
+        :returns: `msc_pygeoapi.handler.pool.LoaderDispatcher`
+        """
+
+        self.pool = None
+        self.failed = []
+
+        if workers > 0 and pool_type == 'process':
+            self.failures = multiprocessing.Queue()
+        else:
+            self.failures = queue.Queue()
+
+        set_failures_queue(self.failures)
+
+        if workers > 0:
+            self.pool = LoaderPool(workers, pool_type, queue_size,
+                                   self.failures)
+
+    def dispatch(self, filepath):
+        """
+        load a file, or queue it for loading in pool mode
+
+        Inline loads raise their errors, so that the event reports the
+        failure to sarracenia.  Failures of queued loads are logged as
+        they are collected, and returned by `stop`
+
+        :param filepath: path to file
+
+        :returns: `bool` of dispatch result
+        """
+
+        self.collect_failures()
+
+        if self.pool is not None:
+            self.pool.submit(filepath)
+            LOGGER.debug(f'Queued: {filepath}')
+            return True
+
+        handler = CoreHandler(filepath)
+        result = handler.handle()
+        LOGGER.debug(f'Result: {result}')
+
+        watch_status(filepath, handler.status)
+
+        return True
+
+    def collect_failures(self):
+        """
+        collect the files which failed to load since the last call
+
+        :returns: `list` of paths to files
+        """
+
+        failures = []
+
+        while True:
+            try:
+                failures.append(self.failures.get_nowait())
+            except queue.Empty:
+                break
+
+        for filepath in failures:
+            LOGGER.error(f'Failed to load {filepath}')
+
+        self.failed.extend(failures)
+
+        return failures
+
+    def stop(self):
+        """
+        wait for queued files to be loaded, stop pool and flush the bulk
+        sinks of loaders
+
+        :returns: `list` of paths to all files which failed to load
+        """
+
+        if self.pool is not None:
+            LOGGER.debug('Waiting for queued files to be loaded')
+            self.pool.shutdown()
+
+        close_loaders()
+        self.collect_failures()
+
+        return self.failed
+
+    def __repr__(self):
+        return f'<LoaderDispatcher> {self.pool}'
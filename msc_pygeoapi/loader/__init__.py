@@ -85,3 +85,10 @@ for module, name in commands:
 
 
 metadata.add_command(discovery_metadata)
+
+try:
+    from msc_pygeoapi.provider.coverage_metadata import coverage_metadata
+    metadata.add_command(coverage_metadata)
+except ImportError as err:
+    LOGGER.info('msc-pygeoapi metadata coverage-metadata command unavailable')
+    LOGGER.debug(f'Import error when loading coverage_metadata: {err}')
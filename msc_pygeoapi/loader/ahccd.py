@@ -39,6 +39,7 @@ import click
 from msc_pygeoapi import cli_options
 from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
 from msc_pygeoapi.loader.base import BaseLoader
+from msc_pygeoapi.loader.checkpoint import Checkpoint
 from msc_pygeoapi.util import configure_es_connection
 
 LOGGER = logging.getLogger(__name__)
@@ -552,6 +553,7 @@ CTL_HELP = '''
         ['all', 'stations', 'trends', 'annual', 'seasonal', 'monthly']
     )
 )
+@cli_options.OPTION_RESUME()
 def add(
     ctx,
     ctl,
@@ -561,6 +563,7 @@ def add(
     ignore_certs,
     dataset,
     batch_size,
+    resume,
 ):
     """Loads AHCCD data from JSON into Elasticsearch"""
 
@@ -586,14 +589,35 @@ def add(
     else:
         datasets_to_process = [dataset]
 
+    checkpoint = Checkpoint('ahccd', resume)
+    datasets_to_process = [
+        dtp for dtp in datasets_to_process if not checkpoint.is_complete(dtp)
+    ]
+
     click.echo(f'Processing dataset(s): {datasets_to_process}')
 
+    def identifier(action):
+        return str(action['_id'])
+
     for dtp in datasets_to_process:
         try:
             click.echo(f'Populating {dtp} index')
-            loader.create_index(dtp)
-            dtp_data = loader.generate_docs(ctl_dict[dtp], dtp)
-            loader.conn.submit_elastic_package(dtp_data, batch_size)
+            if not checkpoint.start(dtp):
+                loader.create_index(dtp)
+            # documents are loaded in identifier order, so that a resumed
+            # load skips the identifiers already loaded
+            dtp_data = sorted(
+                loader.generate_docs(ctl_dict[dtp], dtp), key=identifier
+            )
+            dtp_data = checkpoint.track(
+                (action for action in dtp_data
+                 if not checkpoint.is_done(identifier(action))),
+                key=identifier
+            )
+            loader.conn.submit_elastic_package(
+                dtp_data, batch_size, callback=checkpoint.ack
+            )
+            checkpoint.finish()
         except Exception as err:
             msg = f'Could not populate {dtp} index: {err}'
             raise click.ClickException(msg)
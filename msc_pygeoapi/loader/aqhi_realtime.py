@@ -293,6 +293,15 @@ class AQHIRealtimeLoader(BaseLoader):
 
         return True
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.items = []
+
     def load_data(self, filepath):
         """
         loads data from event to target
@@ -36,6 +36,16 @@ class BaseLoader(object):
     def __init__(self):
         pass
 
+    def reset(self):
+        """
+        resets per-file state before loading another file (loader
+        instances are cached and reused across files by the handler)
+
+        :returns: `None`
+        """
+
+        pass
+
     def load_data(self, filepath):
         """
         loads data from event to target
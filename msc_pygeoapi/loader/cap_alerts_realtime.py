@@ -187,6 +187,15 @@ class CapAlertsRealtimeLoader(BaseLoader):
         self.conn.create(INDEX_NAME, mapping=SETTINGS)
         self.references_arr = []
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.references_arr = []
+
     def load_data(self, filepath):
         """
         fonction from base to load the data in ES
@@ -0,0 +1,355 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import deque
+from datetime import datetime
+from itertools import islice
+import json
+import logging
+import os
+import time
+
+from msc_pygeoapi.env import MSC_PYGEOAPI_CACHEDIR
+from msc_pygeoapi.util import strftime_rfc3339
+
+LOGGER = logging.getLogger(__name__)
+
+# minimum number of seconds between two writes of the state file
+SAVE_INTERVAL = 10
+
+
+class Checkpoint:
+    """
+    Resumable archive load checkpoint
+
+    Records, per dataset, the last successfully acknowledged key (e.g.
+    station) of each key range and the number of acknowledged documents
+    in a local state file, so that an interrupted load can be resumed.
+    """
+
+    def __init__(self, name, resume=False, meta={}, filepath=None):
+        """
+        initializer
+
+        :param name: name of loader (e.g. `climate_archive`)
+        :param resume: whether to resume from an existing state file
+        :param meta: `dict` of run metadata (e.g. index date). When
+                     resuming, the metadata of the state file is used.
+        :param filepath: path to state file (default in
+                         MSC_PYGEOAPI_CACHEDIR)
+
+        :returns: `msc_pygeoapi.loader.checkpoint.Checkpoint`
+        """
+
+        self.name = name
+        self.filepath = filepath or os.path.join(
+            MSC_PYGEOAPI_CACHEDIR, f'msc-pygeoapi-{name}-checkpoint.json'
+        )
+
+        self.state = None
+        self.dataset = None
+        self.failed = False
+
+        self._keys = deque()
+        self._current = {}
+        self._saved = 0
+
+        if resume and os.path.exists(self.filepath):
+            LOGGER.info(f'Resuming from checkpoint {self.filepath}')
+            with open(self.filepath) as fh:
+                self.state = json.load(fh)
+            self.state['meta'] = {**meta, **self.state['meta']}
+        else:
+            if resume:
+                LOGGER.warning(f'No checkpoint found at {self.filepath}')
+            self.state = {'meta': dict(meta), 'datasets': {}}
+            self.save(force=True)
+
+    @property
+    def meta(self):
+        """run metadata"""
+
+        return self.state['meta']
+
+    def is_complete(self, dataset):
+        """
+        determines whether a dataset was completely loaded
+
+        :param dataset: name of dataset
+
+        :returns: `bool` of result
+        """
+
+        state = self.state['datasets'].get(dataset, {})
+
+        return state.get('status') == 'complete'
+
+    def start(self, dataset, ranges=None):
+        """
+        start (or resume) tracking a dataset
+
+        :param dataset: name of dataset
+        :param ranges: `list` of (first key, last key) tuples the load is
+                       split in, where keys are loaded in ascending order
+                       within each range (default: a single unbounded
+                       range)
+
+        :returns: `bool` of whether the dataset load is resumed
+        """
+
+        self.dataset = dataset
+        self.failed = False
+        self._keys.clear()
+        self._current = {}
+
+        state = self.state['datasets'].get(dataset)
+
+        if state is not None and state['status'] == 'running':
+            LOGGER.info(
+                f'Resuming {dataset} after {state["documents"]} documents'
+            )
+            return True
+
+        if not ranges:
+            ranges = [(None, None)]
+
+        self.state['datasets'][dataset] = {
+            'status': 'running',
+            'ranges': [[first, last, None] for first, last in ranges],
+            'documents': 0,
+            'updated': None
+        }
+        self.save(force=True)
+
+        return False
+
+    def _get_range(self, key):
+        """
+        get key range of a key
+
+        :param key: key value
+
+        :returns: `list` of first key, last key and last acknowledged key
+                  (or `None` if key is not in any range)
+        """
+
+        for range_ in self.state['datasets'][self.dataset]['ranges']:
+            first, last, _ = range_
+            if all([first is None or key >= first,
+                    last is None or key <= last]):
+                return range_
+
+        return None
+
+    def is_done(self, key):
+        """
+        determines whether a key was already loaded
+
+        :param key: key value
+
+        :returns: `bool` of result
+        """
+
+        range_ = self._get_range(key)
+
+        return range_ is not None and range_[2] is not None and \
+            key <= range_[2]
+
+    def get_ranges(self, keys):
+        """
+        get remaining key ranges to load
+
+        :param keys: `list` of all keys to load
+
+        :returns: `list` of (first key, last key) tuples, where the first
+                  key is the first key not yet loaded
+        """
+
+        ranges = []
+
+        for first, last, done in self.state['datasets'][self.dataset][
+            'ranges'
+        ]:
+            remaining = [
+                key for key in keys
+                if all([first is None or key >= first,
+                        last is None or key <= last,
+                        done is None or key > done])
+            ]
+            if remaining:
+                ranges.append((min(remaining), max(remaining)))
+
+        return ranges
+
+    def get_last_key(self):
+        """
+        get last acknowledged key of a single range dataset
+
+        :returns: last acknowledged key (or `None`)
+        """
+
+        return self.state['datasets'][self.dataset]['ranges'][0][2]
+
+    def set_done(self, key):
+        """
+        mark a key, and the keys before it in its range, as loaded (e.g.
+        when a range was loaded by another process)
+
+        :param key: key value
+
+        :returns: `None`
+        """
+
+        range_ = self._get_range(key)
+
+        if range_ is not None and (range_[2] is None or key > range_[2]):
+            range_[2] = key
+
+        self.save(force=True)
+
+    def track(self, package, key=None):
+        """
+        track bulk API actions of a package. Without a key function, the
+        actions acknowledged before a resumed load are skipped (which
+        requires the package to be generated in the same order).
+
+        :param package: Iterable of bulk API actions
+        :param key: function returning the key (e.g. station) of an action
+
+        :returns: generator of bulk API actions
+        """
+
+        if key is None:
+            documents = self.state['datasets'][self.dataset]['documents']
+            package = islice(package, documents, None)
+
+        for action in package:
+            self._keys.append((
+                action.get('_id'), key(action) if key is not None else None
+            ))
+            yield action
+
+    def ack(self, ok, response):
+        """
+        acknowledge the result of a bulk API action (to be passed as the
+        callback of `submit_elastic_package`, which reports results in
+        package order).  A result that does not match its tracked action
+        stops the checkpoint.
+
+        :param ok: `bool` of whether the action was successful
+        :param response: `dict` of bulk API response item
+
+        :returns: `None`
+        """
+
+        id_, key = self._keys.popleft()
+
+        if self.failed:
+            return
+
+        response_id = next(iter(response.values()), {}).get('_id')
+
+        if None not in [id_, response_id] and str(id_) != str(response_id):
+            LOGGER.error(f'Checkpoint of {self.dataset} stopped at '
+                         f'unexpected result of {response_id} (expected '
+                         f'{id_})')
+            self.failed = True
+            self.save(force=True)
+            return
+
+        if not ok:
+            LOGGER.warning(f'Checkpoint of {self.dataset} stopped at failed '
+                           f'action {response}')
+            self.failed = True
+            self.save(force=True)
+            return
+
+        state = self.state['datasets'][self.dataset]
+        state['documents'] += 1
+
+        if key is not None:
+            range_ = self._get_range(key)
+            if range_ is not None:
+                # keys are loaded in order within a range: all actions
+                # of the previous key have been acknowledged
+                current = self._current.get(id(range_))
+                if current is not None and current != key:
+                    range_[2] = current
+                self._current[id(range_)] = key
+
+        self.save()
+
+    def finish(self):
+        """
+        mark the tracked dataset as complete (unless an action failed)
+
+        :returns: `bool` of whether the dataset is complete
+        """
+
+        state = self.state['datasets'][self.dataset]
+
+        if not self.failed:
+            for range_ in state['ranges']:
+                current = self._current.get(id(range_))
+                if current is not None:
+                    range_[2] = current
+            state['status'] = 'complete'
+
+        self.save(force=True)
+
+        return not self.failed
+
+    def save(self, force=False):
+        """
+        write state file
+
+        :param force: whether to write even if the state file was written
+                      less than SAVE_INTERVAL seconds ago
+
+        :returns: `None`
+        """
+
+        now = time.time()
+
+        if not force and now - self._saved < SAVE_INTERVAL:
+            return
+
+        if self.dataset is not None:
+            self.state['datasets'][self.dataset]['updated'] = \
+                strftime_rfc3339(datetime.utcnow())
+
+        tmp_filepath = f'{self.filepath}.tmp'
+        with open(tmp_filepath, 'w') as fh:
+            json.dump(self.state, fh, default=str)
+        os.replace(tmp_filepath, self.filepath)
+
+        self._saved = now
+
+    def __repr__(self):
+        return f'<Checkpoint> {self.filepath}'
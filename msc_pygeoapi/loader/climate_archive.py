@@ -32,7 +32,17 @@
 # =================================================================
 
 import collections
+from datetime import datetime
+from concurrent.futures import (
+    as_completed,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor
+)
 import logging
+import math
+import multiprocessing
+import queue
+import threading
 
 import click
 import cx_Oracle
@@ -40,6 +50,7 @@ import cx_Oracle
 from msc_pygeoapi import cli_options
 from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
 from msc_pygeoapi.loader.base import BaseLoader
+from msc_pygeoapi.loader.checkpoint import Checkpoint
 from msc_pygeoapi.util import configure_es_connection
 
 
@@ -49,6 +60,14 @@ HTTP_OK = 200
 POST_OK = 201
 HEADERS = {'Content-type': 'application/json'}
 
+# number of rows fetched from Oracle per round trip
+ARRAYSIZE = 10000
+# number of station ranges per worker process, to balance the load of
+# stations with very different record counts
+SHARDS_PER_WORKER = 4
+# seconds between checks of a stopped consumer by blocked fetch threads
+QUEUE_TIMEOUT = 1
+
 
 class ClimateArchiveLoader(BaseLoader):
     """Climat Archive Loader"""
@@ -61,19 +80,262 @@ class ClimateArchiveLoader(BaseLoader):
         self.conn = ElasticsearchConnector(conn_config)
 
         # setup DB connection
+        self.db_conn_string = db_conn_string
+        self.db_conn, self.cur = self.connect_db()
+
+        # version of the index generations created by create_index
+        self.index_version = datetime.utcnow().strftime('%Y-%m-%d.%H-%M-%S')
+        # alias: (index generation, production settings) being loaded
+        self.indexes = {}
+
+    def create_generation(self, alias, mapping):
+        """
+        Creates a new versioned generation of the index behind <alias>,
+        which documents are loaded to until swap_indexes is called.
+
+        :param alias: name of the alias of the index.
+        :param mapping: mapping of the index.
+        """
+
+        index_name = self.conn.create_generation(
+            alias, self.index_version, mapping
+        )
+        self.indexes[alias] = (index_name, mapping['settings'])
+
+    def get_index_name(self, alias):
+        """
+        Gets the name of the index to load documents of <alias> to.
+
+        :param alias: name of the alias of the index.
+        :returns: name of the index generation being loaded, if any,
+                  else <alias>.
+        """
+
+        if alias in self.indexes:
+            return self.indexes[alias][0]
+
+        return alias
+
+    def swap_indexes(self, complete=True):
+        """
+        Swaps the aliases of the index generations loaded to them, and
+        deletes older generations.
+
+        :param complete: whether the load completed. Otherwise, the
+                         aliases are not swapped (the load can be resumed).
+        """
+
+        for alias, (index_name, settings) in self.indexes.items():
+            if complete:
+                self.conn.swap_alias(alias, index_name, settings)
+            else:
+                LOGGER.warning(
+                    f'Load of {index_name} incomplete, not swapping {alias}'
+                )
+
+        self.indexes.clear()
+
+    def connect_db(self):
+        """
+        Connects to the Oracle database.
+
+        :returns: a tuple containing the connection and a cursor tuned for
+                  fetching large result sets.
+        """
+
         try:
-            self.db_conn = cx_Oracle.connect(db_conn_string)
+            db_conn = cx_Oracle.connect(self.db_conn_string)
         except Exception as err:
             msg = f'Could not connect to Oracle: {err}'
             LOGGER.critical(msg)
             raise click.ClickException(msg)
 
-        self.cur = self.db_conn.cursor()
+        cur = db_conn.cursor()
+        cur.arraysize = ARRAYSIZE
+        cur.prefetchrows = ARRAYSIZE
+
+        return db_conn, cur
+
+    def get_station_ranges(self, stn_dict, partitions=1):
+        """
+        Splits station IDs into contiguous STN_ID ranges.
+
+        :param stn_dict: mapping of station IDs to station information.
+        :param partitions: number of ranges to split stations into.
+
+        :returns: list of (first STN_ID, last STN_ID) tuples.
+        """
+
+        stations = sorted(stn_dict)
+        if not stations:
+            return []
+
+        size = math.ceil(len(stations) / max(partitions, 1))
+
+        return [
+            (stations[i], stations[min(i + size, len(stations)) - 1])
+            for i in range(0, len(stations), size)
+        ]
+
+    def fetch_station_rows(self, cur, table, stn_range, where=None,
+                           params={}):
+        """
+        Queries all rows of a table for a range of stations in a single
+        query ordered by STN_ID, using bind variables.
+
+        :param cur: oracle cursor to perform queries against.
+        :param table: name of table to query.
+        :param stn_range: tuple of first and last STN_ID to query.
+        :param where: additional where clause (with bind variables).
+        :param params: `dict` of values of bind variables in <where>.
+
+        :returns: generator of tuples of (column names, list of rows).
+        """
+
+        query = (
+            f'select * from {table} '
+            f'where STN_ID between :stn_min and :stn_max'
+        )
+        if where:
+            query = f'{query} and {where}'
+        query = f'{query} order by STN_ID'
+
+        try:
+            cur.execute(
+                query, stn_min=stn_range[0], stn_max=stn_range[1], **params
+            )
+        except Exception as err:
+            LOGGER.error(
+                f'Could not fetch records from oracle due to: {str(err)}.'
+            )
+            return
+
+        columns = [x[0] for x in cur.description]
+
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            yield columns, rows
+
+    def fetch_partitioned_rows(self, table, stn_dict, where=None, params={},
+                               partitions=1, stn_ranges=None):
+        """
+        Queries all rows of a table for the stations in <stn_dict> with one
+        query per STN_ID range, each range running on its own connection.
+
+        :param table: name of table to query.
+        :param stn_dict: mapping of station IDs to station information.
+        :param where: additional where clause (with bind variables).
+        :param params: `dict` of values of bind variables in <where>.
+        :param partitions: number of STN_ID ranges (and connections).
+        :param stn_ranges: list of (first STN_ID, last STN_ID) tuples to
+                           query instead of splitting <stn_dict> in
+                           <partitions> ranges.
+
+        :returns: generator of tuples of (column names, list of rows).
+        """
+
+        if stn_ranges is None:
+            stn_ranges = self.get_station_ranges(stn_dict, partitions)
+
+        if len(stn_ranges) <= 1:
+            for stn_range in stn_ranges:
+                yield from self.fetch_station_rows(
+                    self.cur, table, stn_range, where, params
+                )
+            return
+
+        batches = queue.Queue(maxsize=len(stn_ranges) * 2)
+        done = object()
+        # set once the consumer stops (error or closed generator), so
+        # that workers blocked on a full queue give up
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=QUEUE_TIMEOUT)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch(stn_range):
+            try:
+                db_conn, cur = self.connect_db()
+                try:
+                    for batch in self.fetch_station_rows(
+                        cur, table, stn_range, where, params
+                    ):
+                        if not put(batch):
+                            break
+                finally:
+                    db_conn.close()
+            except Exception as err:
+                put(err)
+            finally:
+                put(done)
+
+        with ThreadPoolExecutor(max_workers=len(stn_ranges)) as executor:
+            futures = [
+                executor.submit(fetch, stn_range) for stn_range in stn_ranges
+            ]
+
+            try:
+                remaining = len(stn_ranges)
+                while remaining > 0:
+                    batch = batches.get()
+                    if batch is done:
+                        remaining -= 1
+                    elif isinstance(batch, Exception):
+                        raise batch
+                    else:
+                        yield batch
+            finally:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                while True:
+                    try:
+                        batches.get_nowait()
+                    except queue.Empty:
+                        break
+
+    def fetch_data(self, table, stn_dict, where=None, params={}, bulk=False,
+                   partitions=1, stn_ranges=None):
+        """
+        Queries rows of a table for the stations in <stn_dict>, either one
+        query per station or, in bulk mode, one query per STN_ID range.
+
+        :param table: name of table to query.
+        :param stn_dict: mapping of station IDs to station information.
+        :param where: additional where clause (with bind variables).
+        :param params: `dict` of values of bind variables in <where>.
+        :param bulk: whether to query all stations in a single query.
+        :param partitions: number of STN_ID ranges (and connections) in
+                           bulk mode.
+        :param stn_ranges: list of (first STN_ID, last STN_ID) tuples to
+                           query in bulk mode (default: <partitions>
+                           ranges of <stn_dict>).
+
+        :returns: generator of tuples of (column names, list of rows).
+        """
+
+        if bulk:
+            yield from self.fetch_partitioned_rows(
+                table, stn_dict, where, params, partitions, stn_ranges
+            )
+        else:
+            for station in stn_dict:
+                yield from self.fetch_station_rows(
+                    self.cur, table, (station, station), where, params
+                )
 
     def create_index(self, index):
         """
-        Creates the Elasticsearch index at path. If the index already exists,
-        it is deleted and re-created. The mappings for the two types are also
+        Creates a new generation of the Elasticsearch index at path (see
+        create_generation). The mappings for the two types are also
         created.
 
         :param index: the index to be created.
@@ -189,7 +451,7 @@ class ClimateArchiveLoader(BaseLoader):
             }
 
             index_name = 'climate_station_information'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'normals':
             mapping = {
@@ -286,7 +548,7 @@ class ClimateArchiveLoader(BaseLoader):
             }
 
             index_name = 'climate_normals_data'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'monthly_summary':
             mapping = {
@@ -373,7 +635,7 @@ class ClimateArchiveLoader(BaseLoader):
             }
 
             index_name = 'climate_public_climate_summary'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'daily_summary':
             mapping = {
@@ -488,7 +750,7 @@ class ClimateArchiveLoader(BaseLoader):
             }
 
             index_name = 'climate_public_daily_data'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'hourly_summary':
             mapping = {
@@ -599,7 +861,7 @@ class ClimateArchiveLoader(BaseLoader):
             }
 
             index_name = 'climate_public_hourly_data'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
     def generate_stations(self):
         """
@@ -614,14 +876,18 @@ class ClimateArchiveLoader(BaseLoader):
         """
 
         try:
-            self.cur.execute('select * from CCCS_PORTAL.STATION_INFORMATION')
+            self.cur.execute(
+                'select * from CCCS_PORTAL.STATION_INFORMATION ORDER BY STN_ID'
+            )
         except Exception as err:
             LOGGER.error(
                 f'Could not fetch records from oracle due to: {str(err)}.'
             )
 
+        columns = [x[0] for x in self.cur.description]
+
         for row in self.cur:
-            insert_dict = dict(zip([x[0] for x in self.cur.description], row))
+            insert_dict = dict(zip(columns, row))
             for key in insert_dict:
                 # This is a quick fix for trailing spaces and should not be
                 # here. Data should be fixed on db side.
@@ -656,7 +922,7 @@ class ClimateArchiveLoader(BaseLoader):
 
             action = {
                 '_id': climate_identifier,
-                '_index': 'climate_station_information',
+                '_index': self.get_index_name('climate_station_information'),
                 '_op_type': 'update',
                 'doc': wrapper,
                 'doc_as_upsert': True,
@@ -680,14 +946,18 @@ class ClimateArchiveLoader(BaseLoader):
         """
 
         try:
-            self.cur.execute('select * from CCCS_PORTAL.NORMALS_DATA')
+            self.cur.execute(
+                'select * from CCCS_PORTAL.NORMALS_DATA ORDER BY ID'
+            )
         except Exception as err:
             LOGGER.error(
                 f'Could not fetch records from oracle due to: {str(err)}.'
             )
 
+        columns = [x[0] for x in self.cur.description]
+
         for row in self.cur:
-            insert_dict = dict(zip([x[0] for x in self.cur.description], row))
+            insert_dict = dict(zip(columns, row))
 
             for key in insert_dict:
                 # Transform Date fields from datetime to string.
@@ -738,7 +1008,7 @@ class ClimateArchiveLoader(BaseLoader):
                 }
                 action = {
                     '_id': insert_dict['ID'],
-                    '_index': 'climate_normals_data',
+                    '_index': self.get_index_name('climate_normals_data'),
                     '_op_type': 'update',
                     'doc': wrapper,
                     'doc_as_upsert': True,
@@ -767,7 +1037,8 @@ class ClimateArchiveLoader(BaseLoader):
         if not date:
             try:
                 self.cur.execute(
-                    'select * from CCCS_PORTAL.PUBLIC_CLIMATE_SUMMARY'
+                    'select * from CCCS_PORTAL.PUBLIC_CLIMATE_SUMMARY '
+                    'ORDER BY STN_ID, LOCAL_YEAR, LOCAL_MONTH'
                 )
             except Exception as err:
                 LOGGER.error(
@@ -779,7 +1050,8 @@ class ClimateArchiveLoader(BaseLoader):
                     (
                         f"select * from CCCS_PORTAL.PUBLIC_CLIMATE_SUMMARY "
                         f"WHERE LAST_UPDATED > TO_TIMESTAMP("
-                        f"'{date} 00:00:00', 'YYYY-MM-DD HH24:MI:SS')"
+                        f"'{date} 00:00:00', 'YYYY-MM-DD HH24:MI:SS') "
+                        f"ORDER BY STN_ID, LOCAL_YEAR, LOCAL_MONTH"
                     )
                 )
             except Exception as err:
@@ -787,8 +1059,10 @@ class ClimateArchiveLoader(BaseLoader):
                     f'Could not fetch records from oracle due to: {str(err)}.'
                 )
 
+        columns = [x[0] for x in self.cur.description]
+
         for row in self.cur:
-            insert_dict = dict(zip([x[0] for x in self.cur.description], row))
+            insert_dict = dict(zip(columns, row))
             # Transform Date fields from datetime to string.
             insert_dict['LAST_UPDATED'] = (
                 str(insert_dict['LAST_UPDATED'])
@@ -813,7 +1087,9 @@ class ClimateArchiveLoader(BaseLoader):
                 }
                 action = {
                     '_id': insert_dict['ID'],
-                    '_index': 'climate_public_climate_summary',
+                    '_index': self.get_index_name(
+                        'climate_public_climate_summary'
+                    ),
                     '_op_type': 'update',
                     'doc': wrapper,
                     'doc_as_upsert': True,
@@ -825,7 +1101,8 @@ class ClimateArchiveLoader(BaseLoader):
                     f" records for this station"
                 )
 
-    def generate_daily_data(self, stn_dict, date=None):
+    def generate_daily_data(self, stn_dict, date=None, bulk=False,
+                            partitions=1, stn_ranges=None):
         """
         Queries daily data from the db, and reformats
         data so it can be inserted into Elasticsearch.
@@ -836,41 +1113,31 @@ class ClimateArchiveLoader(BaseLoader):
         :param cur: oracle cursor to perform queries against.
         :param stn_dict: mapping of station IDs to station information.
         :param date: date to start fetching data from.
+        :param bulk: whether to query all stations in a single query.
+        :param partitions: number of STN_ID ranges (and connections) in
+                           bulk mode.
+        :param stn_ranges: list of (first STN_ID, last STN_ID) tuples to
+                           query in bulk mode.
         :returns: generator of bulk API upsert actions.
         """
 
-        for station in stn_dict:
-            if not date:
-                try:
-                    self.cur.execute(
-                        f'select * from CCCS_PORTAL.PUBLIC_DAILY_DATA '
-                        f'where STN_ID={station}'
-                    )
-                except Exception as err:
-                    LOGGER.error(
-                        f'Could not fetch records from oracle due to:'
-                        f' {str(err)}.'
-                    )
-            else:
-                try:
-                    self.cur.execute(
-                        (
-                            f"select * from CCCS_PORTAL.PUBLIC_DAILY_DATA "
-                            f"where STN_ID={station} and "
-                            f"LOCAL_DATE > TO_TIMESTAMP('{date} 00:00:00', "
-                            f"'YYYY-MM-DD HH24:MI:SS')"
-                        )
-                    )
-                except Exception as err:
-                    LOGGER.error(
-                        f'Could not fetch records from oracle due to:'
-                        f' {str(err)}.'
-                    )
+        where = None
+        params = {}
+        if date:
+            where = (
+                "LOCAL_DATE > TO_TIMESTAMP(:start_date, "
+                "'YYYY-MM-DD HH24:MI:SS')"
+            )
+            params = {'start_date': f'{date} 00:00:00'}
 
-            for row in self.cur:
-                insert_dict = dict(
-                    zip([x[0] for x in self.cur.description], row)
-                )
+        batches = self.fetch_data(
+            'CCCS_PORTAL.PUBLIC_DAILY_DATA', stn_dict, where, params, bulk,
+            partitions, stn_ranges
+        )
+
+        for columns, rows in batches:
+            for row in rows:
+                insert_dict = dict(zip(columns, row))
                 # Transform Date fields from datetime to string.
                 insert_dict['LOCAL_DATE'] = (
                     str(insert_dict['LOCAL_DATE'])
@@ -900,19 +1167,28 @@ class ClimateArchiveLoader(BaseLoader):
                     }
                     action = {
                         '_id': insert_dict['ID'],
-                        '_index': 'climate_public_daily_data',
+                        '_index': self.get_index_name(
+                            'climate_public_daily_data'
+                        ),
                         '_op_type': 'update',
                         'doc': wrapper,
                         'doc_as_upsert': True,
                     }
                     yield action
+                elif bulk:
+                    # bulk STN_ID ranges may include stations not loaded
+                    LOGGER.debug(
+                        f"STN ID {insert_dict['STN_ID']} not in stations "
+                        f"to load, skipping"
+                    )
                 else:
                     LOGGER.error(
                         f"Bad STN ID: {insert_dict['STN_ID']}, skipping"
                         f" records for this station"
                     )
 
-    def generate_hourly_data(self, stn_dict, date=None):
+    def generate_hourly_data(self, stn_dict, date=None, bulk=False,
+                             partitions=1, stn_ranges=None):
         """
         Queries hourly data from the db, and reformats
         data so it can be inserted into Elasticsearch.
@@ -923,41 +1199,31 @@ class ClimateArchiveLoader(BaseLoader):
         :param cur: oracle cursor to perform queries against.
         :param stn_dict: mapping of station IDs to station information.
         :param date: date to start fetching data from.
+        :param bulk: whether to query all stations in a single query.
+        :param partitions: number of STN_ID ranges (and connections) in
+                           bulk mode.
+        :param stn_ranges: list of (first STN_ID, last STN_ID) tuples to
+                           query in bulk mode.
         :returns: generator of bulk API upsert actions.
         """
 
-        for station in stn_dict:
-            if not date:
-                try:
-                    self.cur.execute(
-                        f'select * from CCCS_PORTAL.PUBLIC_HOURLY_DATA '
-                        f'where STN_ID={station}'
-                    )
-                except Exception as err:
-                    LOGGER.error(
-                        f'Could not fetch records from oracle due to:'
-                        f' {str(err)}.'
-                    )
-            else:
-                try:
-                    self.cur.execute(
-                        (
-                            f"select * from CCCS_PORTAL.PUBLIC_HOURLY_DATA "
-                            f"where STN_ID={station} and "
-                            f"LOCAL_DATE >= TO_TIMESTAMP('{date} 00:00:00', "
-                            f"'YYYY-MM-DD HH24:MI:SS')"
-                        )
-                    )
-                except Exception as err:
-                    LOGGER.error(
-                        f'Could not fetch records from oracle due to:'
-                        f' {str(err)}.'
-                    )
+        where = None
+        params = {}
+        if date:
+            where = (
+                "LOCAL_DATE >= TO_TIMESTAMP(:start_date, "
+                "'YYYY-MM-DD HH24:MI:SS')"
+            )
+            params = {'start_date': f'{date} 00:00:00'}
 
-            for row in self.cur:
-                insert_dict = dict(
-                    zip([x[0] for x in self.cur.description], row)
-                )
+        batches = self.fetch_data(
+            'CCCS_PORTAL.PUBLIC_HOURLY_DATA', stn_dict, where, params, bulk,
+            partitions, stn_ranges
+        )
+
+        for columns, rows in batches:
+            for row in rows:
+                insert_dict = dict(zip(columns, row))
                 # Transform Date fields from datetime to string.
                 insert_dict['LOCAL_DATE'] = (
                     str(insert_dict['LOCAL_DATE'])
@@ -987,12 +1253,20 @@ class ClimateArchiveLoader(BaseLoader):
                     }
                     action = {
                         '_id': insert_dict['ID'],
-                        '_index': 'climate_public_hourly_data',
+                        '_index': self.get_index_name(
+                            'climate_public_hourly_data'
+                        ),
                         '_op_type': 'update',
                         'doc': wrapper,
                         'doc_as_upsert': True,
                     }
                     yield action
+                elif bulk:
+                    # bulk STN_ID ranges may include stations not loaded
+                    LOGGER.debug(
+                        f"STN ID {insert_dict['STN_ID']} not in stations "
+                        f"to load, skipping"
+                    )
                 else:
                     LOGGER.error(
                         f"Bad STN ID: {insert_dict['STN_ID']}, skipping"
@@ -1124,6 +1398,117 @@ class ClimateArchiveLoader(BaseLoader):
         return period_dict
 
 
+def load_station_shard(db, conn_config, indexes, dataset, stn_dict,
+                       date=None, batch_size=10000, bulk=False, partitions=1):
+    """
+    Loads daily or hourly data of a shard of stations in a worker process,
+    with its own Oracle and Elasticsearch connections.
+
+    :param db: database connection string.
+    :param conn_config: Elasticsearch connection configuration.
+    :param indexes: index generations being loaded (see
+                    ClimateArchiveLoader.create_generation).
+    :param dataset: dataset to load (`daily` or `hourly`).
+    :param stn_dict: mapping of station IDs to station information.
+    :param date: date to start fetching data from.
+    :param batch_size: number of documents per bulk request.
+    :param bulk: whether to query all stations in a single query.
+    :param partitions: number of STN_ID ranges (and connections) in
+                       bulk mode.
+
+    :returns: tuple of (number of documents loaded, number of errors).
+    """
+
+    loader = ClimateArchiveLoader(db, conn_config)
+    loader.indexes = indexes
+    counts = collections.Counter()
+
+    def count(ok, response):
+        counts['documents' if ok else 'errors'] += 1
+
+    try:
+        generate = getattr(loader, f'generate_{dataset}_data')
+        actions = generate(stn_dict, date, bulk, partitions)
+        if not loader.conn.submit_elastic_package(
+            actions, batch_size, callback=count
+        ):
+            counts['errors'] = max(counts['errors'], 1)
+    finally:
+        loader.db_conn.close()
+
+    return counts['documents'], counts['errors']
+
+
+def load_station_shards(db, conn_config, indexes, dataset, stn_dict,
+                        stn_ranges, checkpoint, workers, date=None,
+                        batch_size=10000, bulk=False, partitions=1):
+    """
+    Loads daily or hourly data with STN_ID ranges sharded across worker
+    processes, aggregating progress and error counts.
+
+    :param db: database connection string.
+    :param conn_config: Elasticsearch connection configuration.
+    :param indexes: index generations being loaded (see
+                    ClimateArchiveLoader.create_generation).
+    :param dataset: dataset to load (`daily` or `hourly`).
+    :param stn_dict: mapping of station IDs to station information.
+    :param stn_ranges: list of (first STN_ID, last STN_ID) tuples to shard.
+    :param checkpoint: `msc_pygeoapi.loader.checkpoint.Checkpoint` of load.
+    :param workers: number of worker processes.
+    :param date: date to start fetching data from.
+    :param batch_size: number of documents per bulk request.
+    :param bulk: whether to query all stations in a single query.
+    :param partitions: number of STN_ID ranges (and connections) in
+                       bulk mode, per worker.
+
+    :returns: tuple of (number of documents loaded, number of errors).
+    """
+
+    documents = errors = 0
+    # spawn workers rather than forking the parent's Oracle connection
+    context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=context) as executor:
+        futures = {}
+        for first, last in stn_ranges:
+            shard = collections.OrderedDict(
+                (stn_id, stn) for stn_id, stn in stn_dict.items()
+                if first <= stn_id <= last
+            )
+            future = executor.submit(
+                load_station_shard, db, conn_config, indexes, dataset, shard,
+                date, batch_size, bulk, partitions
+            )
+            futures[future] = (first, last)
+
+        for done, future in enumerate(as_completed(futures), 1):
+            first, last = futures[future]
+            try:
+                shard_documents, shard_errors = future.result()
+            except Exception as err:
+                LOGGER.error(
+                    f'Could not load {dataset} data of stations {first} to '
+                    f'{last}: {err}'
+                )
+                shard_documents, shard_errors = 0, 1
+
+            documents += shard_documents
+            errors += shard_errors
+
+            if shard_errors:
+                checkpoint.failed = True
+            else:
+                checkpoint.set_done(last)
+
+            click.echo(
+                f'Loaded {done}/{len(futures)} {dataset} station ranges '
+                f'({documents} documents, {errors} errors)'
+            )
+
+    return documents, errors
+
+
 @click.group()
 def climate_archive():
     """Manages climate archive indices"""
@@ -1138,6 +1523,7 @@ def climate_archive():
 @cli_options.OPTION_ES_PASSWORD()
 @cli_options.OPTION_ES_IGNORE_CERTS()
 @cli_options.OPTION_BATCH_SIZE()
+@cli_options.OPTION_BULK_WORKERS()
 @cli_options.OPTION_DATASET(
     type=click.Choice(
         ['all', 'stations', 'normals', 'monthly', 'daily', 'hourly']
@@ -1154,6 +1540,20 @@ def climate_archive():
 @click.option(
     '--date', help='Start date to fetch updates (YYYY-MM-DD)', required=False
 )
+@click.option(
+    '--bulk', is_flag=True, default=False,
+    help='Fetch daily/hourly data in a single query instead of per station'
+)
+@click.option(
+    '--partitions', type=click.IntRange(1, 64), default=1,
+    help='Number of STN_ID ranges (and connections) used with --bulk'
+)
+@click.option(
+    '--workers', type=click.IntRange(1, 64), default=1,
+    help='Number of worker processes loading daily/hourly data, each with '
+         'its own Oracle and Elasticsearch connections'
+)
+@cli_options.OPTION_RESUME()
 def add(
     ctx,
     db,
@@ -1163,13 +1563,19 @@ def add(
     ignore_certs,
     dataset,
     batch_size,
+    bulk_workers,
     station=None,
     starting_from=False,
     date=None,
+    bulk=False,
+    partitions=1,
+    workers=1,
+    resume=False,
 ):
     """Loads MSC Climate Archive data from Oracle into Elasticsearch"""
 
-    conn_config = configure_es_connection(es, username, password, ignore_certs)
+    conn_config = configure_es_connection(es, username, password, ignore_certs,
+                                          bulk_workers)
 
     loader = ClimateArchiveLoader(db, conn_config)
 
@@ -1184,14 +1590,38 @@ def add(
     else:
         datasets_to_process = [dataset]
 
+    checkpoint = Checkpoint('climate_archive', resume, {
+        'station': station,
+        'starting_from': starting_from,
+        'date': date,
+        'version': loader.index_version
+    })
+    # a resumed load continues with the options and index generations of
+    # the interrupted load
+    station = checkpoint.meta['station']
+    starting_from = checkpoint.meta['starting_from']
+    date = checkpoint.meta['date']
+    loader.index_version = checkpoint.meta['version']
+
+    datasets_to_process = [
+        dtp for dtp in datasets_to_process if not checkpoint.is_complete(dtp)
+    ]
+
     click.echo(f'Processing dataset(s): {datasets_to_process}')
 
+    def stn_id(action):
+        return action['doc']['properties']['STN_ID']
+
     if 'stations' in datasets_to_process:
         try:
             click.echo('Populating stations index')
+            checkpoint.start('stations')
             loader.create_index('stations')
-            stations = loader.generate_stations()
-            loader.conn.submit_elastic_package(stations, batch_size)
+            stations = checkpoint.track(loader.generate_stations())
+            loader.conn.submit_elastic_package(
+                stations, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate stations index: {err}'
             raise click.ClickException(msg)
@@ -1202,11 +1632,15 @@ def add(
             stn_dict = loader.get_station_data(station, starting_from)
             normals_dict = loader.get_normals_data()
             periods_dict = loader.get_normals_periods()
+            checkpoint.start('normals')
             loader.create_index('normals')
-            normals = loader.generate_normals(
+            normals = checkpoint.track(loader.generate_normals(
                 stn_dict, normals_dict, periods_dict
+            ))
+            loader.conn.submit_elastic_package(
+                normals, batch_size, callback=checkpoint.ack
             )
-            loader.conn.submit_elastic_package(normals, batch_size)
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate normals index: {err}'
             raise click.ClickException(msg)
@@ -1215,10 +1649,16 @@ def add(
         try:
             click.echo('Populating monthly index')
             stn_dict = loader.get_station_data(station, starting_from)
+            checkpoint.start('monthly')
             if not (date or station or starting_from):
                 loader.create_index('monthly_summary')
-            monthlies = loader.generate_monthly_data(stn_dict, date)
-            loader.conn.submit_elastic_package(monthlies, batch_size)
+            monthlies = checkpoint.track(
+                loader.generate_monthly_data(stn_dict, date)
+            )
+            loader.conn.submit_elastic_package(
+                monthlies, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate montly index: {err}'
             raise click.ClickException(msg)
@@ -1227,10 +1667,40 @@ def add(
         try:
             click.echo('Populating daily index')
             stn_dict = loader.get_station_data(station, starting_from)
+            if workers > 1:
+                stn_ranges = loader.get_station_ranges(
+                    stn_dict, workers * SHARDS_PER_WORKER
+                )
+            else:
+                stn_ranges = loader.get_station_ranges(
+                    stn_dict, partitions if bulk else 1
+                )
+            if checkpoint.start('daily', stn_ranges):
+                stn_dict = {
+                    k: v for k, v in stn_dict.items()
+                    if not checkpoint.is_done(k)
+                }
+                stn_ranges = checkpoint.get_ranges(list(stn_dict))
             if not (date or station or starting_from):
                 loader.create_index('daily_summary')
-            dailies = loader.generate_daily_data(stn_dict, date)
-            loader.conn.submit_elastic_package(dailies, batch_size)
+            if workers > 1:
+                documents, errors = load_station_shards(
+                    db, conn_config, loader.indexes, 'daily', stn_dict,
+                    stn_ranges, checkpoint, workers, date, batch_size, bulk,
+                    partitions
+                )
+                click.echo(
+                    f'Loaded {documents} daily documents with {errors} '
+                    f'errors'
+                )
+            else:
+                dailies = checkpoint.track(loader.generate_daily_data(
+                    stn_dict, date, bulk, partitions, stn_ranges
+                ), key=stn_id)
+                loader.conn.submit_elastic_package(
+                    dailies, batch_size, callback=checkpoint.ack
+                )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate daily index: {err}'
             raise click.ClickException(msg)
@@ -1239,10 +1709,40 @@ def add(
         try:
             click.echo('Populating hourly index')
             stn_dict = loader.get_station_data(station, starting_from)
+            if workers > 1:
+                stn_ranges = loader.get_station_ranges(
+                    stn_dict, workers * SHARDS_PER_WORKER
+                )
+            else:
+                stn_ranges = loader.get_station_ranges(
+                    stn_dict, partitions if bulk else 1
+                )
+            if checkpoint.start('hourly', stn_ranges):
+                stn_dict = {
+                    k: v for k, v in stn_dict.items()
+                    if not checkpoint.is_done(k)
+                }
+                stn_ranges = checkpoint.get_ranges(list(stn_dict))
             if not (date or station or starting_from):
                 loader.create_index('hourly_summary')
-            hourlies = loader.generate_hourly_data(stn_dict, date)
-            loader.conn.submit_elastic_package(hourlies, batch_size)
+            if workers > 1:
+                documents, errors = load_station_shards(
+                    db, conn_config, loader.indexes, 'hourly', stn_dict,
+                    stn_ranges, checkpoint, workers, date, batch_size, bulk,
+                    partitions
+                )
+                click.echo(
+                    f'Loaded {documents} hourly documents with {errors} '
+                    f'errors'
+                )
+            else:
+                hourlies = checkpoint.track(loader.generate_hourly_data(
+                    stn_dict, date, bulk, partitions, stn_ranges
+                ), key=stn_id)
+                loader.conn.submit_elastic_package(
+                    hourlies, batch_size, callback=checkpoint.ack
+                )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate hourly index: {err}'
             raise click.ClickException(msg)
@@ -372,6 +372,15 @@ class ForecastPolygonsLoader(BaseLoader):
 
             yield action
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.items = []
+
     def load_data(self, filepath):
         """
         loads data from event to target
@@ -437,6 +437,15 @@ class HurricanesRealtimeLoader(BaseLoader):
 
             yield action
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.items = []
+
     def load_data(self, filepath):
         """
         loads data from event to target
@@ -32,9 +32,13 @@
 # =================================================================
 
 from collections import defaultdict
+from datetime import datetime
+from itertools import groupby
 import logging
 
 import click
+import numpy as np
+import pandas as pd
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -48,6 +52,7 @@ from msc_pygeoapi.env import (
     MSC_PYGEOAPI_OGC_API_URL
 )
 from msc_pygeoapi.loader.base import BaseLoader
+from msc_pygeoapi.loader.checkpoint import Checkpoint
 from msc_pygeoapi.util import configure_es_connection
 
 
@@ -73,6 +78,12 @@ class HydatLoader(BaseLoader):
         self.db_string = f'sqlite:///{db_string}'
 
         self.engine, self.session, self.metadata = self.connect_db()
+        self.symbols = None
+
+        # version of the index generations created by create_index
+        self.index_version = datetime.utcnow().strftime('%Y-%m-%d.%H-%M-%S')
+        # alias: (index generation, production settings) being loaded
+        self.indexes = {}
 
     def zero_pad(self, val):
         """
@@ -91,9 +102,9 @@ class HydatLoader(BaseLoader):
 
     def create_index(self, index):
         """
-        Creates the Elasticsearch index named <index>. If the index already
-        exists, it is deleted and re-created. The mappings for the two types
-        are also created.
+        Creates a new generation of the Elasticsearch index named <index>
+        (see create_generation). The mappings for the two types are also
+        created.
 
         :param es: elasticsearch.Elasticsearch client.
         :param index: name for the index(es) to be created.
@@ -153,7 +164,7 @@ class HydatLoader(BaseLoader):
             }
 
             index_name = 'hydrometric_daily_mean'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
             mapping = {
                 "settings": {"number_of_shards": 1, "number_of_replicas": 0},
@@ -190,7 +201,7 @@ class HydatLoader(BaseLoader):
             }
 
             index_name = 'hydrometric_monthly_mean'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'annual_statistics':
             mapping = {
@@ -259,7 +270,7 @@ class HydatLoader(BaseLoader):
             }
 
             index_name = 'hydrometric_annual_statistics'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'stations':
             mapping = {
@@ -314,7 +325,7 @@ class HydatLoader(BaseLoader):
             }
 
             index_name = 'hydrometric_stations'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
 
         if index == 'annual_peaks':
             mapping = {
@@ -390,7 +401,54 @@ class HydatLoader(BaseLoader):
             }
 
             index_name = 'hydrometric_annual_peaks'
-            self.conn.create(index_name, mapping, overwrite=True)
+            self.create_generation(index_name, mapping)
+
+    def create_generation(self, alias, mapping):
+        """
+        Creates a new versioned generation of the index behind <alias>,
+        which documents are loaded to until swap_indexes is called.
+
+        :param alias: name of the alias of the index.
+        :param mapping: mapping of the index.
+        """
+
+        index_name = self.conn.create_generation(
+            alias, self.index_version, mapping
+        )
+        self.indexes[alias] = (index_name, mapping['settings'])
+
+    def get_index_name(self, alias):
+        """
+        Gets the name of the index to load documents of <alias> to.
+
+        :param alias: name of the alias of the index.
+        :returns: name of the index generation being loaded, if any,
+                  else <alias>.
+        """
+
+        if alias in self.indexes:
+            return self.indexes[alias][0]
+
+        return alias
+
+    def swap_indexes(self, complete=True):
+        """
+        Swaps the aliases of the index generations loaded to them, and
+        deletes older generations.
+
+        :param complete: whether the load completed. Otherwise, the
+                         aliases are not swapped (the load can be resumed).
+        """
+
+        for alias, (index_name, settings) in self.indexes.items():
+            if complete:
+                self.conn.swap_alias(alias, index_name, settings)
+            else:
+                LOGGER.warning(
+                    f'Load of {index_name} incomplete, not swapping {alias}'
+                )
+
+        self.indexes.clear()
 
     def connect_db(self):
         """
@@ -434,103 +492,192 @@ class HydatLoader(BaseLoader):
             if t.name == table_name:
                 return t
 
-    def generate_obs(self, station, var, symbol_table, discharge=True):
+    def get_symbols(self, symbol_table):
         """
-        Generates a list of discharge or level obs for station.
-        Each observation in the list is of the form:
-        {'Station_number' : 'foo', 'Date' : yyyy-MM-dd,
-        'Discharge'/'Level' : 'X'}.
+        Loads the data symbols table once into memory.
 
-        :param station: the station to generate_obs for.
-        :param var: table object to query discharge or level data from.
         :param symbol_table: table object to query symbol data from.
+
+        :returns: `dict` of symbol id to tuple of English and French
+                  symbol descriptions.
+        """
+
+        if self.symbols is None:
+            symbol_keys = symbol_table.columns.keys()
+            id_index = symbol_keys.index('SYMBOL_ID')
+            en_index = symbol_keys.index('SYMBOL_EN')
+            fr_index = symbol_keys.index('SYMBOL_FR')
+
+            self.symbols = {
+                row[id_index]: (row[en_index], row[fr_index])
+                for row in self.session.query(symbol_table).all()
+            }
+            LOGGER.debug(f'Loaded {len(self.symbols)} data symbols')
+
+        return self.symbols
+
+    def unpivot_obs(self, obs, keys, symbols, discharge=True):
+        """
+        Unpivots monthly discharge or level rows (one column per day of
+        month) into daily obs, as columnar operations over the whole
+        result set.
+
+        :param obs: list of monthly rows from the discharge or level table.
+        :param keys: column names of the rows in <obs>.
+        :param symbols: `dict` of symbol id to tuple of English and French
+                        symbol descriptions.
         :param discharge: boolean to determine whether discharge or level
                         data is returned.
 
         :returns: tuple of lists of dictionaries containing daily obs
-                and monthly means for the station passed in as <station>.
+                and monthly means for the rows passed in as <obs>.
         """
-        keys = var.columns.keys()
-        symbol_keys = symbol_table.columns.keys()
-        args = {'STATION_NUMBER': station}
-        # get all obs for station
-        obs = self.session.query(var).filter_by(**args).all()
-        lst = []
-        mean_lst = []
+
         if discharge:
             word_in = 'FLOW'
             word_out = 'DISCHARGE'
         else:
             word_in = 'LEVEL'
             word_out = 'LEVEL'
-        for row in obs:
-            if discharge:
-                no_days = row[4]
+
+        if not obs:
+            return ([], [])
+
+        df = pd.DataFrame.from_records(obs, columns=keys)
+
+        value_columns = [f'{word_in}{i}' for i in range(1, 32)]
+        symbol_columns = [f'{word_in}_SYMBOL{i}' for i in range(1, 32)]
+
+        no_days = df['NO_DAYS'].fillna(0).to_numpy(dtype=int)
+        months = (
+            df['YEAR'].astype(str) + '-' +
+            df['MONTH'].astype(str).str.zfill(2)
+        ).to_numpy(dtype=object)
+        stations = df['STATION_NUMBER'].to_numpy(dtype=object)
+
+        # one cell per (month, day of month), restricted to days in month
+        days = np.tile(np.arange(1, 32), len(df))
+        rows = np.repeat(np.arange(len(df)), 31)
+        mask = days <= np.repeat(no_days, 31)
+        days = days[mask]
+        rows = rows[mask]
+
+        values = df[value_columns].to_numpy(dtype=float).ravel()[mask]
+        values = np.where(np.isnan(values), None, values.astype(object))
+        flags = df[symbol_columns].to_numpy(dtype=object).ravel()[mask]
+
+        day_suffixes = np.array([f'-{i:02d}' for i in range(32)],
+                                dtype=object)
+        dates = months[rows] + day_suffixes[days]
+        identifiers = stations[rows] + '.' + dates
+
+        flag_lookup = {}
+        for flag in pd.unique(flags):
+            if pd.notna(flag) and str(flag).strip():
+                flag_lookup[flag] = symbols[flag]
             else:
-                no_days = row[5]
-            # get a month's worth of obs for station
-            for i in range(1, no_days + 1):
-                insert_dict = {
-                    'STATION_NUMBER': row[0],
-                    'DATE': '',
-                    word_out: '',
-                    'IDENTIFIER': '',
-                }
-                date_ = f'{row[1]}-{self.zero_pad(row[2])}-{self.zero_pad(i)}'
-                insert_dict['DATE'] = date_
-                insert_dict['IDENTIFIER'] = f'{row[0]}.{date_}'
-                value = row[keys.index(word_in.upper() + str(i))]
-                symbol = row[keys.index(word_in.upper() + '_SYMBOL' + str(i))]
-                if symbol is not None and symbol.strip():
-                    args = {'SYMBOL_ID': symbol}
-                    symbol_data = list(
-                        self.session.query(symbol_table)
-                        .filter_by(**args)
-                        .all()[0]
-                    )
-                    symbol_en = symbol_data[symbol_keys.index('SYMBOL_EN')]
-                    symbol_fr = symbol_data[symbol_keys.index('SYMBOL_FR')]
-                    insert_dict[word_out + '_SYMBOL_EN'] = symbol_en
-                    insert_dict[word_out + '_SYMBOL_FR'] = symbol_fr
-                else:
-                    insert_dict[word_out + '_SYMBOL_EN'] = None
-                    insert_dict[word_out + '_SYMBOL_FR'] = None
-                if value is None:
-                    insert_dict[word_out] = None
-                else:
-                    insert_dict[word_out] = float(value)
-                lst.append(insert_dict)
-                LOGGER.debug(
-                    f'Generated a daily mean value for date '
-                    f'{insert_dict["DATE"]} and station '
-                    f'{insert_dict["STATION_NUMBER"]}'
-                )
+                flag_lookup[flag] = (None, None)
+
+        lst = [
+            {
+                'STATION_NUMBER': station,
+                'DATE': date_,
+                word_out: value,
+                'IDENTIFIER': identifier,
+                f'{word_out}_SYMBOL_EN': flag_lookup[flag][0],
+                f'{word_out}_SYMBOL_FR': flag_lookup[flag][1]
+            }
+            for station, date_, value, identifier, flag in zip(
+                stations[rows], dates, values, identifiers, flags
+            )
+        ]
 
-                mean_dict = {}
-                date_ = '-'.join([str(row[1]), self.zero_pad(row[2])])
-                mean_dict['DATE'] = date_
-                mean_dict['IDENTIFIER'] = f'{row[0]}.{date_}'
-
-                if row[keys.index('MONTHLY_MEAN')]:
-                    mean_dict['MONTHLY_MEAN_' + word_out] = float(
-                        row[keys.index('MONTHLY_MEAN')]
-                    )
-                else:
-                    mean_dict['MONTHLY_MEAN_' + word_out] = None
-                mean_lst.append(mean_dict)
-                LOGGER.debug(
-                    f'Generated a monthly mean value for date '
-                    f'{mean_dict["DATE"]} and station '
-                    f'{insert_dict["STATION_NUMBER"]}'
+        mean_index = keys.index('MONTHLY_MEAN')
+        mean_lst = [
+            {
+                'DATE': month,
+                'IDENTIFIER': f'{row[0]}.{month}',
+                f'MONTHLY_MEAN_{word_out}': (
+                    float(row[mean_index]) if row[mean_index] else None
                 )
+            }
+            for row, month, days_ in zip(obs, months, no_days) if days_ > 0
+        ]
+
+        LOGGER.debug(
+            f'Generated {len(lst)} daily mean values and {len(mean_lst)} '
+            f'monthly mean values from {len(obs)} rows'
+        )
+
         return (lst, mean_lst)
 
+    def stream_obs(self, var, batch_size=10000, starting_after=None):
+        """
+        Streams all monthly rows of a discharge or level table in a single
+        query ordered by station and date, grouped by station.
+
+        :param var: table object to query discharge or level data from.
+        :param batch_size: number of rows fetched from the db at a time.
+        :param starting_after: station number after which to start (e.g.
+                               when resuming a load).
+
+        :returns: generator of tuples of (station, list of rows).
+        """
+
+        query = self.session.query(var)
+        if starting_after is not None:
+            query = query.filter(var.c['STATION_NUMBER'] > starting_after)
+        query = (
+            query.order_by(
+                var.c['STATION_NUMBER'], var.c['YEAR'], var.c['MONTH']
+            )
+            .yield_per(batch_size)
+        )
+
+        for station, rows in groupby(
+            query, key=lambda row: row.STATION_NUMBER
+        ):
+            yield station, list(rows)
+
+    def merge_obs(self, discharge_groups, level_groups):
+        """
+        Merges two streams of monthly rows grouped by station (as returned
+        by stream_obs) on the fly, i.e. a full outer join of the two
+        sorted streams.
+
+        :param discharge_groups: generator of grouped discharge rows.
+        :param level_groups: generator of grouped level rows.
+
+        :returns: generator of tuples of (station, discharge rows,
+                  level rows).
+        """
+
+        discharge = next(discharge_groups, None)
+        level = next(level_groups, None)
+
+        while discharge is not None or level is not None:
+            if level is None or (
+                discharge is not None and discharge[0] < level[0]
+            ):
+                yield discharge[0], discharge[1], []
+                discharge = next(discharge_groups, None)
+            elif discharge is None or level[0] < discharge[0]:
+                yield level[0], [], level[1]
+                level = next(level_groups, None)
+            else:
+                yield discharge[0], discharge[1], level[1]
+                discharge = next(discharge_groups, None)
+                level = next(level_groups, None)
+
     def generate_means(
-        self, discharge_var, level_var, station_table, symbol_table
+        self, discharge_var, level_var, station_table, symbol_table,
+        batch_size=10000, starting_after=None
     ):
         """
-        Unpivots db observations one station at a time, and reformats
-        observations so they can be bulk inserted to Elasticsearch.
+        Unpivots db observations in a single streaming pass over the
+        discharge and level tables (ordered by station and date, one
+        station at a time), and reformats observations so they can be bulk
+        inserted to Elasticsearch.
 
         Returns a generator of dictionaries that represent upsert actions
         into Elasticsearch's bulk API.
@@ -541,45 +688,53 @@ class HydatLoader(BaseLoader):
         :param level_var: table object to query level data from.
         :param station_table: table object to query station data from.
         :param symbol_table: table object to query symbol data from.
+        :param batch_size: number of rows fetched from the db at a time.
+        :param starting_after: station number after which to start (e.g.
+                               when resuming a load).
         :returns: generator of bulk API upsert actions.
         """
-        discharge_station_codes = [
-            x[0]
-            for x in self.session.query(
-                distinct(discharge_var.c['STATION_NUMBER'])
-            ).all()
-        ]
-        level_station_codes = [
-            x[0]
-            for x in self.session.query(
-                distinct(level_var.c['STATION_NUMBER'])
-            ).all()
-        ]
-        station_codes = list(
-            set(discharge_station_codes).union(level_station_codes)
+
+        symbols = self.get_symbols(symbol_table)
+        discharge_keys = discharge_var.columns.keys()
+        level_keys = level_var.columns.keys()
+
+        # Gather station metadata from the stations table.
+        station_keys = station_table.columns.keys()
+        stations = {}
+        for station_metadata in self.session.query(station_table).all():
+            stations[
+                station_metadata[station_keys.index('STATION_NUMBER')]
+            ] = (
+                station_metadata[station_keys.index('STATION_NAME')],
+                station_metadata[station_keys.index('PROV_TERR_STATE_LOC')],
+                [
+                    float(station_metadata[station_keys.index('LONGITUDE')]),
+                    float(station_metadata[station_keys.index('LATITUDE')]),
+                ]
+            )
+
+        groups = self.merge_obs(
+            self.stream_obs(discharge_var, batch_size, starting_after),
+            self.stream_obs(level_var, batch_size, starting_after)
         )
-        for station in station_codes:
+
+        for station, discharge_rows, level_rows in groups:
             LOGGER.debug(f'Generating discharge and level values for station {station}')  # noqa
-            discharge_lst, discharge_means = self.generate_obs(
-                station, discharge_var, symbol_table, True
+
+            if station not in stations:
+                msg = f'Could not find station metadata for station {station}'
+                LOGGER.error(msg)
+                raise LookupError(msg)
+
+            station_name, province, station_coords = stations[station]
+
+            discharge_lst, discharge_means = self.unpivot_obs(
+                discharge_rows, discharge_keys, symbols, True
             )
-            level_lst, level_means = self.generate_obs(
-                station, level_var, symbol_table, False
+            level_lst, level_means = self.unpivot_obs(
+                level_rows, level_keys, symbols, False
             )
-            station_keys = station_table.columns.keys()
-            args = {'STATION_NUMBER': station}
-            # Gather station metadata from the stations table.
-            station_metadata = list(
-                self.session.query(station_table).filter_by(**args).all()[0]
-            )
-            station_name = station_metadata[station_keys.index('STATION_NAME')]
-            province = station_metadata[
-                station_keys.index('PROV_TERR_STATE_LOC')
-            ]
-            station_coords = [
-                float(station_metadata[station_keys.index('LONGITUDE')]),
-                float(station_metadata[station_keys.index('LATITUDE')]),
-            ]
+
             # combine dictionaries with dates in common
             d = defaultdict(dict)
             for el in (discharge_lst, level_lst):
@@ -607,7 +762,7 @@ class HydatLoader(BaseLoader):
                 wrapper['geometry']['coordinates'] = station_coords
                 action = {
                     '_id': item['IDENTIFIER'],
-                    '_index': 'hydrometric_daily_mean',
+                    '_index': self.get_index_name('hydrometric_daily_mean'),
                     '_op_type': 'update',
                     'doc': wrapper,
                     'doc_as_upsert': True,
@@ -638,7 +793,7 @@ class HydatLoader(BaseLoader):
                 wrapper['geometry']['coordinates'] = station_coords
                 action = {
                     '_id': item['IDENTIFIER'],
-                    '_index': 'hydrometric_monthly_mean',
+                    '_index': self.get_index_name('hydrometric_monthly_mean'),
                     '_op_type': 'update',
                     'doc': wrapper,
                     'doc_as_upsert': True,
@@ -664,7 +819,9 @@ class HydatLoader(BaseLoader):
             x[0]
             for x in self.session.query(
                 distinct(station_table.c['STATION_NUMBER'])
-            ).all()
+            )
+            .order_by(station_table.c['STATION_NUMBER'])
+            .all()
         ]
         for station in station_codes:
             station_keys = station_table.columns.keys()
@@ -801,7 +958,7 @@ class HydatLoader(BaseLoader):
 
             action = {
                 '_id': station,
-                '_index': 'hydrometric_stations',
+                '_index': self.get_index_name('hydrometric_stations'),
                 '_op_type': 'update',
                 'doc': insert_dict,
                 'doc_as_upsert': True,
@@ -833,6 +990,11 @@ class HydatLoader(BaseLoader):
                 annual_stats_table.c['DATA_TYPE'],
                 annual_stats_table.c['YEAR'],
             )
+            .order_by(
+                annual_stats_table.c['STATION_NUMBER'],
+                annual_stats_table.c['DATA_TYPE'],
+                annual_stats_table.c['YEAR'],
+            )
             .all()
         )
         results = [list(x) for x in results]
@@ -895,26 +1057,16 @@ class HydatLoader(BaseLoader):
                 )
             else:
                 max_date = f'{year}-{self.zero_pad(max_month)}-{self.zero_pad(max_day)}' # noqa
-            symbol_keys = symbol_table.columns.keys()
+            symbols = self.get_symbols(symbol_table)
             if min_symbol is not None and min_symbol.strip():
-                args = {'SYMBOL_ID': min_symbol}
-                symbol_data = list(
-                    self.session.query(symbol_table).filter_by(**args).all()[0]
-                )
-                min_symbol_en = symbol_data[symbol_keys.index('SYMBOL_EN')]
-                min_symbol_fr = symbol_data[symbol_keys.index('SYMBOL_FR')]
+                min_symbol_en, min_symbol_fr = symbols[min_symbol]
             else:
                 min_symbol_en = min_symbol_fr = ''
                 LOGGER.warning(
                     f'Could not find min symbol for station {station_number}'
                 )
             if max_symbol is not None and max_symbol.strip():
-                args = {'SYMBOL_ID': max_symbol}
-                symbol_data = list(
-                    self.session.query(symbol_table).filter_by(**args).all()[0]
-                )
-                max_symbol_en = symbol_data[symbol_keys.index('SYMBOL_EN')]
-                max_symbol_fr = symbol_data[symbol_keys.index('SYMBOL_FR')]
+                max_symbol_en, max_symbol_fr = symbols[max_symbol]
             else:
                 max_symbol_en = max_symbol_fr = ''
                 LOGGER.warning(
@@ -955,7 +1107,7 @@ class HydatLoader(BaseLoader):
             }
             action = {
                 '_id': es_id,
-                '_index': 'hydrometric_annual_statistics',
+                '_index': self.get_index_name('hydrometric_annual_statistics'),
                 '_op_type': 'update',
                 'doc': insert_dict,
                 'doc_as_upsert': True,
@@ -1008,6 +1160,12 @@ class HydatLoader(BaseLoader):
                 annual_peaks_table.c['YEAR'],
                 annual_peaks_table.c['PEAK_CODE'],
             )
+            .order_by(
+                annual_peaks_table.c['STATION_NUMBER'],
+                annual_peaks_table.c['DATA_TYPE'],
+                annual_peaks_table.c['YEAR'],
+                annual_peaks_table.c['PEAK_CODE'],
+            )
             .all()
         )
         results = [list(x) for x in results]
@@ -1100,13 +1258,9 @@ class HydatLoader(BaseLoader):
                     f'Could not find peaks for station {station_number}'
                 )
             if symbol_id and symbol_id.strip():
-                symbol_keys = symbol_table.columns.keys()
-                args = {'SYMBOL_ID': symbol_id}
-                symbol_data = list(
-                    self.session.query(symbol_table).filter_by(**args).all()[0]
-                )
-                symbol_en = symbol_data[symbol_keys.index('SYMBOL_EN')]
-                symbol_fr = symbol_data[symbol_keys.index('SYMBOL_FR')]
+                symbol_en, symbol_fr = self.get_symbols(symbol_table)[
+                    symbol_id
+                ]
             else:
                 symbol_en = symbol_fr = None
                 LOGGER.warning(
@@ -1155,7 +1309,7 @@ class HydatLoader(BaseLoader):
             }
             action = {
                 '_id': es_id,
-                '_index': 'hydrometric_annual_peaks',
+                '_index': self.get_index_name('hydrometric_annual_peaks'),
                 '_op_type': 'update',
                 'doc': insert_dict,
                 'doc_as_upsert': True,
@@ -1172,6 +1326,7 @@ def hydat():
 @click.command()
 @click.pass_context
 @cli_options.OPTION_BATCH_SIZE()
+@cli_options.OPTION_BULK_WORKERS()
 @cli_options.OPTION_DB(help='Path to HYDAT SQLite database')
 @cli_options.OPTION_ELASTICSEARCH()
 @cli_options.OPTION_ES_USERNAME()
@@ -1188,6 +1343,7 @@ def hydat():
         ]
     )
 )
+@cli_options.OPTION_RESUME()
 def add(
     ctx,
     db,
@@ -1197,10 +1353,13 @@ def add(
     ignore_certs,
     dataset,
     batch_size,
+    bulk_workers,
+    resume,
 ):
     """Loads HYDAT data into Elasticsearch"""
 
-    conn_config = configure_es_connection(es, username, password, ignore_certs)
+    conn_config = configure_es_connection(es, username, password, ignore_certs,
+                                          bulk_workers)
     loader = HydatLoader(db, conn_config)
 
     click.echo(f'Accessing SQLite database {db}')
@@ -1229,6 +1388,16 @@ def add(
     else:
         datasets_to_process = [dataset]
 
+    checkpoint = Checkpoint('hydat', resume, {
+        'version': loader.index_version
+    })
+    # a resumed load continues with the index generations of the
+    # interrupted load
+    loader.index_version = checkpoint.meta['version']
+    datasets_to_process = [
+        dtp for dtp in datasets_to_process if not checkpoint.is_complete(dtp)
+    ]
+
     click.echo(f'Processing dataset(s): {datasets_to_process}')
 
     if 'stations' in datasets_to_process:
@@ -1237,10 +1406,14 @@ def add(
             raise click.ClickException(msg)
         try:
             click.echo('Populating stations index')
+            checkpoint.start('stations')
             loader.create_index('stations')
-            stations = loader.generate_stations(
-                station_table, annual_peaks_table, annual_stats_table)
-            loader.conn.submit_elastic_package(stations, batch_size)
+            stations = checkpoint.track(loader.generate_stations(
+                station_table, annual_peaks_table, annual_stats_table))
+            loader.conn.submit_elastic_package(
+                stations, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate stations index: {err}'
             raise click.ClickException(msg)
@@ -1248,10 +1421,22 @@ def add(
     if 'observations' in datasets_to_process:
         try:
             click.echo('Populating observations indexes')
+            checkpoint.start('observations')
             loader.create_index('observations')
-            means = loader.generate_means(discharge_var, level_var,
-                                          station_table, symbol_table)
-            loader.conn.submit_elastic_package(means, batch_size)
+            means = loader.generate_means(
+                discharge_var, level_var, station_table, symbol_table,
+                starting_after=checkpoint.get_last_key()
+            )
+            means = checkpoint.track(
+                means,
+                key=lambda action: action['doc']['properties'][
+                    'STATION_NUMBER'
+                ]
+            )
+            loader.conn.submit_elastic_package(
+                means, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate observations indexes: {err}'
             raise click.ClickException(msg)
@@ -1259,11 +1444,17 @@ def add(
     if 'annual-statistics' in datasets_to_process:
         try:
             click.echo('Populating annual statistics index')
+            checkpoint.start('annual-statistics')
             loader.create_index('annual_statistics')
-            stats = loader.generate_annual_stats(annual_stats_table,
-                                                 data_types_table,
-                                                 station_table, symbol_table)
-            loader.conn.submit_elastic_package(stats, batch_size)
+            stats = checkpoint.track(
+                loader.generate_annual_stats(annual_stats_table,
+                                             data_types_table,
+                                             station_table, symbol_table)
+            )
+            loader.conn.submit_elastic_package(
+                stats, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate annual statistics index: {err}'
             raise click.ClickException(msg)
@@ -1271,11 +1462,17 @@ def add(
     if 'annual-peaks' in datasets_to_process:
         try:
             click.echo('Populating annual peaks index')
+            checkpoint.start('annual-peaks')
             loader.create_index('annual_peaks')
-            peaks = loader.generate_annual_peaks(annual_peaks_table,
-                                                 data_types_table,
-                                                 symbol_table, station_table)
-            loader.conn.submit_elastic_package(peaks, batch_size)
+            peaks = checkpoint.track(
+                loader.generate_annual_peaks(annual_peaks_table,
+                                             data_types_table,
+                                             symbol_table, station_table)
+            )
+            loader.conn.submit_elastic_package(
+                peaks, batch_size, callback=checkpoint.ack
+            )
+            loader.swap_indexes(checkpoint.finish())
         except Exception as err:
             msg = f'Could not populate annual peaks index: {err}'
             raise click.ClickException(msg)
@@ -35,8 +35,14 @@ import os
 import urllib.request
 
 from msc_pygeoapi import cli_options
-from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
-from msc_pygeoapi.env import MSC_PYGEOAPI_CACHEDIR
+from msc_pygeoapi.connector.elasticsearch_ import (
+    ElasticsearchBulkSink,
+    ElasticsearchConnector
+)
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_CACHEDIR,
+    MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS
+)
 from msc_pygeoapi.loader.base import BaseLoader
 from msc_pygeoapi.util import (
     check_es_indexes_to_delete,
@@ -176,7 +182,12 @@ class HydrometricRealtimeLoader(BaseLoader):
         self.conn = ElasticsearchConnector(conn_config)
         self.conn.create_template(INDEX_BASENAME, SETTINGS)
 
+        self.sink = None
+        if MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS > 0:
+            self.sink = ElasticsearchBulkSink(self.conn)
+
         self.stations = {}
+        self.stations_mtime = None
         self.read_stations_list()
 
     def read_stations_list(self):
@@ -191,6 +202,8 @@ class HydrometricRealtimeLoader(BaseLoader):
         if not os.path.exists(STATIONS_CACHE):
             download_stations()
 
+        self.stations_mtime = os.path.getmtime(STATIONS_CACHE)
+
         with open(STATIONS_CACHE) as stations_file:
             reader = csv.reader(stations_file)
 
@@ -366,7 +379,8 @@ class HydrometricRealtimeLoader(BaseLoader):
 
         :param filepath: filepath to data on disk
 
-        :returns: `bool` of status result
+        :returns: `bool` of status result, or `concurrent.futures.Future`
+                  resolving to it when actions are buffered in a bulk sink
         """
 
         if filepath.endswith('hydrometric_StationList.csv'):
@@ -374,8 +388,18 @@ class HydrometricRealtimeLoader(BaseLoader):
 
         LOGGER.debug(f'Received file {filepath}')
 
+        # pick up any refreshed stations list
+        if (not os.path.exists(STATIONS_CACHE) or
+                os.path.getmtime(STATIONS_CACHE) != self.stations_mtime):
+            LOGGER.debug('Reloading stations list')
+            self.read_stations_list()
+
         package = self.generate_observations(filepath)
-        self.conn.submit_elastic_package(package, request_size=80000)
+
+        if self.sink is not None:
+            return self.sink.submit(package, key=filepath)
+        else:
+            self.conn.submit_elastic_package(package, request_size=80000)
 
         return True
 
@@ -423,10 +447,14 @@ def add(ctx, file_, directory, es, username, password, ignore_certs):
                 files_to_process.append(os.path.join(root, f))
         files_to_process.sort(key=os.path.getmtime)
 
+    loader = HydrometricRealtimeLoader(conn_config)
+
     for file_to_process in files_to_process:
-        loader = HydrometricRealtimeLoader(conn_config)
         loader.load_data(file_to_process)
 
+    if loader.sink is not None:
+        loader.sink.close()
+
     click.echo('Done')
 
 
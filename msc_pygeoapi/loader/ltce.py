@@ -39,6 +39,7 @@ from msc_pygeoapi import cli_options
 from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
 from msc_pygeoapi.env import MSC_PYGEOAPI_LOGGING_LOGLEVEL
 from msc_pygeoapi.loader.base import BaseLoader
+from msc_pygeoapi.loader.checkpoint import Checkpoint
 from msc_pygeoapi.util import (
     check_es_indexes_to_delete,
     configure_es_connection,
@@ -532,7 +533,12 @@ class LtceLoader(BaseLoader):
                     "WHERE "
                     "ARKEON2DWH.VIRTUAL_STATION_INFO_F_MVW.ELEMENT_NAME_E IN "
                     "('DAILY MINIMUM TEMPERATURE', 'DAILY MAXIMUM TEMPERATURE',"  # noqa
-                    "'DAILY TOTAL PRECIPITATION', 'DAILY TOTAL SNOWFALL')"
+                    "'DAILY TOTAL PRECIPITATION', 'DAILY TOTAL SNOWFALL') "
+                    "ORDER BY "
+                    "ARKEON2DWH.VIRTUAL_STATION_INFO_F_MVW.VIRTUAL_CLIMATE_ID,"
+                    "ARKEON2DWH.VIRTUAL_STATION_INFO_F_MVW.ELEMENT_NAME_E,"
+                    "ARKEON2DWH.VIRTUAL_STATION_INFO_F_MVW.CLIMATE_IDENTIFIER,"
+                    "ARKEON2DWH.VIRTUAL_STATION_INFO_F_MVW.START_DATE"
                 )
             )
         except Exception as err:
@@ -655,6 +661,8 @@ class LtceLoader(BaseLoader):
                     "ON t1.VIRTUAL_CLIMATE_ID = t8.VIRTUAL_CLIMATE_ID "
                     "AND t1.LOCAL_MONTH = t8.LOCAL_MONTH "
                     "AND t1.LOCAL_DAY = t8.LOCAL_DAY "
+                    "ORDER BY t1.VIRTUAL_CLIMATE_ID, t1.LOCAL_MONTH, "
+                    "t1.LOCAL_DAY"
                 )
             )
         except Exception as err:
@@ -801,6 +809,8 @@ class LtceLoader(BaseLoader):
                     "ON t1.VIRTUAL_CLIMATE_ID = t2.VIRTUAL_CLIMATE_ID "
                     "AND t1.LOCAL_MONTH = t2.LOCAL_MONTH "
                     "AND t1.LOCAL_DAY = t2.LOCAL_DAY "
+                    "ORDER BY t1.VIRTUAL_CLIMATE_ID, t1.LOCAL_MONTH, "
+                    "t1.LOCAL_DAY"
                 )
             )
         except Exception as err:
@@ -915,6 +925,8 @@ class LtceLoader(BaseLoader):
                     "ON t1.VIRTUAL_CLIMATE_ID = t2.VIRTUAL_CLIMATE_ID "
                     "AND t1.LOCAL_MONTH = t2.LOCAL_MONTH "
                     "AND t1.LOCAL_DAY = t2.LOCAL_DAY "
+                    "ORDER BY t1.VIRTUAL_CLIMATE_ID, t1.LOCAL_MONTH, "
+                    "t1.LOCAL_DAY"
                 )
             )
         except Exception as err:
@@ -1036,6 +1048,7 @@ def ltce():
     ),
     help='LTCE dataset to load',
 )
+@cli_options.OPTION_RESUME()
 def add(
     ctx,
     db,
@@ -1045,6 +1058,7 @@ def add(
     ignore_certs,
     dataset,
     batch_size,
+    resume,
 ):
     """
     Loads Long Term Climate Extremes(LTCE) data from Oracle DB
@@ -1052,6 +1066,7 @@ def add(
 
     :param db: database connection string.
     :param dataset: name of dataset to load, or all for all datasets.
+    :param resume: whether to resume an interrupted load.
     """
 
     conn_config = configure_es_connection(es, username, password, ignore_certs)
@@ -1074,21 +1089,38 @@ def add(
     else:
         datasets_to_process = [dataset]
 
+    checkpoint = Checkpoint('ltce', resume, {'date': loader.date})
+    # a resumed load continues populating the indexes of the interrupted load
+    loader.date = checkpoint.meta['date']
+
+    datasets_to_process = [
+        dtp for dtp in datasets_to_process if not checkpoint.is_complete(dtp)
+    ]
+
     if 'stations' in datasets_to_process:
         try:
-            stations = loader.generate_stations()
+            checkpoint.start('stations')
+            stations = checkpoint.track(loader.generate_stations())
             if stations:
-                loader.conn.submit_elastic_package(stations, batch_size)
-                LOGGER.info('Stations populated.')
-                LOGGER.info(
-                    f'Setting alias ltce_station to point '
-                    f'to index ltce_stations.{loader.date}.'
-                )
-                loader.conn.create_alias(
-                    'ltce_stations',
-                    f'ltce_stations.{loader.date}',
-                    overwrite=True,
+                loader.conn.submit_elastic_package(
+                    stations, batch_size, callback=checkpoint.ack
                 )
+                LOGGER.info('Stations populated.')
+                if checkpoint.finish():
+                    LOGGER.info(
+                        f'Setting alias ltce_station to point '
+                        f'to index ltce_stations.{loader.date}.'
+                    )
+                    loader.conn.create_alias(
+                        'ltce_stations',
+                        f'ltce_stations.{loader.date}',
+                        overwrite=True,
+                    )
+                else:
+                    LOGGER.warning(
+                        f'Load of ltce_stations.{loader.date} '
+                        'incomplete, not setting alias ltce_stations'
+                    )
             else:
                 LOGGER.error('No stations populated.')
         except Exception as err:
@@ -1097,19 +1129,30 @@ def add(
 
     if 'temperature' in datasets_to_process:
         try:
-            temp_extremes = loader.generate_daily_temp_extremes()
+            checkpoint.start('temperature')
+            temp_extremes = checkpoint.track(
+                loader.generate_daily_temp_extremes()
+            )
             if temp_extremes:
-                loader.conn.submit_elastic_package(temp_extremes, batch_size)
-                LOGGER.info('Daily temperature extremes populated.')
-                LOGGER.info(
-                    f'Setting alias ltce_temp_extremes to '
-                    f'point to index ltce_temp_extremes.{loader.date}.'
-                )
-                loader.conn.create_alias(
-                    'ltce_temp_extremes',
-                    f'ltce_temp_extremes.{loader.date}',
-                    overwrite=True,
+                loader.conn.submit_elastic_package(
+                    temp_extremes, batch_size, callback=checkpoint.ack
                 )
+                LOGGER.info('Daily temperature extremes populated.')
+                if checkpoint.finish():
+                    LOGGER.info(
+                        f'Setting alias ltce_temp_extremes to '
+                        f'point to index ltce_temp_extremes.{loader.date}.'
+                    )
+                    loader.conn.create_alias(
+                        'ltce_temp_extremes',
+                        f'ltce_temp_extremes.{loader.date}',
+                        overwrite=True,
+                    )
+                else:
+                    LOGGER.warning(
+                        f'Load of ltce_temp_extremes.{loader.date} '
+                        'incomplete, not setting alias ltce_temp_extremes'
+                    )
             else:
                 LOGGER.error('No temperature extremes populated.')
         except Exception as err:
@@ -1121,19 +1164,30 @@ def add(
 
     if 'precipitation' in datasets_to_process:
         try:
-            precip_extremes = loader.generate_daily_precip_extremes()
+            checkpoint.start('precipitation')
+            precip_extremes = checkpoint.track(
+                loader.generate_daily_precip_extremes()
+            )
             if precip_extremes:
-                loader.conn.submit_elastic_package(precip_extremes, batch_size)
-                LOGGER.info('Daily precipitation extremes populated.')
-                LOGGER.info(
-                    f'Setting alias ltce_precip_extremes to '
-                    f'point to index ltce_precip_extremes.{loader.date}.'
-                )
-                loader.conn.create_alias(
-                    'ltce_precip_extremes',
-                    f'ltce_precip_extremes.{loader.date}',
-                    overwrite=True,
+                loader.conn.submit_elastic_package(
+                    precip_extremes, batch_size, callback=checkpoint.ack
                 )
+                LOGGER.info('Daily precipitation extremes populated.')
+                if checkpoint.finish():
+                    LOGGER.info(
+                        f'Setting alias ltce_precip_extremes to '
+                        f'point to index ltce_precip_extremes.{loader.date}.'
+                    )
+                    loader.conn.create_alias(
+                        'ltce_precip_extremes',
+                        f'ltce_precip_extremes.{loader.date}',
+                        overwrite=True,
+                    )
+                else:
+                    LOGGER.warning(
+                        f'Load of ltce_precip_extremes.{loader.date} '
+                        'incomplete, not setting alias ltce_precip_extremes'
+                    )
             else:
                 LOGGER.error('No precipitation extremes populated.')
         except Exception as err:
@@ -1145,19 +1199,30 @@ def add(
 
     if 'snowfall' in datasets_to_process:
         try:
-            snow_extremes = loader.generate_daily_snow_extremes()
+            checkpoint.start('snowfall')
+            snow_extremes = checkpoint.track(
+                loader.generate_daily_snow_extremes()
+            )
             if snow_extremes:
-                loader.conn.submit_elastic_package(snow_extremes, batch_size)
-                LOGGER.info('Daily snowfall extremes populated.')
-                LOGGER.info(
-                    f'Setting alias ltce_snow_extremes to '
-                    f'point to index ltce_snow_extremes.{loader.date}.'
-                )
-                loader.conn.create_alias(
-                    'ltce_snow_extremes',
-                    f'ltce_snow_extremes.{loader.date}',
-                    overwrite=True,
+                loader.conn.submit_elastic_package(
+                    snow_extremes, batch_size, callback=checkpoint.ack
                 )
+                LOGGER.info('Daily snowfall extremes populated.')
+                if checkpoint.finish():
+                    LOGGER.info(
+                        f'Setting alias ltce_snow_extremes to '
+                        f'point to index ltce_snow_extremes.{loader.date}.'
+                    )
+                    loader.conn.create_alias(
+                        'ltce_snow_extremes',
+                        f'ltce_snow_extremes.{loader.date}',
+                        overwrite=True,
+                    )
+                else:
+                    LOGGER.warning(
+                        f'Load of ltce_snow_extremes.{loader.date} '
+                        'incomplete, not setting alias ltce_snow_extremes'
+                    )
             else:
                 LOGGER.error('No snowfall extremes populated.')
         except Exception as err:
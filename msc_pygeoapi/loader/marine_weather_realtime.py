@@ -642,6 +642,16 @@ class MarineWeatherRealtimeLoader(BaseLoader):
 
         yield action
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.area = {}
+        self.items = []
+
     def load_data(self, filepath):
         """
         loads data from event to target
@@ -39,8 +39,14 @@ import os
 from lxml import etree
 
 from msc_pygeoapi import cli_options
-from msc_pygeoapi.env import MSC_PYGEOAPI_CACHEDIR
-from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_CACHEDIR,
+    MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS
+)
+from msc_pygeoapi.connector.elasticsearch_ import (
+    ElasticsearchBulkSink,
+    ElasticsearchConnector
+)
 from msc_pygeoapi.loader.base import BaseLoader
 from msc_pygeoapi.util import (
     configure_es_connection,
@@ -295,6 +301,10 @@ class SWOBRealtimeLoader(BaseLoader):
         self.items = []
         self.conn.create_template(INDEX_BASENAME, SETTINGS)
 
+        self.sink = None
+        if MSC_PYGEOAPI_ES_BULK_SINK_MAX_DOCS > 0:
+            self.sink = ElasticsearchBulkSink(self.conn)
+
     def generate_observations(self, filepath):
         """
         Generates and yields a series of observations, one for each row in
@@ -330,20 +340,34 @@ class SWOBRealtimeLoader(BaseLoader):
 
         yield action
 
+    def reset(self):
+        """
+        resets per-file state before loading another file
+
+        :returns: `None`
+        """
+
+        self.items = []
+
     def load_data(self, filepath):
         """
         loads data from event to target
 
         :param filepath: filepath to data on disk
 
-        :returns: `bool` of status result
+        :returns: `bool` of status result, or `concurrent.futures.Future`
+                  resolving to it when actions are buffered in a bulk sink
         """
 
         LOGGER.debug(f'Received file {filepath}')
         chunk_size = 80000
 
         package = self.generate_observations(filepath)
-        self.conn.submit_elastic_package(package, request_size=chunk_size)
+
+        if self.sink is not None:
+            return self.sink.submit(package, key=filepath)
+        else:
+            self.conn.submit_elastic_package(package, request_size=chunk_size)
 
         return True
 
@@ -380,12 +404,17 @@ def add(ctx, file_, directory, es, username, password, ignore_certs):
                 files_to_process.append(os.path.join(root, f))
         files_to_process.sort(key=os.path.getmtime)
 
+    loader = SWOBRealtimeLoader(conn_config)
+
     for file_to_process in files_to_process:
-        loader = SWOBRealtimeLoader(conn_config)
+        loader.reset()
         result = loader.load_data(file_to_process)
         if not result:
             click.echo('features not generated')
 
+    if loader.sink is not None:
+        loader.sink.close()
+
 
 @click.command()
 @click.pass_context
@@ -31,6 +31,7 @@
 import click
 import logging
 
+from msc_pygeoapi.process.cccs.point_store import point_store
 from msc_pygeoapi.process.cccs.raster_drill import raster_drill_execute
 
 LOGGER = logging.getLogger(__name__)
@@ -45,4 +46,5 @@ def cccs():
     pass
 
 
+cccs.add_command(point_store)
 cccs.add_command(raster_drill_execute)
@@ -0,0 +1,311 @@
+# =================================================================
+#
+# Author: Louis-Philippe Rousseau-Lambert
+#         <Louis-Philippe.RousseauLambert2@canada.ca>
+#
+# Copyright (c) 2023 Louis-Philippe Rousseau-Lambert
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import glob
+import logging
+import os
+import re
+
+import click
+import netCDF4
+import numpy as np
+import xarray
+
+from msc_pygeoapi.env import GEOMET_CLIMATE_POINT_STORE_BASEPATH
+
+LOGGER = logging.getLogger(__name__)
+
+# number of pixels along x and y of a store chunk
+CHUNK_SIZE = 16
+
+
+def get_store_path(source, basepath=GEOMET_CLIMATE_POINT_STORE_BASEPATH):
+    """
+    Helper function to get the point store filepath of a data source
+
+    :param source: filepath or glob pattern of source data
+    :param basepath: basepath of point stores
+
+    :returns: `str` of point store filepath
+    """
+
+    root, _ = os.path.splitext(source.strip('/'))
+    name = re.sub(r'[^\w.-]+', '_', root)
+
+    return os.path.join(basepath, f'{name}.nc')
+
+
+def get_store(source, basepath=GEOMET_CLIMATE_POINT_STORE_BASEPATH):
+    """
+    Helper function to get the point store of a data source, if it exists
+    and is up to date with the source data
+
+    :param source: filepath or glob pattern of source data
+    :param basepath: basepath of point stores
+
+    :returns: `str` of point store filepath, or `None`
+    """
+
+    if basepath is None:
+        return None
+
+    store = get_store_path(source, basepath)
+
+    try:
+        store_mtime = os.stat(store).st_mtime_ns
+        source_mtimes = [os.stat(f).st_mtime_ns for f in glob.glob(source)]
+    except OSError:
+        return None
+
+    if not source_mtimes or max(source_mtimes) > store_mtime:
+        LOGGER.debug(f'Point store {store} is out of date')
+        return None
+
+    return store
+
+
+def read_store_pixels(store, xs, ys):
+    """
+    reads the pixel values of all bands of a raster point store at many
+    coordinates, reading each distinct pixel once, in row order
+
+    :param store: filepath of raster point store
+    :param xs: list of x coordinates
+    :param ys: list of y coordinates
+
+    :returns: `list` of `numpy.ndarray` of values (one per band), or
+              `None` for coordinates outside of the raster extent
+    """
+
+    with netCDF4.Dataset(store) as nc:
+        nc.set_auto_mask(False)
+        origin_x, width, _, origin_y, _, height = nc.geotransform
+
+        xs_ = ((np.asarray(xs, dtype=float) - origin_x) / width).astype(int)
+        ys_ = ((np.asarray(ys, dtype=float) - origin_y) / height).astype(int)
+
+        values = nc.variables['values']
+        _, ysize, xsize = values.shape
+
+        inside = (xs_ >= 0) & (xs_ < xsize) & (ys_ >= 0) & (ys_ < ysize)
+
+        pixels = {}
+        offsets = set(zip(ys_[inside].tolist(), xs_[inside].tolist()))
+        for y_, x_ in sorted(offsets):
+            pixels[(y_, x_)] = values[:, y_, x_]
+
+    return [pixels.get((y_, x_)) for x_, y_ in zip(xs_.tolist(), ys_.tolist())]
+
+
+def build_raster_store(source, store, chunk_size=CHUNK_SIZE):
+    """
+    rechunk all bands of a raster into a time-major point store
+
+    :param source: filepath of raster data
+    :param store: filepath of point store
+    :param chunk_size: number of pixels along x and y of a store chunk
+
+    :returns: `None`
+    """
+
+    from osgeo import gdal
+
+    ds = gdal.Open(source)
+    if ds is None:
+        raise RuntimeError(f'Cannot open file: {source}')
+
+    bands, ysize, xsize = ds.RasterCount, ds.RasterYSize, ds.RasterXSize
+    nodata = ds.GetRasterBand(1).GetNoDataValue()
+
+    tmp_store = f'{store}.tmp'
+    with netCDF4.Dataset(tmp_store, 'w') as nc:
+        nc.createDimension('band', bands)
+        nc.createDimension('y', ysize)
+        nc.createDimension('x', xsize)
+
+        nc.source = source
+        nc.geotransform = ds.GetGeoTransform()
+        nc.projection = ds.GetProjection()
+
+        values = None
+        for yoff in range(0, ysize, chunk_size):
+            rows = min(chunk_size, ysize - yoff)
+            LOGGER.debug(f'Reading rows {yoff} to {yoff + rows} of {source}')
+            block = ds.ReadAsArray(0, yoff, xsize, rows)
+            block = block.reshape(bands, rows, xsize)
+
+            if values is None:
+                values = nc.createVariable(
+                    'values', block.dtype, ('band', 'y', 'x'), zlib=True,
+                    chunksizes=(bands, min(chunk_size, ysize),
+                                min(chunk_size, xsize)))
+                if nodata is not None:
+                    values.nodata = nodata
+
+            values[:, yoff:yoff + rows, :] = block
+
+    ds = None
+    os.replace(tmp_store, store)
+
+
+def build_xarray_store(source, store, chunk_size=CHUNK_SIZE):
+    """
+    rechunk the data variables of a NetCDF source into a time-major
+    point store, keeping the source dimensions, coordinates and attributes
+
+    :param source: filepath or glob pattern of NetCDF data
+    :param store: filepath of point store
+    :param chunk_size: number of pixels along x and y of a store chunk
+
+    :returns: `None`
+    """
+
+    tmp_store = f'{store}.tmp'
+
+    with xarray.open_mfdataset(source) as ds:
+        encoding = {}
+        for name, var in ds.variables.items():
+            for key in ['chunksizes', 'contiguous', 'original_shape']:
+                var.encoding.pop(key, None)
+
+            if name not in ds.data_vars or var.ndim < 3:
+                continue
+
+            # (time, y, x): full time dimension, small spatial blocks
+            chunksizes = list(var.shape[:-2])
+            chunksizes.extend(min(chunk_size, size)
+                              for size in var.shape[-2:])
+
+            encoding[name] = {'chunksizes': tuple(chunksizes), 'zlib': True}
+
+        ds.attrs['point_store_chunk_size'] = chunk_size
+        ds.to_netcdf(tmp_store, encoding=encoding)
+
+    os.replace(tmp_store, store)
+
+
+def is_point_subset(store, query_params, x_field, y_field):
+    """
+    Helper function to check whether a spatial subset is small enough to
+    be read from a point store (at most one chunk along x and y)
+
+    :param store: xarray Dataset of point store
+    :param query_params: `dict` of query parameters (slices)
+    :param x_field: name of x coordinate
+    :param y_field: name of y coordinate
+
+    :returns: `bool` of whether the subset is a point subset
+    """
+
+    chunk_size = store.attrs.get('point_store_chunk_size', CHUNK_SIZE)
+
+    for field in [x_field, y_field]:
+        subset = query_params.get(field)
+        if not isinstance(subset, slice):
+            return False
+
+        coords = store.coords[field].values
+        if coords.size < 2:
+            continue
+
+        resolution = abs(coords[1] - coords[0])
+        if abs(subset.stop - subset.start) > chunk_size * resolution:
+            return False
+
+    return True
+
+
+@click.group('point-store')
+def point_store():
+    """Manage time-major point series stores"""
+    pass
+
+
+@click.command('build')
+@click.pass_context
+@click.option('--layer', 'layers', multiple=True,
+              help='geomet-climate layer to rechunk (default: all layers)')
+@click.option('--source', 'sources', multiple=True,
+              help='NetCDF file or glob pattern to rechunk')
+@click.option('--basepath', default=GEOMET_CLIMATE_POINT_STORE_BASEPATH,
+              help='point store basepath')
+@click.option('--chunk-size', type=click.IntRange(1, 1024),
+              default=CHUNK_SIZE, help='pixels along x/y of a store chunk')
+@click.option('--force', is_flag=True, default=False,
+              help='rebuild up to date point stores')
+def build(ctx, layers, sources, basepath, chunk_size, force):
+    """Rechunk geomet-climate layers into time-major point stores"""
+
+    import yaml
+    from yaml import CLoader
+
+    from msc_pygeoapi.process.cccs import GEOMET_CLIMATE_CONFIG
+    from msc_pygeoapi.process.cccs.raster_drill import get_layer_info
+
+    if basepath is None:
+        raise click.ClickException(
+            'Missing point store basepath (--basepath or '
+            'GEOMET_CLIMATE_POINT_STORE_BASEPATH)')
+
+    os.makedirs(basepath, exist_ok=True)
+
+    targets = []
+
+    if layers or not sources:
+        with open(GEOMET_CLIMATE_CONFIG, encoding='utf-8') as fh:
+            cfg = yaml.load(fh, Loader=CLoader)
+
+        for layer in layers or cfg['layers'].keys():
+            try:
+                file_, _ = get_layer_info(cfg, layer)
+            except (KeyError, ValueError):
+                if layers:
+                    raise click.ClickException(f'Invalid layer: {layer}')
+                continue
+            targets.append((file_, build_raster_store))
+
+    targets.extend((source, build_xarray_store) for source in sources)
+
+    for source, builder in targets:
+        if not force and get_store(source, basepath) is not None:
+            click.echo(f'Point store of {source} is up to date')
+            continue
+
+        store = get_store_path(source, basepath)
+        click.echo(f'Building point store of {source}')
+        try:
+            builder(source, store, chunk_size)
+        except (OSError, RuntimeError) as err:
+            LOGGER.error(f'Cannot build point store of {source}: {err}')
+
+    click.echo('Done')
+
+
+point_store.add_command(build)
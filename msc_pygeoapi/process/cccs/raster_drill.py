@@ -37,11 +37,15 @@ import logging
 import os
 import re
 
+import numpy as np
 from osgeo import gdal, osr
 from pyproj import Proj, transform
 import yaml
 from yaml import CLoader
 
+from msc_pygeoapi.process.cccs.point_store import (get_store,
+                                                   read_store_pixels)
+
 LOGGER = logging.getLogger(__name__)
 
 UNITS = {
@@ -67,8 +71,11 @@ UNITS = {
     'TX30': {'ABS': 'Days / Jours'}
     }
 
+# maximum number of locations of a single raster drill
+MAX_POINTS = 10000
+
 PROCESS_METADATA = {
-    'version': '0.1.0',
+    'version': '0.2.0',
     'id': 'raster-drill',
     'title': 'GeoMet-Climate Raster Drill process',
     'description': 'GeoMet-Climate Raster Drill process',
@@ -102,7 +109,7 @@ PROCESS_METADATA = {
             'schema': {
                 'type': 'number',
             },
-            'minOccurs': 1,
+            'minOccurs': 0,
             'maxOccurs': 1
         },
         'x': {
@@ -111,7 +118,22 @@ PROCESS_METADATA = {
             'schema': {
                 'type': 'number',
             },
-            'minOccurs': 1,
+            'minOccurs': 0,
+            'maxOccurs': 1
+        },
+        'points': {
+            'title': 'points',
+            'description': 'GeoJSON MultiPoint geometry, or CSV of x,y '
+                           'coordinates, of the requested locations '
+                           '(EPSG:4326), instead of x and y',
+            'schema': {
+                'oneOf': [{
+                    '$ref': 'https://geojson.org/schema/MultiPoint.json'
+                }, {
+                    'type': 'string'
+                }]
+            },
+            'minOccurs': 0,
             'maxOccurs': 1
         },
         'format': {
@@ -186,30 +208,68 @@ def get_time_info(cfg):
     return dates
 
 
-def geo2xy(ds, x, y):
+def geo2xy_array(ds, xs, ys):
     """
-    transforms geographic coordinate to x/y pixel values
+    transforms many geographic coordinates to x/y pixel values
 
     :param ds: GDAL dataset object
-    :param x: x coordinate
-    :param y: y coordinate
+    :param xs: list of x coordinates
+    :param ys: list of y coordinates
 
-    :returns: list of x/y pixel values
+    :returns: `tuple` of `numpy.ndarray` of x and y pixel values
     """
 
     LOGGER.debug('Running affine transformation')
-    geotransform = ds.GetGeoTransform()
+    origin_x, width, _, origin_y, _, height = ds.GetGeoTransform()
+
+    xs_ = ((np.asarray(xs, dtype=float) - origin_x) / width).astype(int)
+    ys_ = ((np.asarray(ys, dtype=float) - origin_y) / height).astype(int)
+
+    return xs_, ys_
+
+
+def read_pixel(ds, x, y):
+    """
+    reads a pixel value across all bands of a raster, as a single
+    1x1 window read
 
-    origin_x = geotransform[0]
-    origin_y = geotransform[3]
+    :param ds: GDAL dataset object
+    :param x: x pixel value
+    :param y: y pixel value
+
+    :returns: `numpy.ndarray` of values (one per band)
+    """
 
-    width = geotransform[1]
-    height = geotransform[5]
+    if not (0 <= x < ds.RasterXSize and 0 <= y < ds.RasterYSize):
+        raise IndexError(f'pixel ({x}, {y}) outside of raster extent')
 
-    x = int((x - origin_x) / width)
-    y = int((y - origin_y) / height)
+    LOGGER.debug(f'Reading pixel ({x}, {y}) of {ds.RasterCount} bands')
+    array = ds.ReadAsArray(x, y, 1, 1)
 
-    return (x, y)
+    return array.reshape(ds.RasterCount)
+
+
+def read_pixels(ds, xs, ys):
+    """
+    reads many pixel values across all bands of a raster, reading each
+    distinct pixel once, in row order
+
+    :param ds: GDAL dataset object
+    :param xs: `numpy.ndarray` of x pixel values
+    :param ys: `numpy.ndarray` of y pixel values
+
+    :returns: `list` of `numpy.ndarray` of values (one per band), or
+              `None` for pixels outside of the raster extent
+    """
+
+    inside = ((xs >= 0) & (xs < ds.RasterXSize) &
+              (ys >= 0) & (ys < ds.RasterYSize))
+
+    pixels = {}
+    for y, x in sorted(set(zip(ys[inside].tolist(), xs[inside].tolist()))):
+        pixels[(y, x)] = read_pixel(ds, x, y)
+
+    return [pixels.get((y, x)) for x, y in zip(xs.tolist(), ys.tolist())]
 
 
 def get_location_info(file_, x, y, cfg, layer_keys):
@@ -225,14 +285,38 @@ def get_location_info(file_, x, y, cfg, layer_keys):
     :returns: `dict` of metadata and array values
     """
 
+    dict_ = get_locations_info(file_, [x], [y], cfg, layer_keys)
+    dict_['values'] = dict_['values'][0]
+
+    return dict_
+
+
+def get_locations_info(file_, xs, ys, cfg, layer_keys):
+    """
+    extract the values of many x/y coordinates across all bands of a
+    raster file, opening the file once
+
+    :param file_: filepath of raster data
+    :param xs: list of x coordinates
+    :param ys: list of y coordinates
+    :param cfg: yaml information
+    :param layer_keys: layer label splitted
+
+    :returns: `dict` of metadata and array values (one list of values
+              per coordinate, empty if the coordinate is invalid)
+    """
+
     dict_ = {
         'uom': None,
         'metadata': None,
         'time_step': None,
-        'values': [],
+        'values': [[] for _ in xs],
         'dates': []
     }
 
+    store = get_store(file_)
+    pixels = []
+
     LOGGER.debug(f'Opening {file_}')
     try:
         LOGGER.debug('Fetching units')
@@ -241,28 +325,27 @@ def get_location_info(file_, x, y, cfg, layer_keys):
         dict_['metadata'] = layer_keys
         dict_['uom'] = UNITS[layer_keys['Variable']][layer_keys['Type']]
 
-        ds = gdal.Open(file_)
-        LOGGER.debug('Transforming map coordinates into image coordinates')
-        x_, y_ = geo2xy(ds, x, y)
+        if store is not None:
+            LOGGER.debug(f'Reading pixel time series from {store}')
+            pixels = read_store_pixels(store, xs, ys)
+        else:
+            ds = gdal.Open(file_)
+            LOGGER.debug('Transforming map coordinates into image coordinates')
+            xs_, ys_ = geo2xy_array(ds, xs, ys)
+
+            LOGGER.debug('Reading pixels across all bands')
+            pixels = read_pixels(ds, xs_, ys_)
 
     except RuntimeError as err:
         ds = None
         msg = f'Cannot open file: {err}'
         LOGGER.exception(msg)
 
-    LOGGER.debug('Running through bands')
-
-    for band in range(1, ds.RasterCount + 1):
-        LOGGER.debug(f'Fetching band {band}')
-
-        srcband = ds.GetRasterBand(band)
-        array = srcband.ReadAsArray().tolist()
-
-        try:
-            dict_['values'].append(array[y_][x_])
-        except IndexError as err:
-            msg = f'Invalid x/y value: {err}'
-            LOGGER.exception(msg)
+    for i, pixel in enumerate(pixels):
+        if pixel is None:
+            LOGGER.warning(f'Invalid x/y value: ({xs[i]}, {ys[i]})')
+        else:
+            dict_['values'][i] = pixel.tolist()
 
     dict_['dates'] = get_time_info(cfg)
 
@@ -272,6 +355,59 @@ def get_location_info(file_, x, y, cfg, layer_keys):
     return dict_
 
 
+def get_labels(cfg):
+    """
+    parse the bilingual labels of a layer
+
+    :param cfg: yaml information
+
+    :returns: `dict` of labels
+    """
+
+    if 'CANGRD' not in cfg['label_en']:
+
+        split_en = cfg['label_en'].split('/')
+        split_fr = cfg['label_fr'].split('/')
+
+        if 'SPEI' in cfg['label_en']:
+            var_en, sce_en, seas_en, label_en = split_en
+            var_fr, sce_fr, seas_fr, label_fr = split_fr
+            type_en = type_fr = ''
+        elif 'Index' in cfg['label_en']:
+            var_en, sce_en, label_en = split_en
+            var_fr, sce_fr, label_fr = split_fr
+            type_en = type_fr = seas_en = seas_fr = ''
+        else:
+            var_en, sce_en, seas_en, type_en, label_en = split_en
+            var_fr, sce_fr, seas_fr, type_fr, label_fr = split_fr
+
+        pctl_en = re.findall(r' \((.*?)\)', label_en)[-1]
+        pctl_fr = re.findall(r' \((.*?)\)', label_fr)[-1]
+    else:
+        type_en, var_en, label_en = cfg['label_en'].split('/')
+        type_fr, var_fr, label_fr = cfg['label_fr'].split('/')
+        seas_en = re.findall(r' \((.*?)\)', label_en)[0]
+        seas_fr = re.findall(r' \((.*?)\)', label_fr)[0]
+        sce_en = 'Historical'
+        sce_fr = 'Historique'
+        pctl_en = pctl_fr = ''
+
+    return {
+        'var_en': var_en,
+        'var_fr': var_fr,
+        'sce_en': sce_en,
+        'sce_fr': sce_fr,
+        'seas_en': seas_en,
+        'seas_fr': seas_fr,
+        'type_en': type_en,
+        'type_fr': type_fr,
+        'pctl_en': pctl_en,
+        'pctl_fr': pctl_fr,
+        'label_en': label_en,
+        'label_fr': label_fr
+    }
+
+
 def serialize(values_dict, cfg, output_format, x, y):
     """
     Writes the information in the format provided by the user
@@ -285,94 +421,99 @@ def serialize(values_dict, cfg, output_format, x, y):
     :returns: GeoJSON or CSV output
     """
 
-    time_begin = values_dict['dates'][0]
-    time_end = values_dict['dates'][-1]
-    time_step = values_dict['time_step']
+    points_dict = dict(values_dict, values=[values_dict['values']])
 
-    data = None
+    data = serialize_points(points_dict, cfg, output_format, [x], [y])
 
-    LOGGER.debug('Creating the output file')
-    if len(values_dict['dates']) == len(values_dict['values']):
+    if data is not None and output_format == 'GeoJSON':
+        data = data['features'][0]
 
-        if 'CANGRD' not in cfg['label_en']:
+    return data
 
-            split_en = cfg['label_en'].split('/')
-            split_fr = cfg['label_fr'].split('/')
 
-            if 'SPEI' in cfg['label_en']:
-                var_en, sce_en, seas_en, label_en = split_en
-                var_fr, sce_fr, seas_fr, label_fr = split_fr
-                type_en = type_fr = ''
-            elif 'Index' in cfg['label_en']:
-                var_en, sce_en, label_en = split_en
-                var_fr, sce_fr, label_fr = split_fr
-                type_en = type_fr = seas_en = seas_fr = ''
-            else:
-                var_en, sce_en, seas_en, type_en, label_en = split_en
-                var_fr, sce_fr, seas_fr, type_fr, label_fr = split_fr
+def serialize_points(values_dict, cfg, output_format, xs, ys):
+    """
+    Writes the information of many locations in the format provided by
+    the user
 
-            pctl_en = re.findall(r' \((.*?)\)', label_en)[-1]
-            pctl_fr = re.findall(r' \((.*?)\)', label_fr)[-1]
-        else:
-            type_en, var_en, label_en = cfg['label_en'].split('/')
-            type_fr, var_fr, label_fr = cfg['label_fr'].split('/')
-            seas_en = re.findall(r' \((.*?)\)', label_en)[0]
-            seas_fr = re.findall(r' \((.*?)\)', label_fr)[0]
-            sce_en = 'Historical'
-            sce_fr = 'Historique'
-            pctl_en = pctl_fr = ''
-
-        if output_format == 'CSV':
-            time_ = 'time_{time_begin}/{time_end}/{time_step}'
-            row = [time_,
-                   'values',
-                   'longitude',
-                   'latitude',
-                   'scenario_en',
-                   'scenario_fr',
-                   'time_res_en',
-                   'time_res_fr',
-                   'value_type_en',
-                   'value_type_fr',
-                   'percentile_en',
-                   'percentile_fr',
-                   'variable_en',
-                   'variable_fr',
-                   'uom']
+    :param values_dict: result of the get_locations_info function
+    :param cfg: yaml information
+    :param output_format: output format (GeoJSON or CSV)
+    :param xs: list of x coordinates
+    :param ys: list of y coordinates
 
-            try:
-                data = io.BytesIO()
-                writer = csv.writer(data)
-                writer.writerow(row)
-            except TypeError:
-                data = io.StringIO()
-                writer = csv.writer(data)
-                writer.writerow(row)
+    :returns: GeoJSON FeatureCollection or CSV output (`None` if no
+              location has values)
+    """
+
+    time_begin = values_dict['dates'][0]
+    time_end = values_dict['dates'][-1]
+    time_step = values_dict['time_step']
+
+    points = [(x, y, values) for x, y, values
+              in zip(xs, ys, values_dict['values'])
+              if len(values_dict['dates']) == len(values)]
+
+    if not points:
+        return None
 
+    labels = get_labels(cfg)
+
+    LOGGER.debug('Creating the output file')
+    if output_format == 'CSV':
+        time_ = 'time_{time_begin}/{time_end}/{time_step}'
+        row = [time_,
+               'values',
+               'longitude',
+               'latitude',
+               'scenario_en',
+               'scenario_fr',
+               'time_res_en',
+               'time_res_fr',
+               'value_type_en',
+               'value_type_fr',
+               'percentile_en',
+               'percentile_fr',
+               'variable_en',
+               'variable_fr',
+               'uom']
+
+        try:
+            data = io.BytesIO()
+            writer = csv.writer(data)
+            writer.writerow(row)
+        except TypeError:
+            data = io.StringIO()
+            writer = csv.writer(data)
+            writer.writerow(row)
+
+        for x, y, values in points:
             for i in range(0, len(values_dict['dates'])):
                 writer.writerow([values_dict['dates'][i],
-                                 values_dict['values'][i],
+                                 values[i],
                                  x,
                                  y,
-                                 sce_en,
-                                 sce_fr,
-                                 seas_en,
-                                 seas_fr,
-                                 type_en,
-                                 type_fr,
-                                 pctl_en,
-                                 pctl_fr,
-                                 var_en,
-                                 var_fr,
+                                 labels['sce_en'],
+                                 labels['sce_fr'],
+                                 labels['seas_en'],
+                                 labels['seas_fr'],
+                                 labels['type_en'],
+                                 labels['type_fr'],
+                                 labels['pctl_en'],
+                                 labels['pctl_fr'],
+                                 labels['var_en'],
+                                 labels['var_fr'],
                                  values_dict['uom']])
 
-        elif output_format == 'GeoJSON':
+    elif output_format == 'GeoJSON':
 
-            values = []
-            for k in values_dict['values']:
-                values.append(k)
+        data = {
+            'type': 'FeatureCollection',
+            'features': []
+        }
 
-            data = {
+        for x, y, values in points:
+            data['features'].append({
                 'type': 'Feature',
                 'geometry': {
                     'type': 'Point',
@@ -382,53 +523,42 @@ def serialize(values_dict, cfg, output_format, x, y):
                     'time_begin': time_begin,
                     'time_end': time_end,
                     'time_step': time_step,
-                    'variable_en': var_en,
-                    'variable_fr': var_fr,
+                    'variable_en': labels['var_en'],
+                    'variable_fr': labels['var_fr'],
                     'uom': values_dict['uom'],
-                    'value_type_en': type_en,
-                    'value_type_fr': type_fr,
-                    'scenario_en': sce_en,
-                    'scenario_fr': sce_fr,
-                    'period_en': seas_en,
-                    'period_fr': seas_fr,
-                    'percentile_en': pctl_en,
-                    'percertile_fr': pctl_fr,
-                    'label_en': label_en,
-                    'label_fr': label_fr,
-                    'values': values
+                    'value_type_en': labels['type_en'],
+                    'value_type_fr': labels['type_fr'],
+                    'scenario_en': labels['sce_en'],
+                    'scenario_fr': labels['sce_fr'],
+                    'period_en': labels['seas_en'],
+                    'period_fr': labels['seas_fr'],
+                    'percentile_en': labels['pctl_en'],
+                    'percertile_fr': labels['pctl_fr'],
+                    'label_en': labels['label_en'],
+                    'label_fr': labels['label_fr'],
+                    'values': list(values)
                 }
-            }
+            })
+
+    else:
+        data = None
 
     return data
 
 
-def raster_drill(layer, x, y, format_):
+def get_layer_info(cfg, layer):
     """
-    Writes the information in the format provided by the user
-    and reads some information from the geomet-climate yaml
+    resolve the raster file and layer keys of a geomet-climate layer
 
+    :param cfg: geomet-climate yaml information
     :param layer: layer name
-    :param x: x coordinate
-    :param y: y coordinate
-    :param format_: output format (GeoJSON or CSV)
 
-    :return: return the final file fo a given location
+    :returns: `tuple` of raster filepath and `dict` of layer keys
     """
 
-    from msc_pygeoapi.process.cccs import (GEOMET_CLIMATE_CONFIG,
-                                           GEOMET_CLIMATE_BASEPATH,
+    from msc_pygeoapi.process.cccs import (GEOMET_CLIMATE_BASEPATH,
                                            GEOMET_CLIMATE_BASEPATH_VRT)
 
-    LOGGER.info('start raster drilling')
-
-    if format_ not in ['CSV', 'GeoJSON']:
-        msg = 'Invalid format'
-        LOGGER.error(msg)
-        raise ValueError(msg)
-
-    with open(GEOMET_CLIMATE_CONFIG, encoding='utf-8') as fh:
-        cfg = yaml.load(fh, Loader=CLoader)
-
     data_basepath = GEOMET_CLIMATE_BASEPATH
     climate_model_path = cfg['layers'][layer]['climate_model']['basepath']
     file_path = cfg['layers'][layer]['filepath']
@@ -481,20 +611,160 @@ def raster_drill(layer, x, y, format_):
         LOGGER.error(msg)
         raise ValueError(msg)
 
+    file_ = os.path.join(data_basepath, inter_path, file_name)
+
+    return file_, layer_keys
+
+
+def parse_points(points):
+    """
+    parse the coordinates of a GeoJSON MultiPoint (or Point) geometry,
+    or of a CSV of x,y coordinates (with an optional header row)
+
+    :param points: GeoJSON `dict` or `str`, or CSV `str`
+
+    :returns: `list` of x/y coordinates
+    """
+
+    if isinstance(points, str) and not points.lstrip().startswith('{'):
+        coords = []
+        for i, row in enumerate(csv.reader(io.StringIO(points))):
+            if not row:
+                continue
+            try:
+                coords.append((float(row[0]), float(row[1])))
+            except (IndexError, ValueError):
+                if i > 0:
+                    msg = f'Invalid CSV coordinates: {row}'
+                    LOGGER.error(msg)
+                    raise ValueError(msg)
+                LOGGER.debug('Skipping CSV header')
+    else:
+        try:
+            if isinstance(points, str):
+                points = json.loads(points)
+            if points.get('type') == 'Feature':
+                points = points['geometry']
+
+            if points['type'] == 'MultiPoint':
+                coords = points['coordinates']
+            elif points['type'] == 'Point':
+                coords = [points['coordinates']]
+            else:
+                raise ValueError(f"Unsupported geometry: {points['type']}")
+
+            coords = [(float(c[0]), float(c[1])) for c in coords]
+        except (AttributeError, IndexError, KeyError, TypeError,
+                ValueError) as err:
+            msg = f'Invalid GeoJSON points: {err}'
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+    if not coords:
+        msg = 'No points provided'
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    if len(coords) > MAX_POINTS:
+        msg = f'Too many points (maximum {MAX_POINTS})'
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    return coords
+
+
+def to_layer_crs(cfg, x, y):
+    """
+    transforms EPSG:4326 coordinates to the projection of a layer
+
+    :param cfg: yaml information of the layer
+    :param x: x coordinate (or list of x coordinates)
+    :param y: y coordinate (or list of y coordinates)
+
+    :returns: x/y coordinates in the layer projection
+    """
+
     srs = osr.SpatialReference()
-    srs.ImportFromWkt(cfg['layers'][layer]['climate_model']['projection'])
+    srs.ImportFromWkt(cfg['climate_model']['projection'])
     inProj = Proj(init='epsg:4326')
     outProj = Proj(srs.ExportToProj4())
-    _x, _y = transform(inProj, outProj, x, y)
 
-    ds = os.path.join(data_basepath, inter_path, file_name)
+    return transform(inProj, outProj, x, y)
+
+
+def raster_drill(layer, x, y, format_):
+    """
+    Writes the information in the format provided by the user
+    and reads some information from the geomet-climate yaml
+
+    :param layer: layer name
+    :param x: x coordinate
+    :param y: y coordinate
+    :param format_: output format (GeoJSON or CSV)
+
+    :return: return the final file fo a given location
+    """
+
+    from msc_pygeoapi.process.cccs import GEOMET_CLIMATE_CONFIG
+
+    LOGGER.info('start raster drilling')
+
+    if format_ not in ['CSV', 'GeoJSON']:
+        msg = 'Invalid format'
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    with open(GEOMET_CLIMATE_CONFIG, encoding='utf-8') as fh:
+        cfg = yaml.load(fh, Loader=CLoader)
+
+    file_, layer_keys = get_layer_info(cfg, layer)
+
+    _x, _y = to_layer_crs(cfg['layers'][layer], x, y)
 
-    data = get_location_info(ds, _x, _y, cfg['layers'][layer], layer_keys)
+    data = get_location_info(file_, _x, _y, cfg['layers'][layer], layer_keys)
     output = serialize(data, cfg['layers'][layer], format_, x, y)
 
     return output
 
 
+def raster_drill_points(layer, points, format_):
+    """
+    Writes the information of many locations in the format provided by
+    the user and reads some information from the geomet-climate yaml
+
+    :param layer: layer name
+    :param points: GeoJSON MultiPoint or CSV of x,y coordinates
+    :param format_: output format (GeoJSON or CSV)
+
+    :return: return the final file for the given locations
+    """
+
+    from msc_pygeoapi.process.cccs import GEOMET_CLIMATE_CONFIG
+
+    LOGGER.info('start raster drilling of many locations')
+
+    if format_ not in ['CSV', 'GeoJSON']:
+        msg = 'Invalid format'
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    xs, ys = zip(*parse_points(points))
+
+    with open(GEOMET_CLIMATE_CONFIG, encoding='utf-8') as fh:
+        cfg = yaml.load(fh, Loader=CLoader)
+
+    file_, layer_keys = get_layer_info(cfg, layer)
+
+    _xs, _ys = to_layer_crs(cfg['layers'][layer], list(xs), list(ys))
+
+    data = get_locations_info(file_, _xs, _ys, cfg['layers'][layer],
+                              layer_keys)
+    output = serialize_points(data, cfg['layers'][layer], format_,
+                              list(xs), list(ys))
+
+    return output
+
+
 @click.group('execute')
 def raster_drill_execute():
     pass
@@ -503,13 +773,23 @@ def raster_drill_execute():
 @click.command('raster-drill')
 @click.pass_context
 @click.option('--layer', help='Layer name to process', required=True)
-@click.option('--x', help='x coordinate', required=True)
-@click.option('--y', help='y coordinate', required=True)
+@click.option('--x', help='x coordinate')
+@click.option('--y', help='y coordinate')
+@click.option('--points',
+              help='GeoJSON MultiPoint, or CSV file of x,y coordinates')
 @click.option('--format', 'format_', type=click.Choice(['GeoJSON', 'CSV']),
               default='GeoJSON', help='output format')
-def raster_drill_cli(ctx, layer, x, y, format_='GeoJSON'):
-
-    output = raster_drill(layer, float(x), float(y), format_)
+def raster_drill_cli(ctx, layer, x, y, points=None, format_='GeoJSON'):
+
+    if points is not None:
+        if os.path.isfile(points):
+            with open(points, encoding='utf-8') as fh:
+                points = fh.read()
+        output = raster_drill_points(layer, points, format_)
+    elif None in [x, y]:
+        raise click.UsageError('Missing --x and --y, or --points')
+    else:
+        output = raster_drill(layer, float(x), float(y), format_)
     if format_ == 'GeoJSON':
         click.echo(json.dumps(output, ensure_ascii=False))
     elif format_ == 'CSV':
@@ -539,12 +819,16 @@ try:
             mimetype = 'application/json'
 
             layer = data.get('layer')
-            x = float(data.get('x'))
-            y = float(data.get('y'))
+            points = data.get('points')
             format_ = data.get('format')
 
             try:
-                output = raster_drill(layer, x, y, format_)
+                if points is not None:
+                    output = raster_drill_points(layer, points, format_)
+                else:
+                    x = float(data.get('x'))
+                    y = float(data.get('y'))
+                    output = raster_drill(layer, x, y, format_)
             except ValueError as err:
                 msg = f'Process execution error: {err}'
                 LOGGER.error(msg)
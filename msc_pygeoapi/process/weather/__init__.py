@@ -30,7 +30,9 @@
 import click
 import logging
 
+from msc_pygeoapi.process.weather.extract_coverage_range import extract_coverage_range_cli  # noqa
 from msc_pygeoapi.process.weather.extract_sounding_data import extract_sounding_data_execute  # noqa
+from msc_pygeoapi.process.weather.sounding_profile import sounding_profiles
 
 LOGGER = logging.getLogger(__name__)
 
@@ -54,6 +56,8 @@ def weather():
 
 weather.add_command(execute)
 weather.add_command(extract_sounding_data_execute)
+weather.add_command(sounding_profiles)
+execute.add_command(extract_coverage_range_cli)
 
 try:
     execute.add_command(extract_raster)
@@ -0,0 +1,270 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the 'Software'), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+import os
+
+import click
+
+LOGGER = logging.getLogger(__name__)
+
+PROCESS_METADATA = {
+    "version": "0.1.0",
+    "id": "extract-coverage-range",
+    "title": "Extract coverage date range",
+    "description": "extract the timesteps of a coverage date range as "
+    "NetCDF, whatever the native format of the collection",
+    "keywords": ["extract coverage", "NetCDF"],
+    "links": [
+        {
+            "type": "text/html",
+            "rel": "canonical",
+            "title": "information",
+            "href": "https://eccc-msc.github.io/open-data/readme_en",
+            "hreflang": "en-CA",
+        },
+        {
+            "type": "text/html",
+            "rel": "alternate",
+            "title": "information",
+            "href": "https://eccc-msc.github.io/open-data/readme_fr",
+            "hreflang": "fr-CA",
+        },
+    ],
+    "inputs": {
+        "collection": {
+            "title": "Collection",
+            "description": "Coverage collection identifier "
+            "(RDPA or CanGRD).",
+            "schema": {"type": "string"},
+            "minOccurs": 1,
+            "maxOccurs": 1,
+        },
+        "datetime": {
+            "title": "Date range",
+            "description": "Date range in begin/end format, "
+            "as in the coverage datetime parameter.",
+            "schema": {"type": "string"},
+            "minOccurs": 1,
+            "maxOccurs": 1,
+        },
+        "bbox": {
+            "title": "Bounding box",
+            "description": "[OPTIONAL] Bounding box in wgs84 "
+            "(minx, miny, maxx, maxy).",
+            "schema": {
+                "type": "array",
+                "items": {"type": "number"},
+                "minItems": 4,
+                "maxItems": 4,
+            },
+            "minOccurs": 0,
+            "maxOccurs": 1,
+        },
+        "property": {
+            "title": "Property",
+            "description": "[OPTIONAL: default is 1] Band number.",
+            "schema": {"type": "integer"},
+            "minOccurs": 0,
+            "maxOccurs": 1,
+        },
+    },
+    "outputs": {
+        "extract_coverage_range_response": {
+            "title": "extract_coverage_range_response",
+            "schema": {"contentMediaType": "application/x-netcdf"},
+        }
+    },
+    "example": {
+        "inputs": {
+            "collection": "weather:rdpa:10km:24f",
+            "datetime": "2024-01-01T12Z/2024-01-05T12Z",
+            "bbox": [-76, 45, -75, 46],
+            "property": 1,
+        }
+    },
+}
+
+# coverage providers supporting NetCDF output of date ranges
+RANGE_PROVIDERS = [
+    "msc_pygeoapi.provider.cangrd_rasterio.CanGRDProvider",
+    "msc_pygeoapi.provider.rdpa_rasterio.RDPAProvider",
+]
+
+
+def get_range_provider_def(config, collection):
+    """
+    Helper function to get the coverage provider definition of a
+    collection supporting NetCDF output of date ranges
+
+    :param config: `dict` of pygeoapi configuration
+    :param collection: collection identifier
+
+    :returns: `dict` of provider definition
+    """
+
+    try:
+        resource = config["resources"][collection]
+    except KeyError:
+        msg = f"Unknown collection: {collection}"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    for provider_def in resource.get("providers", []):
+        if provider_def.get("name") in RANGE_PROVIDERS:
+            return provider_def
+
+    msg = f"Collection does not support NetCDF date ranges: {collection}"
+    LOGGER.error(msg)
+    raise ValueError(msg)
+
+
+def extract_coverage_range(collection, datetime_, bbox=[], property_=1):
+    """
+    Extract the timesteps of a coverage date range as NetCDF
+
+    :param collection: collection identifier
+    :param datetime_: date range in begin/end format
+    :param bbox: bounding box [minx,miny,maxx,maxy]
+    :param property_: band number
+
+    :returns: `bytes` of NetCDF file
+    """
+
+    from pygeoapi.plugin import load_plugin
+    from pygeoapi.provider.base import ProviderGenericError
+    from pygeoapi.util import yaml_load
+
+    if "/" not in datetime_:
+        msg = f"Not a date range: {datetime_}"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    if bbox and len(bbox) != 4:
+        msg = "bbox must have 4 values (minx, miny, maxx, maxy)"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    with open(os.environ["PYGEOAPI_CONFIG"], encoding="utf-8") as fh:
+        config = yaml_load(fh)
+
+    provider_def = get_range_provider_def(config, collection)
+
+    try:
+        provider = load_plugin("provider", provider_def)
+        return provider.query(
+            properties=[int(property_)],
+            bbox=[float(value) for value in bbox],
+            datetime_=datetime_,
+            format_="NetCDF",
+        )
+    except ProviderGenericError as err:
+        msg = f"Could not extract {collection}: {err}"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+
+@click.command("extract-coverage-range")
+@click.pass_context
+@click.option("--collection", help="coverage collection", required=True)
+@click.option(
+    "--datetime",
+    "datetime_",
+    help="date range in begin/end format",
+    required=True,
+)
+@click.option(
+    "--bbox",
+    help="bounding box in minx,miny,maxx,maxy format (wgs84)",
+)
+@click.option("--property", "property_", default=1, help="band number")
+@click.option(
+    "--output",
+    type=click.File("wb"),
+    default="-",
+    help="NetCDF output file (default: stdout)",
+)
+def extract_coverage_range_cli(
+    ctx, collection, datetime_, bbox, property_, output
+):
+    bbox = bbox.split(",") if bbox else []
+
+    try:
+        data = extract_coverage_range(collection, datetime_, bbox, property_)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+
+    output.write(data)
+
+
+try:
+    from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
+
+    class ExtractCoverageRangeProcessor(BaseProcessor):
+        """Extract Coverage Range Processor"""
+
+        def __init__(self, provider_def):
+            """
+            Initialize object
+
+            :param provider_def: provider definition
+
+            :returns: pygeoapi.process.weather.extract_coverage_range.ExtractCoverageRangeProcessor  # noqa
+            """
+
+            BaseProcessor.__init__(self, provider_def, PROCESS_METADATA)
+
+        def execute(self, data):
+            mimetype = "application/x-netcdf"
+
+            required = ["collection", "datetime"]
+            if not all([param in data for param in required]):
+                msg = "Missing required parameters."
+                LOGGER.error(msg)
+                raise ProcessorExecuteError(msg)
+
+            try:
+                output = extract_coverage_range(
+                    data["collection"],
+                    data["datetime"],
+                    data.get("bbox") or [],
+                    data.get("property") or 1,
+                )
+            except ValueError as err:
+                msg = f"Process execution error: {err}"
+                LOGGER.error(msg)
+                raise ProcessorExecuteError(msg)
+
+            return mimetype, output
+
+        def __repr__(self):
+            return f"<ExtractCoverageRangeProcessor> {self.name}"
+
+except (ImportError, RuntimeError) as err:
+    LOGGER.warning(f"Import errors: {err}")
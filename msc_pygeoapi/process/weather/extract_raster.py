@@ -29,14 +29,28 @@
 # =================================================================
 
 import click
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import json
 import logging
+import threading
+import time
 
-from elasticsearch import Elasticsearch, exceptions
+from elasticsearch import ApiError, TransportError
+import numpy as np
 import rasterio
-import rasterio.mask
+import rasterio.features
+import rasterio.transform
+import rasterio.warp
 from rasterio.crs import CRS
-from rasterio.io import MemoryFile
+from rasterio.errors import RasterioIOError, WindowError
+from rasterio.windows import Window
+
+from msc_pygeoapi.connector.elasticsearch_ import ElasticsearchConnector
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_EXTRACT_RASTER_CACHE_TTL,
+    MSC_PYGEOAPI_EXTRACT_RASTER_WORKERS
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -126,6 +140,127 @@ ES_INDEX = 'hackathon-lp'
 DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
 
+# maximum number of files (forecast hours) of a layer model run
+MAX_HITS = 1000
+
+ES_CONNECTOR = None
+ES_CONNECTOR_LOCK = threading.Lock()
+
+# (layer, model run) => (expiry, {forecast hour datetime: properties})
+FILES_CACHE = {}
+FILES_CACHE_LOCK = threading.Lock()
+
+
+def get_connector():
+    """
+    Helper function to get the Elasticsearch connector shared between
+    requests (and its connection pool)
+
+    :returns: `msc_pygeoapi.connector.elasticsearch_.ElasticsearchConnector`
+    """
+
+    global ES_CONNECTOR
+
+    with ES_CONNECTOR_LOCK:
+        if ES_CONNECTOR is None:
+            ES_CONNECTOR = ElasticsearchConnector()
+
+    return ES_CONNECTOR
+
+
+def to_datetime(value):
+    """
+    Helper function to normalize a datetime string for comparison
+
+    :param value: `str` of datetime
+
+    :returns: `datetime.datetime`, or `str` if it cannot be parsed
+    """
+
+    for format_ in [DATE_FORMAT, '%Y-%m-%dT%H:%M:%S.%fZ']:
+        try:
+            return datetime.strptime(value, format_)
+        except ValueError:
+            pass
+
+    return value
+
+
+def search_files(layers, mr, refresh=False):
+    """
+    ES search to find the files of all forecast hours of layers of a
+    model run, in a single msearch, cached for a short time
+
+    :param layers: list of layers
+    :param mr: model run
+    :param refresh: whether to bypass the cache
+
+    :returns: `dict` of layers and `dict` of forecast hour datetimes and
+              file properties
+    """
+
+    now = time.monotonic()
+    files = {}
+    missing = []
+
+    with FILES_CACHE_LOCK:
+        for layer in layers:
+            entry = FILES_CACHE.get((layer, mr))
+            if not refresh and entry is not None and entry[0] > now:
+                files[layer] = entry[1]
+            else:
+                missing.append(layer)
+
+    if not missing:
+        return files
+
+    searches = []
+    for layer in missing:
+        searches.append({'index': ES_INDEX})
+        searches.append({
+            'size': MAX_HITS,
+            '_source': [
+                'properties.filepath',
+                'properties.forecast_hour_datetime',
+                'properties.reference_datetime'
+            ],
+            'query': {
+                'bool': {
+                    'must': {
+                        'match': {'properties.layer': layer}
+                    },
+                    'filter': [
+                        {'term': {'properties.reference_datetime': mr}}
+                    ]
+                }
+            }
+        })
+
+    LOGGER.debug(f'Searching files of {len(missing)} layers')
+    res = get_connector().Elasticsearch.msearch(searches=searches)
+
+    for layer, response in zip(missing, res['responses']):
+        if 'error' in response:
+            raise TransportError(response['error'])
+
+        # best matching file of each forecast hour
+        hits = {}
+        for hit in response['hits']['hits']:
+            properties = hit['_source']['properties']
+            fh_ = to_datetime(properties['forecast_hour_datetime'])
+            hits.setdefault(fh_, properties)
+        files[layer] = hits
+
+    with FILES_CACHE_LOCK:
+        for key in [k for k, v in FILES_CACHE.items() if v[0] <= now]:
+            FILES_CACHE.pop(key)
+        for layer in missing:
+            expiry = now + MSC_PYGEOAPI_EXTRACT_RASTER_CACHE_TTL
+            FILES_CACHE[(layer, mr)] = (expiry, files[layer])
+
+    return files
+
+
 def get_files(layers, fh, mr):
     """
     ES search to find files names
@@ -136,56 +271,165 @@ def get_files(layers, fh, mr):
 
     :returns: list of three file paths
     """
-    es = Elasticsearch()
+
     list_files = []
+    times = [to_datetime(time_) for time_ in fh.split(',')]
+
+    try:
+        files = search_files(layers, mr)
+        if not all(time_ in files[layer]
+                   for layer in layers for time_ in times):
+            LOGGER.debug('Files not found in cache, searching again')
+            files = search_files(layers, mr, refresh=True)
+    except (ApiError, TransportError) as err:
+        msg = f'ES search failed: {err}'
+        LOGGER.error(msg)
+        return None, None
 
     for layer in layers:
-        for time_ in fh.split(','):
-            files = {}
-            s_object = {
-                'query': {
-                    'bool': {
-                        'must': {
-                            'match': {'properties.layer': layer}
-                        },
-                        'filter': [
-                            {'term': {'properties.forecast_hour_datetime':
-                                      time_}},
-                            {'term': {'properties.reference_datetime': mr}}
-                        ]
-                    }
-                }
-            }
-
+        for time_ in times:
             try:
-                res = es.search(index=ES_INDEX, body=s_object)
-                try:
-                    filepath = (res['hits']['hits'][0]
-                                ['_source']['properties']['filepath'])
-                    fh_ = (res['hits']['hits'][0]['_source']
-                           ['properties']['forecast_hour_datetime'])
-                    mr = (res['hits']['hits'][0]['_source']
-                          ['properties']['reference_datetime'])
-
-                    files['filepath'] = filepath
-                    files['forecast_hour'] = fh_
-                    files['model_run'] = mr
-
-                    list_files.append(files)
-
-                except IndexError as err:
-                    msg = f'invalid input value: {err}'
-                    LOGGER.error(msg)
-                    return None, None
-
-            except exceptions.ElasticsearchException as err:
-                msg = f'ES search failed: {err}'
+                properties = files[layer][time_]
+            except KeyError as err:
+                msg = f'invalid input value: {err}'
                 LOGGER.error(msg)
                 return None, None
 
+            list_files.append({
+                'filepath': properties['filepath'],
+                'forecast_hour': properties['forecast_hour_datetime'],
+                'model_run': properties['reference_datetime']
+            })
+
     return list_files
 
 
+def get_data_type(raster_path):
+    """
+    Helper function to get the type of data of a raster
+
+    :param raster_path: path to raster file on disk
+
+    :returns: `str` of data type
+    """
+
+    data_type = None
+
+    if "TMP" in raster_path:
+        data_type = "Temperature Data"
+    if "WDIR" in raster_path:
+        data_type = "Wind Direction Data"
+    if "WIND" in raster_path:
+        data_type = "Wind Speed Data"
+
+    return data_type
+
+
+def get_selection(src, geometry, geometries, selections, lock,
+                  coordinates=False):
+    """
+    Helper function to get the pixels of a raster grid selected by
+    a geometry.  The geometry is transformed once per CRS and the
+    window and pixels are computed once per grid, shared by all rasters
+    of the query
+
+    :param src: `rasterio.io.DatasetReader` of raster
+    :param geometry: `dict` of GeoJSON geometry (EPSG:4326)
+    :param geometries: `dict` of transformed geometries by CRS
+    :param selections: `dict` of selections by grid
+    :param lock: `threading.Lock` protecting geometries and selections
+    :param coordinates: whether to compute the pixel center coordinates
+
+    :returns: `dict` of window, pixel rows and columns, and pixel
+              center coordinates (EPSG:4326)
+    """
+
+    crs = src.crs.to_string()
+    key = (crs, tuple(src.transform), src.width, src.height)
+
+    with lock:
+        if key in selections:
+            return selections[key]
+
+        if crs not in geometries:
+            geometries[crs] = rasterio.warp.transform_geom(
+                CRS.from_string('EPSG:4326'), src.crs, geometry)
+        shapes = [geometries[crs]]
+
+        try:
+            # pad by half a pixel so that points select the pixel they fall in
+            window = rasterio.features.geometry_window(
+                src, shapes, pad_x=0.5, pad_y=0.5)
+            window = window.intersection(
+                Window(0, 0, src.width, src.height))
+        except WindowError:
+            raise ValueError('Input shapes do not overlap raster.')
+
+        window = window.round_offsets().round_lengths()
+        transform = src.window_transform(window)
+        mask = rasterio.features.geometry_mask(
+            shapes, out_shape=(window.height, window.width),
+            transform=transform, invert=True)
+        rows, cols = np.nonzero(mask)
+
+        selections[key] = {
+            'window': window,
+            'rows': rows,
+            'cols': cols,
+            'coordinates': []
+        }
+
+        if coordinates and rows.size:
+            xs, ys = rasterio.transform.xy(transform, rows, cols,
+                                           offset='center')
+            lons, lats = rasterio.warp.transform(
+                src.crs, CRS.from_string('EPSG:4326'), xs, ys)
+            selections[key]['coordinates'] = list(zip(lons, lats))
+
+        return selections[key]
+
+
+def read_values(raster_list, input_geojson, coordinates=False):
+    """
+    reads the pixels of rasters selected by a geometry, concurrently
+
+    :param raster_list: list of paths to queried raster file on disk
+    :param input_geojson: geojson file containing geometry of query
+    :param coordinates: whether to compute the pixel center coordinates
+
+    :returns: list of (data type, values, nodata, selection) for each
+              raster, or `None` if the raster was not found
+    """
+
+    geometry = input_geojson['features'][0]['geometry']
+    geometries = {}
+    selections = {}
+    lock = threading.Lock()
+
+    def read(raster_path):
+        try:
+            with rasterio.open(raster_path) as src:
+                selection = get_selection(
+                    src, geometry, geometries, selections, lock,
+                    coordinates)
+                data = src.read(1, window=selection['window'])
+                values = data[selection['rows'], selection['cols']]
+
+                return (get_data_type(raster_path),
+                        values.astype(np.float64),
+                        src.nodata,
+                        selection)
+        except (FileNotFoundError, RasterioIOError) as err:
+            LOGGER.debug(err)
+            return None
+
+    workers = max(1, min(MSC_PYGEOAPI_EXTRACT_RASTER_WORKERS,
+                         len(raster_list)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(read, raster_list))
+
+
 def get_point(raster_list, input_geojson):
     """
     clips a raster by a point
@@ -197,45 +441,22 @@ def get_point(raster_list, input_geojson):
     geometry, and query type
     """
     to_return = {}
-    i = 0
+    iterat = 0
 
     in_coords = input_geojson['features'][0]['geometry']['coordinates']
 
-    for raster_path in raster_list:
-        if "TMP" in raster_path:
-            data_type = "Temperature Data"
-        if "WDIR" in raster_path:
-            data_type = "Wind Direction Data"
-        if "WIND" in raster_path:
-            data_type = "Wind Speed Data"
-        with rasterio.open(raster_path) as src:
-            geom = input_geojson['features']
-            if "type" in geom[0].keys():
-                geom[0].pop("type")
-            if "id" in geom[0].keys():
-                geom[0].pop("id")
-            shapes = [
-                rasterio.warp.transform_geom(
-                    CRS.from_string('EPSG:4326'),
-                    src.crs,
-                    geom[0]['geometry'])]
-            out_image, out_transform = rasterio.mask.mask(
-                src, shapes, crop=True)
-            with MemoryFile() as memfile:
-                with memfile.open(driver="GTiff",
-                                  height=out_image.shape[1],
-                                  width=out_image.shape[2], count=1,
-                                  dtype=rasterio.float64,
-                                  transform=out_transform) as dataset:
-                    dataset.write(out_image)
-                    ds = dataset.read()
-
-                    to_return[i] = [in_coords[0],
-                                    in_coords[1],
-                                    ds[0][0][0],
-                                    data_type]
-                    ds = None
-        i += 1
+    for result in read_values(raster_list, input_geojson):
+        if result is None:
+            continue
+
+        data_type, values, nodata, selection = result
+        value = values[0] if values.size else nodata
+
+        to_return[iterat] = [in_coords[0],
+                             in_coords[1],
+                             value,
+                             data_type]
+        iterat += 1
 
     return to_return
 
@@ -254,55 +475,17 @@ def get_line(raster_list, input_geojson):
     iterat = 0
     input_line = input_geojson['features'][0]['geometry']['coordinates']
 
-    for raster_path in raster_list:
-        if "TMP" in raster_path:
-            data_type = "Temperature Data"
-        if "WDIR" in raster_path:
-            data_type = "Wind Direction Data"
-        if "WIND" in raster_path:
-            data_type = "Wind Speed Data"
+    for result in read_values(raster_list, input_geojson, True):
+        if result is None:
+            continue
 
-        try:
-            with rasterio.open(raster_path) as src:
-                geom = input_geojson['features']
-                if "type" in geom[0].keys():
-                    geom[0].pop("type")
-                if "id" in geom[0].keys():
-                    geom[0].pop("id")
-                shapes = [
-                    rasterio.warp.transform_geom(
-                        CRS.from_string('EPSG:4326'),
-                        src.crs,
-                        geom[0]['geometry'])]
-                out_image, out_transform = rasterio.mask.mask(
-                    src, shapes, crop=True)
-                with MemoryFile() as memfile:
-                    with memfile.open(driver="GTiff",
-                                      height=out_image.shape[1],
-                                      width=out_image.shape[2], count=1,
-                                      dtype=rasterio.float64,
-                                      transform=out_transform) as dataset:
-                        dataset.write(out_image)
-                        ds = dataset.read()
-
-                        x_to_mod = list(range(0, ds.shape[1]))
-                        y_to_mod = list(range(0, ds.shape[2]))
-                        xs, ys = rasterio.transform.xy(
-                            out_transform, x_to_mod, y_to_mod, offset='center')
-                        xy_array = rasterio.warp.transform(
-                            src.crs, CRS.from_string('EPSG:4326'), xs, ys)
-                        ds = ds[ds != src.nodata]
-                        to_ret = []
-                        for i in range(0, len(xy_array[0])):
-                            to_ret.append([xy_array[0][i],
-                                           xy_array[1][i],
-                                           ds[i],
-                                           data_type,
-                                           input_line])
-                        to_return[iterat] = to_ret
-                        iterat += 1
-        except FileNotFoundError as err:
-            LOGGER.debug(err)
+        data_type, values, nodata, selection = result
+        to_ret = []
+        for (lon, lat), value in zip(selection['coordinates'], values):
+            if value != nodata:
+                to_ret.append([lon, lat, value, data_type, input_line])
+        to_return[iterat] = to_ret
+        iterat += 1
 
     return to_return
 
@@ -321,49 +504,28 @@ def summ_stats_poly(raster_list, input_geojson):
     iterat = 0
     input_poly = input_geojson['features'][0]['geometry']['coordinates']
 
-    for raster_path in raster_list:
-        if "TMP" in raster_path:
-            data_type = "Temperature Data"
-        if "WDIR" in raster_path:
-            data_type = "Wind Direction Data"
-        if "WIND" in raster_path:
-            data_type = "Wind Speed Data"
+    for result in read_values(raster_list, input_geojson):
+        if result is None:
+            continue
+
+        data_type, values, nodata, selection = result
+        if nodata is not None:
+            values = values[values != nodata]
+
+        if values.size:
+            min_val = values.min()
+            max_val = values.max()
+            mean_val = values.mean()
+        else:
+            min_val = max_val = mean_val = None
+
+        to_return[iterat] = [min_val,
+                             max_val,
+                             mean_val,
+                             data_type,
+                             input_poly]
+        iterat += 1
 
-        try:
-            with rasterio.open(raster_path) as src:
-                geom = input_geojson['features']
-                if "type" in geom[0].keys():
-                    geom[0].pop("type")
-                if "id" in geom[0].keys():
-                    geom[0].pop("id")
-                shapes = [
-                    rasterio.warp.transform_geom(
-                        CRS.from_string('EPSG:4326'),
-                        src.crs,
-                        geom[0]['geometry'])]
-                out_image, out_transform = rasterio.mask.mask(
-                    src, shapes, crop=True)
-
-                with MemoryFile() as memfile:
-                    with memfile.open(driver="GTiff",
-                                      height=out_image.shape[1],
-                                      width=out_image.shape[2], count=1,
-                                      dtype=rasterio.float64,
-                                      transform=out_transform) as dataset:
-                        dataset.write(out_image)
-                        ds = dataset.read()
-                        ds = ds[ds != src.nodata]
-                        min_val = ds.min()
-                        max_val = ds.max()
-                        mean_val = ds.mean()
-                        to_return[iterat] = [min_val,
-                                             max_val,
-                                             mean_val,
-                                             data_type,
-                                             input_poly]
-                        iterat += 1
-        except FileNotFoundError as err:
-            LOGGER.debug(err)
     return to_return
 
 
@@ -28,17 +28,25 @@
 #
 # =================================================================
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import datetime
 import glob
 import json
 import logging
 import os.path
 import re
+import threading
 
 import click
+import numpy as np
 from osgeo import gdal
 from pyproj import Transformer
-import xarray
+
+from msc_pygeoapi.env import (GEOMET_SOUNDING_PROFILE_BASEPATH,
+                              MSC_PYGEOAPI_SOUNDING_CACHE_SIZE,
+                              MSC_PYGEOAPI_SOUNDING_WORKERS)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -164,31 +172,242 @@ PROCESS_METADATA = {
 
 DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
+# number of coordinate to pixel lookups cached per grid
+PIXEL_CACHE_SIZE = 1024
+
+
+class SoundingGrid:
+    """Grid metadata of a model, cached between soundings"""
+
+    def __init__(self, projection, geotransform, size):
+        """
+        Initialize object
+
+        :param projection: WKT of grid projection
+        :param geotransform: `tuple` of grid geotransform
+        :param size: `tuple` of grid width and height
+
+        :returns: `SoundingGrid`
+        """
+
+        self.projection = projection
+        self.geotransform = geotransform
+        self.size = size
+
+        LOGGER.debug('Creating transformer')
+        self.transformer = Transformer.from_crs(
+            "EPSG:4326", self.projection, always_xy=True)
+        self._lock = threading.Lock()
+        self._pixels = OrderedDict()
+
+    def matches(self, projection, geotransform, size):
+        """
+        Whether grid metadata describes this grid
+
+        :param projection: WKT of grid projection
+        :param geotransform: `tuple` of grid geotransform
+        :param size: `tuple` of grid width and height
+
+        :returns: `bool` of whether the metadata describes this grid
+        """
+
+        return all([
+            self.size == size,
+            self.geotransform == geotransform,
+            self.projection == projection
+        ])
+
+    def get_pixel(self, lon, lat):
+        """
+        transforms a geographic coordinate to x/y pixel values of the grid
+
+        :param lon: longitude
+        :param lat: latitude
+
+        :returns: `tuple` of x/y pixel values
+        """
+
+        with self._lock:
+            if (lon, lat) in self._pixels:
+                self._pixels.move_to_end((lon, lat))
+                return self._pixels[(lon, lat)]
+
+            _x, _y = self.transformer.transform(lon, lat)
+
+        origin_x, width, _, origin_y, _, height = self.geotransform
+
+        x = int((_x - origin_x) / width)
+        y = int((_y - origin_y) / height)
+
+        if not (0 <= x < self.size[0] and 0 <= y < self.size[1]):
+            msg = f'Coordinates outside of model grid: {lon}, {lat}'
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+        with self._lock:
+            self._pixels[(lon, lat)] = x, y
+            if len(self._pixels) > PIXEL_CACHE_SIZE:
+                self._pixels.popitem(last=False)
+
+        return x, y
+
+
+class OpenFileCache:
+    """LRU cache of open GDAL datasets, shared between threads"""
+
+    def __init__(self, size=MSC_PYGEOAPI_SOUNDING_CACHE_SIZE):
+        """
+        Initialize object
 
-def geo2xy(ds, x, y):
+        :param size: maximum number of open datasets (0 to disable)
+
+        :returns: `OpenFileCache`
+        """
+
+        self.size = size
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _open(path):
+        ds = gdal.Open(path)
+        if ds is None:
+            msg = f'Cannot open file: {path}'
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+        return ds
+
+    @contextmanager
+    def open(self, path):
+        """
+        Open a dataset, reusing an open dataset of an unchanged file
+
+        :param path: filepath of dataset
+
+        :returns: context manager of GDAL dataset object
+        """
+
+        if self.size <= 0:
+            yield self._open(path)
+            return
+
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._datasets.get(path)
+            if entry is not None and entry[1] == mtime:
+                self._datasets.move_to_end(path)
+
+        if entry is None or entry[1] != mtime:
+            LOGGER.debug(f'Opening {path}')
+            entry = (self._open(path), mtime, threading.Lock())
+            with self._lock:
+                self._datasets[path] = entry
+                while len(self._datasets) > self.size:
+                    self._datasets.popitem(last=False)
+
+        ds, _, lock = entry
+        # GDAL datasets are not safe to share between threads
+        with lock:
+            yield ds
+
+    def clear(self):
+        """
+        Close all open datasets
+
+        :returns: `None`
+        """
+
+        with self._lock:
+            self._datasets.clear()
+
+
+GRIDS = {}
+GRIDS_LOCK = threading.Lock()
+FILE_CACHE = OpenFileCache()
+
+
+def get_grid(model, projection, geotransform, size):
     """
-    transforms geographic coordinate to x/y pixel values
+    Helper function to get the (cached) grid metadata of a model
+
+    :param model: model name
+    :param projection: WKT of grid projection
+    :param geotransform: `tuple` of grid geotransform
+    :param size: `tuple` of grid width and height
+
+    :returns: `SoundingGrid`
+    """
+
+    with GRIDS_LOCK:
+        grid = GRIDS.get(model)
+        if grid is None or not grid.matches(projection, geotransform, size):
+            LOGGER.debug(f'Caching grid of {model}')
+            grid = GRIDS[model] = SoundingGrid(projection, geotransform, size)
+
+    return grid
+
+
+def read_band_pixel(ds, x, y):
+    """
+    reads a pixel value of the first band of a dataset
 
     :param ds: GDAL dataset object
-    :param x: x coordinate
-    :param y: y coordinate
+    :param x: x pixel value
+    :param y: y pixel value
 
-    :returns: list of x/y pixel values
+    :returns: `tuple` of pixel value and nodata value
     """
 
-    LOGGER.debug("Running affine transformation")
-    geotransform = ds.GetGeoTransform()
+    band = ds.GetRasterBand(1)
+    value = band.ReadAsArray(x, y, 1, 1)[0, 0].item()
 
-    origin_x = geotransform[0]
-    origin_y = geotransform[3]
+    return value, band.GetNoDataValue()
 
-    width = geotransform[1]
-    height = geotransform[5]
 
-    x = int((x - origin_x) / width)
-    y = int((y - origin_y) / height)
+def read_pixel(path, x, y):
+    """
+    reads a pixel value of the first band of a file
+
+    :param path: filepath of raster data
+    :param x: x pixel value
+    :param y: y pixel value
+
+    :returns: `tuple` of pixel value and nodata value
+    """
 
-    return x, y
+    with FILE_CACHE.open(path) as ds:
+        return read_band_pixel(ds, x, y)
+
+
+def read_pixels(paths, x, y, column={}):
+    """
+    reads a pixel value of the first band of many files, with a small
+    windowed read per file in a thread pool
+
+    :param paths: list of filepaths of raster data
+    :param x: x pixel value
+    :param y: y pixel value
+    :param column: `dict` of vertical profile values of files, read
+                   instead of the files
+
+    :returns: `list` of `tuple` of pixel value and nodata value
+    """
+
+    values = [column.get(os.path.basename(p)) for p in paths]
+    missing = [i for i, value in enumerate(values) if value is None]
+
+    if not missing:
+        return values
+
+    workers = min(MSC_PYGEOAPI_SOUNDING_WORKERS, len(missing))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda i: read_pixel(paths[i], x, y), missing)
+        for i, value in zip(missing, results):
+            values[i] = value
+
+    return values
 
 
 def numerical_sort(value):
@@ -203,6 +422,151 @@ def numerical_sort(value):
     return parts
 
 
+def get_model_paths(model, date, forecast_hour):
+    """
+    Pre-build the relative paths of the files of a model run
+
+    :param model: model name
+    :param date: `datetime.datetime` of model run
+    :param forecast_hour: valid hour
+
+    :returns: `tuple` of directory path, ISBL file name template, surface
+              (TGL/AGL) file name template and surface pressure file name
+    """
+
+    run_hour = f"{date.hour:02}"
+    date_formatted = date.strftime("%Y%m%d")
+
+    # Pre-build paths and add projection for each model
+    if model == "GDPS":
+        inter_path = f"/model_gem_global/15km/grib2/lat_lon/{run_hour}/{forecast_hour}"  # noqa
+        file_name = f"/CMC_glb_{{info}}_ISBL_*_latlon.15x.15_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
+        first_value = f"/CMC_glb_{{info}}_TGL_{{height}}_latlon.15x.15_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
+    elif model == "RDPS":
+        inter_path = f"/model_gem_regional/10km/grib2/{run_hour}/{forecast_hour}"  # noqa
+        file_name = f"/CMC_reg_{{info}}_ISBL_*_ps10km_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
+        first_value = f"/CMC_reg_{{info}}_TGL_{{height}}_ps10km_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
+    elif model == "HRDPS":
+        inter_path = f"/model_hrdps/continental/2.5km/{run_hour}/{forecast_hour}"  # noqa
+        file_name = f"/{date_formatted}T{run_hour}Z_MSC_HRDPS_{{info}}_ISBL_*_RLatLon0.0225_PT{forecast_hour}H.grib2"  # noqa
+        first_value = f"/{date_formatted}T{run_hour}Z_MSC_HRDPS_{{info}}_AGL-{{height}}m_RLatLon0.0225_PT{forecast_hour}H.grib2"  # noqa
+    else:
+        msg = f'Not a valid model: {model}'
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    # Find surface pressure level
+    if model == "HRDPS":
+        pressure_name = file_name.replace("{info}_ISBL_*", "PRES_Sfc")
+    else:
+        pressure_name = file_name.replace("{info}_ISBL_*", "PRES_SFC_0")
+
+    return inter_path, file_name, first_value, pressure_name
+
+
+def get_level_paths(full_path):
+    """
+    Find the pressure level files of a variable
+
+    :param full_path: glob pattern of the pressure level files
+
+    :returns: `list` of pressure level and filepath tuples, from the
+              highest pressure level (closest to the surface)
+    """
+
+    paths = sorted(glob.glob(full_path), key=numerical_sort, reverse=True)
+
+    return [
+        (int(re.search(full_path.replace("*", "(.*)"), p).group(1)), p)
+        for p in paths
+    ]
+
+
+def get_profile_path(model, date, forecast_hour):
+    """
+    Helper function to get the vertical profile file of a model run
+    forecast hour
+
+    :param model: model name
+    :param date: `datetime.datetime` of model run
+    :param forecast_hour: valid hour
+
+    :returns: `str` of vertical profile filepath (without extension),
+              or `None` if profiles are not enabled
+    """
+
+    if GEOMET_SOUNDING_PROFILE_BASEPATH is None:
+        return None
+
+    run = date.strftime("%Y%m%d%H")
+
+    return os.path.join(
+        GEOMET_SOUNDING_PROFILE_BASEPATH, model, run,
+        f"{model}_{run}_P{forecast_hour}"
+    )
+
+
+def load_profile(model, date, forecast_hour):
+    """
+    Load the index of the vertical profile file of a model run
+    forecast hour, if it exists
+
+    :param model: model name
+    :param date: `datetime.datetime` of model run
+    :param forecast_hour: valid hour
+
+    :returns: `dict` of vertical profile index, or `None`
+    """
+
+    profile_path = get_profile_path(model, date, forecast_hour)
+    if profile_path is None:
+        return None
+
+    try:
+        with open(f"{profile_path}.json", encoding="utf-8") as fh:
+            profile = json.load(fh)
+    except FileNotFoundError:
+        return None
+
+    # profiles packed without an exact surface pressure are rebuilt
+    if "pressure" not in profile:
+        return None
+
+    profile["filepath"] = f"{profile_path}.npy"
+    profile["pressure_filepath"] = f"{profile_path}.pres.npy"
+
+    return profile
+
+
+def read_profile(profile, x, y):
+    """
+    reads the vertical column of a pixel from a vertical profile file
+
+    :param profile: `dict` of vertical profile index
+    :param x: x pixel value
+    :param y: y pixel value
+
+    :returns: `dict` of file names and tuples of pixel value and
+              nodata value
+    """
+
+    LOGGER.debug(f"Reading vertical column from {profile['filepath']}")
+    column = np.load(profile["filepath"], mmap_mode="r")[y, x]
+
+    values = {
+        layer["name"]: (value, layer["nodata"])
+        for layer, value in zip(profile["layers"], column.tolist())
+    }
+
+    # the pressure level keys are derived from the exact surface pressure
+    pressure = np.load(profile["pressure_filepath"], mmap_mode="r")[y, x]
+    values[profile["pressure"]] = (
+        pressure.item(), values[profile["pressure"]][1]
+    )
+
+    return values
+
+
 def extract_sounding_data(
     model,
     model_run,
@@ -237,26 +601,9 @@ def extract_sounding_data(
     data_basepath = GEOMET_HPFX_BASEPATH
 
     date = datetime.datetime.strptime(model_run, DATE_FORMAT)
-    run_hour = f"{date.hour:02}"
-    date_formatted = date.strftime("%Y%m%d")
-
-    # Pre-build paths and add projection for each model
-    if model == "GDPS":
-        inter_path = f"/model_gem_global/15km/grib2/lat_lon/{run_hour}/{forecast_hour}"  # noqa
-        file_name = f"/CMC_glb_{{info}}_ISBL_*_latlon.15x.15_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
-        first_value = f"/CMC_glb_{{info}}_TGL_{{height}}_latlon.15x.15_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
-    elif model == "RDPS":
-        inter_path = f"/model_gem_regional/10km/grib2/{run_hour}/{forecast_hour}"  # noqa
-        file_name = f"/CMC_reg_{{info}}_ISBL_*_ps10km_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
-        first_value = f"/CMC_reg_{{info}}_TGL_{{height}}_ps10km_{date_formatted}{run_hour}_P{forecast_hour}.grib2"  # noqa
-    elif model == "HRDPS":
-        inter_path = f"/model_hrdps/continental/2.5km/{run_hour}/{forecast_hour}"  # noqa
-        file_name = f"/{date_formatted}T{run_hour}Z_MSC_HRDPS_{{info}}_ISBL_*_RLatLon0.0225_PT{forecast_hour}H.grib2"  # noqa
-        first_value = f"/{date_formatted}T{run_hour}Z_MSC_HRDPS_{{info}}_AGL-{{height}}m_RLatLon0.0225_PT{forecast_hour}H.grib2"  # noqa
-    else:
-        msg = f'Not a valid model: {model}'
-        LOGGER.error(msg)
-        raise ValueError(msg)
+    inter_path, file_name, first_value, pressure_name = get_model_paths(
+        model, date, forecast_hour
+    )
 
     output = {
         "type": "Feature",
@@ -296,28 +643,42 @@ def extract_sounding_data(
                 }
             )
 
-    # Find surface pressure level
-    if model == "HRDPS":
-        first_pressure_level = f'{data_basepath}{inter_path}{file_name.replace("{info}_ISBL_*", "PRES_Sfc")}'  # noqa
+    first_pressure_level = f"{data_basepath}{inter_path}{pressure_name}"
+
+    # Read the vertical column from the vertical profile file of the
+    # forecast hour if it was built, with the grid it was built from
+    profile = load_profile(model, date, forecast_hour)
+    if profile is not None:
+        grid = get_grid(
+            model,
+            profile["projection"],
+            tuple(profile["geotransform"]),
+            tuple(profile["size"]),
+        )
+        x, y = grid.get_pixel(lon, lat)
+        column = read_profile(profile, x, y)
     else:
-        first_pressure_level = f'{data_basepath}{inter_path}{file_name.replace("{info}_ISBL_*", "PRES_SFC_0")}'  # noqa
-    ds = gdal.Open(first_pressure_level)
-
-    # Find output projection, will be the same for all subsequent files
-    out_proj = ds.GetProjection()
-
-    # Reproject depending on the model
-    transformer = Transformer.from_crs("EPSG:4326", out_proj, always_xy=True)
-    _x, _y = transformer.transform(lon, lat)
-
-    # Since all files will be opened on the same latlon,
-    # xy is only calculated once here
-    x, y = geo2xy(ds, _x, _y)
-    min_pressure_level = (
-        xarray.open_rasterio(
-            first_pressure_level
-        )[0, y, x].data.item() / 100
-    )
+        column = {}
+
+    if os.path.basename(first_pressure_level) in column:
+        min_pressure_level = (
+            column[os.path.basename(first_pressure_level)][0] / 100
+        )
+    else:
+        # Find output projection and grid, will be the same for all
+        # subsequent files
+        with FILE_CACHE.open(first_pressure_level) as ds:
+            grid = get_grid(
+                model,
+                ds.GetProjection(),
+                ds.GetGeoTransform(),
+                (ds.RasterXSize, ds.RasterYSize),
+            )
+
+            # Since all files will be opened on the same latlon,
+            # xy is only calculated once here
+            x, y = grid.get_pixel(lon, lat)
+            min_pressure_level = read_band_pixel(ds, x, y)[0] / 100
 
     # Add additionnal useful informations if they're present
     # for that model and if they are required
@@ -383,32 +744,29 @@ def extract_sounding_data(
             },
         }
         science_basepath = GEOMET_SCIENCE_BASEPATH
+        conv_paths = []
         for index, val in conv_dict.items():
             filename = file_name.replace("ISBL_*", val["type"])
             output["properties"][index] = {}
             for desc, info in val["content"].items():
                 full_path = f"{science_basepath}{inter_path}{filename.format(info=info)}"  # noqa
                 if os.path.exists(full_path):
-                    dataArray = xarray.open_rasterio(full_path)
-                    output["properties"][index][desc] = (
-                        dataArray[0, y, x].data.item()
-                    )
-                    if (
-                        output["properties"][index][desc]
-                        in dataArray.nodatavals
-                        or (
-                            index in ["CAPE", "LFC", "EL"]
-                            and output["properties"][index][desc] < 0
-                        )
-                        or (
-                            index == "CIN"
-                            and output["properties"][index][desc] > 0
-                        )
-                    ):
-                        output["properties"][index][desc] = "-"
+                    output["properties"][index][desc] = None
+                    conv_paths.append((index, desc, full_path))
                 else:
                     output["properties"][index][desc] = "N/A"
 
+        conv_values = read_pixels([c[2] for c in conv_paths], x, y, column)
+        for (index, desc, _), (value, nodata) in zip(conv_paths,
+                                                     conv_values):
+            if (
+                value == nodata
+                or (index in ["CAPE", "LFC", "EL"] and value < 0)
+                or (index == "CIN" and value > 0)
+            ):
+                value = "-"
+            output["properties"][index][desc] = value
+
     if temperature_data or wind_data:
         # Add the first pressure level(min_pressure_level) to the dict and
         # the values will come from the 2m(temps) and 10m(winds) files.
@@ -416,20 +774,41 @@ def extract_sounding_data(
         output["properties"][f"{min_pressure_level}mbar"] = {
             "pressure": min_pressure_level
         }
+        first_values = []
         if temperature_data:
-            for info in ["TMP", "DEPR", "DPT"]:
-                output["properties"][f"{min_pressure_level}mbar"][
-                    ABBR[info]
-                ] = xarray.open_rasterio(
-                    first_value_path.format(info=info, height=2)
-                )[0, y, x].data.item()
+            first_values.extend(
+                (info, first_value_path.format(info=info, height=2))
+                for info in ["TMP", "DEPR", "DPT"])
         if wind_data:
-            for info in ["WDIR", "WIND"]:
-                output["properties"][f"{min_pressure_level}mbar"][
-                    ABBR[info]
-                ] = xarray.open_rasterio(
-                    first_value_path.format(info=info, height=10)
-                )[0, y, x].data.item()
+            first_values.extend(
+                (info, first_value_path.format(info=info, height=10))
+                for info in ["WDIR", "WIND"])
+
+        values = read_pixels([f[1] for f in first_values], x, y, column)
+        for (info, _), (value, _) in zip(first_values, values):
+            output["properties"][f"{min_pressure_level}mbar"][
+                ABBR[info]
+            ] = value
+
+    # Find the pressure level files of each variable, then read them all
+    # at once
+    levels = {}
+    for info in ABBR:
+        levels[info] = []
+        if info == "DPT":
+            continue
+        full_path = f"{data_basepath}{inter_path}{file_name.format(info=info)}"
+        for pressure_level, p in get_level_paths(full_path):
+            # Take only what's over min_pressure_level
+            if pressure_level >= min_pressure_level:
+                continue
+            # Add flag if you don't need pressure levels over 100mbar
+            elif novalues_above_100mbar and pressure_level < 100:
+                break
+            levels[info].append((pressure_level, p))
+
+    level_paths = [p for info in ABBR for _, p in levels[info]]
+    level_values = iter(read_pixels(level_paths, x, y, column))
 
     # Build the dict by adding pressure, temperature, dewpoint depression,
     # dewpoint temperature, wind speed and wind direction for every pressure
@@ -445,19 +824,8 @@ def extract_sounding_data(
                         # missing data for TMP or DEPR so can't calc DPT
                         pass
             continue
-        full_path = f"{data_basepath}{inter_path}{file_name.format(info=info)}"
-        paths = sorted(glob.glob(full_path), key=numerical_sort, reverse=True)
-        for p in paths:
-            pressure_level = int(
-                re.search(full_path.replace("*", "(.*)"), p).group(1)
-            )
-            # Take only what's over min_pressure_level
-            if pressure_level >= min_pressure_level:
-                continue
-            # Add flag if you don't need pressure levels over 100mbar
-            elif novalues_above_100mbar and pressure_level < 100:
-                break
-            value = xarray.open_rasterio(p)[0, y, x].data.item()
+        for pressure_level, _ in levels[info]:
+            value, _ = next(level_values)
 
             if f"{pressure_level}mbar" not in output["properties"]:
                 output["properties"][f"{pressure_level}mbar"] = {
@@ -0,0 +1,371 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the 'Software'), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import datetime
+import glob
+import json
+import logging
+import os
+import shutil
+
+import click
+import numpy as np
+from osgeo import gdal
+
+from msc_pygeoapi import cli_options
+from msc_pygeoapi.env import GEOMET_SOUNDING_PROFILE_BASEPATH
+from msc_pygeoapi.process.weather.extract_sounding_data import (
+    DATE_FORMAT,
+    get_level_paths,
+    get_model_paths,
+    get_profile_path,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DAYS_TO_KEEP = 2
+
+# number of grid rows read from all files at a time
+ROW_BLOCK = 64
+
+# hours between the runs of each model
+MODEL_RUN_INTERVALS = {"GDPS": 12, "RDPS": 6, "HRDPS": 6}
+
+
+def get_recent_model_runs(model, count=2):
+    """
+    Get the most recent model runs of a model
+
+    :param model: model name
+    :param count: number of model runs
+
+    :returns: `list` of model runs in %Y-%m-%dT%H:%M:%SZ format, from the
+              most recent
+    """
+
+    interval = MODEL_RUN_INTERVALS[model]
+    now = datetime.datetime.utcnow()
+    latest = now.replace(
+        hour=now.hour - now.hour % interval, minute=0, second=0, microsecond=0
+    )
+
+    return [
+        (latest - datetime.timedelta(hours=interval * i)).strftime(DATE_FORMAT)
+        for i in range(count)
+    ]
+
+
+def get_forecast_hours(model, model_run):
+    """
+    Get the forecast hours available for a model run
+
+    :param model: model name
+    :param model_run: date and hour at which the model is ran
+
+    :returns: `list` of forecast hours (3 digits format)
+    """
+
+    from msc_pygeoapi.env import GEOMET_HPFX_BASEPATH
+
+    date = datetime.datetime.strptime(model_run, DATE_FORMAT)
+    inter_path = get_model_paths(model, date, "000")[0]
+    run_dir = os.path.dirname(f"{GEOMET_HPFX_BASEPATH}{inter_path}")
+
+    if not os.path.isdir(run_dir):
+        return []
+
+    return sorted(d for d in os.listdir(run_dir) if d.isdigit())
+
+
+def is_profile_current(profile_path, paths):
+    """
+    Whether a vertical profile file packs all the given files
+
+    :param profile_path: vertical profile filepath (without extension)
+    :param paths: `list` of filepaths
+
+    :returns: `bool` of whether the profile is current
+    """
+
+    try:
+        with open(f"{profile_path}.json", encoding="utf-8") as fh:
+            index = json.load(fh)
+    except FileNotFoundError:
+        return False
+
+    names = [layer["name"] for layer in index["layers"]]
+
+    # profiles without an exact surface pressure layer are rebuilt
+    return "pressure" in index and names == [
+        os.path.basename(p) for p in paths
+    ]
+
+
+def get_profile_files(model, date, forecast_hour):
+    """
+    Find the files of a model run forecast hour packed into its vertical
+    profile file: the surface pressure, the 2m/10m surface values and the
+    TMP, DEPR, WDIR and WIND pressure levels
+
+    :param model: model name
+    :param date: `datetime.datetime` of model run
+    :param forecast_hour: valid hour
+
+    :returns: `list` of filepaths, starting with the surface pressure
+    """
+
+    from msc_pygeoapi.env import GEOMET_HPFX_BASEPATH
+
+    inter_path, file_name, first_value, pressure_name = get_model_paths(
+        model, date, forecast_hour
+    )
+    basepath = f"{GEOMET_HPFX_BASEPATH}{inter_path}"
+
+    paths = [f"{basepath}{pressure_name}"]
+    paths.extend(
+        f"{basepath}{first_value.format(info=info, height=2)}"
+        for info in ["TMP", "DEPR", "DPT"]
+    )
+    paths.extend(
+        f"{basepath}{first_value.format(info=info, height=10)}"
+        for info in ["WDIR", "WIND"]
+    )
+    for info in ["TMP", "DEPR", "WDIR", "WIND"]:
+        full_path = f"{basepath}{file_name.format(info=info)}"
+        paths.extend(p for _, p in get_level_paths(full_path))
+
+    return [p for p in paths if os.path.exists(p)]
+
+
+def build_profile(model, model_run, forecast_hour):
+    """
+    Pack the files of a model run forecast hour into a vertical profile
+    file: a memory-mappable NumPy array of (y, x, file) float32 values, so
+    that the vertical column of a pixel is contiguous, with a JSON index of
+    the grid and the files. The surface pressure, from which the pressure
+    level keys are derived, is also stored as read from its file.
+
+    :param model: model name
+    :param model_run: date and hour at which the model is ran
+    :param forecast_hour: valid hour
+
+    :returns: `str` of vertical profile filepath
+    """
+
+    date = datetime.datetime.strptime(model_run, DATE_FORMAT)
+
+    profile_path = get_profile_path(model, date, forecast_hour)
+    if profile_path is None:
+        msg = "GEOMET_SOUNDING_PROFILE_BASEPATH is not set"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    paths = get_profile_files(model, date, forecast_hour)
+    if not paths or "PRES" not in os.path.basename(paths[0]):
+        msg = f"No surface pressure file: {model} {model_run} {forecast_hour}"
+        LOGGER.error(msg)
+        raise ValueError(msg)
+
+    # files keep arriving during a model run: repack only when new
+    # files were published since the last build
+    if is_profile_current(profile_path, paths):
+        LOGGER.debug(f"Profile is up to date: {profile_path}")
+        return f"{profile_path}.npy"
+
+    LOGGER.debug(f"Packing {len(paths)} files")
+    datasets = [gdal.Open(p) for p in paths]
+    xsize, ysize = datasets[0].RasterXSize, datasets[0].RasterYSize
+
+    for path, ds in zip(paths, datasets):
+        if ds is None or (ds.RasterXSize, ds.RasterYSize) != (xsize, ysize):
+            msg = f"Cannot pack {path}: not on the model grid"
+            LOGGER.error(msg)
+            raise ValueError(msg)
+
+    bands = [ds.GetRasterBand(1) for ds in datasets]
+    index = {
+        "model": model,
+        "model_run": model_run,
+        "forecast_hour": forecast_hour,
+        "projection": datasets[0].GetProjection(),
+        "geotransform": datasets[0].GetGeoTransform(),
+        "size": [xsize, ysize],
+        "layers": [
+            {"name": os.path.basename(p), "nodata": band.GetNoDataValue()}
+            for p, band in zip(paths, bands)
+        ],
+    }
+
+    os.makedirs(os.path.dirname(profile_path), exist_ok=True)
+
+    # the index is written last and marks a complete profile file
+    if os.path.exists(f"{profile_path}.json"):
+        os.remove(f"{profile_path}.json")
+
+    tmp_path = f"{profile_path}.tmp.npy"
+    pressure_tmp_path = f"{profile_path}.pres.tmp.npy"
+    array = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype="float32", shape=(ysize, xsize, len(paths))
+    )
+    pressure = None
+    for yoff in range(0, ysize, ROW_BLOCK):
+        rows = min(ROW_BLOCK, ysize - yoff)
+        block = np.stack(
+            [band.ReadAsArray(0, yoff, xsize, rows) for band in bands],
+            axis=-1,
+        )
+        if pressure is None:
+            pressure = np.lib.format.open_memmap(
+                pressure_tmp_path,
+                mode="w+",
+                dtype=block.dtype,
+                shape=(ysize, xsize),
+            )
+        array[yoff:yoff + rows] = block
+        pressure[yoff:yoff + rows] = block[..., 0]
+    index["pressure"] = index["layers"][0]["name"]
+    array.flush()
+    pressure.flush()
+    del array, pressure, bands, datasets
+
+    os.replace(tmp_path, f"{profile_path}.npy")
+    os.replace(pressure_tmp_path, f"{profile_path}.pres.npy")
+
+    with open(f"{profile_path}.json.tmp", "w", encoding="utf-8") as fh:
+        json.dump(index, fh)
+    os.replace(f"{profile_path}.json.tmp", f"{profile_path}.json")
+
+    return f"{profile_path}.npy"
+
+
+def clean_profiles(days):
+    """
+    Delete the vertical profile files of model runs older than n days
+
+    :param days: number of days of model runs to keep
+
+    :returns: `list` of deleted model run directories
+    """
+
+    threshold = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    deleted = []
+
+    run_dirs = glob.glob(
+        os.path.join(GEOMET_SOUNDING_PROFILE_BASEPATH, "*", "*")
+    )
+    for run_dir in run_dirs:
+        try:
+            run = datetime.datetime.strptime(
+                os.path.basename(run_dir), "%Y%m%d%H"
+            )
+        except ValueError:
+            continue
+
+        if run < threshold:
+            LOGGER.debug(f"Deleting {run_dir}")
+            shutil.rmtree(run_dir)
+            deleted.append(run_dir)
+
+    return deleted
+
+
+@click.group("sounding-profiles")
+def sounding_profiles():
+    """Manage sounding vertical profile files"""
+    pass
+
+
+@click.command("build")
+@click.pass_context
+@click.option(
+    "--model",
+    type=click.Choice(["GDPS", "RDPS", "HRDPS"]),
+    help="GDPS, RDPS or HRDPS",
+    required=True,
+)
+@click.option(
+    "-mr",
+    "--model_run",
+    help="model run in %Y-%m-%dT%H:%M:%SZ format "
+    "(default: the two most recent model runs)",
+)
+@click.option(
+    "-fh",
+    "--forecast_hour",
+    "forecast_hours",
+    help="forecast hour 3 digits format (repeatable, "
+    "default: all available forecast hours)",
+    multiple=True,
+)
+def build(ctx, model, model_run, forecast_hours):
+    """Pack model run files into vertical profile files"""
+
+    if model_run is None:
+        model_runs = get_recent_model_runs(model)
+    else:
+        model_runs = [model_run]
+
+    for model_run_ in model_runs:
+        for forecast_hour in (
+            forecast_hours or get_forecast_hours(model, model_run_)
+        ):
+            try:
+                profile = build_profile(model, model_run_, forecast_hour)
+                click.echo(f"Built {profile}")
+            except ValueError as err:
+                click.echo(
+                    f"Skipping {model_run_} forecast hour {forecast_hour}: "
+                    f"{err}"
+                )
+
+    click.echo("Done")
+
+
+@click.command("clean")
+@click.pass_context
+@cli_options.OPTION_DAYS(
+    default=DAYS_TO_KEEP,
+    help=f"Delete profiles of model runs older than n days (default={DAYS_TO_KEEP})",  # noqa
+)
+@cli_options.OPTION_YES(prompt="Are you sure you want to delete old profiles?")
+def clean(ctx, days):
+    """Delete vertical profile files older than n number of days"""
+
+    if GEOMET_SOUNDING_PROFILE_BASEPATH is None:
+        click.echo("GEOMET_SOUNDING_PROFILE_BASEPATH is not set")
+        return
+
+    for run_dir in clean_profiles(days):
+        click.echo(f"Deleted {run_dir}")
+
+    click.echo("Done")
+
+
+sounding_profiles.add_command(build)
+sounding_profiles.add_command(clean)
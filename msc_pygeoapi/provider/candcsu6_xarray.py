@@ -39,6 +39,7 @@ from pygeoapi.provider.base import (BaseProvider,
                                     ProviderQueryError)
 from pygeoapi.provider.xarray_ import XarrayProvider
 from msc_pygeoapi.provider.climate_xarray import open_data
+from msc_pygeoapi.provider.covjson import set_data_types
 
 LOGGER = logging.getLogger(__name__)
 
@@ -519,3 +520,25 @@ class CanDCSU6Provider(XarrayProvider):
                 fp.write(data.to_netcdf())
                 fp.seek(0)
                 return fp.read()
+
+    def gen_covjson(self, metadata, data, range_type):
+        """
+        Generate coverage as CoverageJSON representation, with the
+        dataType of each range derived from its NumPy dtype
+
+        :param metadata: coverage metadata
+        :param data: xarray Dataset object
+        :param range_type: range type list
+
+        :returns: dict of CoverageJSON representation
+        """
+
+        cj = super().gen_covjson(metadata, data, range_type)
+
+        dtypes = {}
+        for variable in range_type:
+            pm = self._get_parameter_metadata(
+                variable, self._data[variable].attrs)
+            dtypes[pm['id']] = self._data[variable].dtype
+
+        return set_data_types(cj, dtypes)
@@ -30,11 +30,11 @@
 #
 # =================================================================
 
-import glob
 import logging
 import os
 from parse import search
 import pathlib
+import re
 
 import rasterio
 from rasterio.crs import CRS
@@ -44,8 +44,20 @@ import rasterio.mask
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError)
 
+from msc_pygeoapi.provider.coverage_metadata import (
+    LazyDataset, load_coverage_metadata)
+from msc_pygeoapi.provider.covjson import encode_covjson
+from msc_pygeoapi.provider.dataset_pool import DATASET_POOL
+from msc_pygeoapi.provider.file_index import get_file_index
+from msc_pygeoapi.provider.range_assembly import (
+    encode_netcdf, get_range_window, read_range)
+from msc_pygeoapi.provider.window_query import gen_covjson_series
+
 LOGGER = logging.getLogger(__name__)
 
+# time key of CanGRD file names (year or year-month)
+FILE_KEY_REGEX = r'_(\d{4}(?:-\d{2})?)\.tif$'
+
 
 # TODO: use RasterioProvider once pyproj is updated on bionic
 class CanGRDProvider(BaseProvider):
@@ -61,11 +73,24 @@ class CanGRDProvider(BaseProvider):
         super().__init__(provider_def)
 
         try:
-            self._data = rasterio.open(self.data)
-            self._coverage_properties = self._get_coverage_properties()
-            self.axes = self._coverage_properties['axes']
-            if 'season' in self.data:
-                self.axes.append('season')
+            # precomputed metadata, see msc-pygeoapi metadata
+            # coverage-metadata generate
+            metadata = load_coverage_metadata(provider_def)
+
+            if metadata is not None:
+                self._domainset = metadata['domainset']
+                self._rangetype = metadata['rangetype']
+                self._data = LazyDataset(self.data)
+                self._coverage_properties = metadata['coverage_properties']
+                self.axes = self._coverage_properties['axes']
+            else:
+                self._domainset = None
+                self._rangetype = None
+                self._data = rasterio.open(self.data)
+                self._coverage_properties = self._get_coverage_properties()
+                self.axes = self._coverage_properties['axes']
+                if 'season' in self.data:
+                    self.axes.append('season')
             self.crs = self._coverage_properties['bbox_crs']
             self.num_bands = self._coverage_properties['num_bands']
             # list of variables are not in metadata
@@ -85,6 +110,9 @@ class CanGRDProvider(BaseProvider):
         :returns: CIS JSON object of domainset metadata
         """
 
+        if self._domainset is not None:
+            return self._domainset
+
         domainset = {
             'type': 'DomainSet',
             'generalGrid': {
@@ -144,9 +172,7 @@ class CanGRDProvider(BaseProvider):
             }
 
         if 'trend' not in self.data:
-            file_path = pathlib.Path(self.data).parent.resolve()
-            file_path_ = glob.glob(os.path.join(file_path, '*TMEAN*'))
-            file_path_.sort()
+            file_path_ = self.get_file_list('TMEAN')
             begin_file, end_file = file_path_[0], file_path_[-1]
 
             if 'monthly' not in self.data:
@@ -185,6 +211,9 @@ class CanGRDProvider(BaseProvider):
         :returns: CIS JSON object of rangetype metadata
         """
 
+        if self._rangetype is not None:
+            return self._rangetype
+
         rangetype = {
             'type': 'DataRecord',
             'field': []
@@ -264,7 +293,8 @@ class CanGRDProvider(BaseProvider):
             minx, miny, maxx, maxy = bbox
 
             crs_src = CRS.from_epsg(4326)
-            crs_dest = self._data.crs
+            with DATASET_POOL.open(self.data) as _data:
+                crs_dest = _data.crs
 
             if crs_src == crs_dest:
                 LOGGER.debug('source bbox CRS and data CRS are the same')
@@ -369,14 +399,13 @@ class CanGRDProvider(BaseProvider):
             else:
                 date_file_list = self.get_file_list(properties[0].upper(),
                                                     datetime_)
-                args['indexes'] = list(range(1, len(date_file_list) + 1))
 
         if not os.path.isfile(self.data):
             msg = 'No such file'
             LOGGER.error(msg)
             raise ProviderQueryError(msg)
 
-        with rasterio.open(self.data) as _data:
+        with DATASET_POOL.open(self.data) as _data:
             LOGGER.debug('Creating output coverage metadata')
             out_meta = _data.meta
 
@@ -385,27 +414,6 @@ class CanGRDProvider(BaseProvider):
                 for key, value in self.options.items():
                     out_meta[key] = value
 
-            if shapes:  # spatial subset
-                try:
-                    LOGGER.debug('Clipping data with bbox')
-                    out_image, out_transform = rasterio.mask.mask(
-                        _data,
-                        filled=False,
-                        shapes=shapes,
-                        crop=True,
-                        indexes=None)
-                except ValueError as err:
-                    LOGGER.error(err)
-                    raise ProviderQueryError(err)
-
-                out_meta.update({'driver': self.native_format,
-                                 'height': out_image.shape[1],
-                                 'width': out_image.shape[2],
-                                 'transform': out_transform})
-            else:  # no spatial subset
-                LOGGER.debug('Creating data in memory with band selection')
-                out_image = _data.read(indexes=[1])
-
             if bbox:
                 out_meta['bbox'] = [bbox[0], bbox[1], bbox[2], bbox[3]]
             elif shapes:
@@ -429,68 +437,95 @@ class CanGRDProvider(BaseProvider):
                 self.filename[-1] = f"{datetime_.replace('/', '-')}.tif"
                 self.filename = '_'.join(self.filename)
 
-            # CovJSON output does not support multiple bands yet
-            # Only the first timestep is returned
-            if format_ == 'json':
-                if date_file_list:
-                    err = 'Date range not yet supported for CovJSON output'
+            if date_file_list:
+                try:
+                    shape_mask, out_transform, window = get_range_window(
+                        _data, shapes)
+                    values = read_range(_data, date_file_list, 1, window,
+                                        shape_mask)
+                except ValueError as err:
                     LOGGER.error(err)
                     raise ProviderQueryError(err)
-                else:
+
+                times = [re.search(FILE_KEY_REGEX, file_).group(1)
+                         for file_ in date_file_list]
+
+                if format_ == 'json':
                     LOGGER.debug('Creating output in CoverageJSON')
-                    out_meta['bands'] = args['indexes']
-                    return self.gen_covjson(out_meta, shapes, out_image)
+                    return self.gen_covjson_series(
+                        _data, out_meta, shapes, times, values)
+                elif format_.lower() == 'netcdf':
+                    return encode_netcdf(
+                        properties[0].upper(), values, times, out_transform,
+                        _data.crs, {'units': _data.units[0]})
+
+                out_meta.update(count=len(date_file_list))
+                if shapes:
+                    out_meta.update({'driver': self.native_format,
+                                     'height': values.shape[1],
+                                     'width': values.shape[2],
+                                     'transform': out_transform})
+
+                LOGGER.debug('Serializing data in memory')
+                with MemoryFile() as memfile:
+                    with memfile.open(**out_meta) as dest:
+                        dest.write(values)
+
+                    # return data in native format
+                    LOGGER.debug('Returning data in native format')
+                    return memfile.read()
+
+            if shapes:  # spatial subset
+                try:
+                    LOGGER.debug('Clipping data with bbox')
+                    out_image, out_transform = rasterio.mask.mask(
+                        _data,
+                        filled=False,
+                        shapes=shapes,
+                        crop=True,
+                        indexes=None)
+                except ValueError as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError(err)
+
+                out_meta.update({'driver': self.native_format,
+                                 'height': out_image.shape[1],
+                                 'width': out_image.shape[2],
+                                 'transform': out_transform})
+            else:  # no spatial subset
+                LOGGER.debug('Creating data in memory with band selection')
+                out_image = _data.read(indexes=[1])
+
+            # CovJSON output does not support multiple bands yet
+            if format_ == 'json':
+                LOGGER.debug('Creating output in CoverageJSON')
+                out_meta['bands'] = args['indexes']
+                return self.gen_covjson(out_meta, shapes, out_image, _data)
             else:
-                if date_file_list:
-                    LOGGER.debug('Serializing data in memory')
-                    with MemoryFile() as memfile:
-
-                        out_meta.update(count=len(date_file_list))
-
-                        with memfile.open(**out_meta) as dest:
-                            for id, layer in enumerate(date_file_list,
-                                                       start=1):
-                                with rasterio.open(layer) as src1:
-                                    if shapes:  # spatial subset
-                                        try:
-                                            LOGGER.debug('Clipping data')
-                                            out_image, out_transform = \
-                                                rasterio.mask.mask(
-                                                    src1,
-                                                    filled=False,
-                                                    shapes=shapes,
-                                                    crop=True,
-                                                    indexes=1)
-                                        except ValueError as err:
-                                            LOGGER.error(err)
-                                            raise ProviderQueryError(err)
-                                    else:
-                                        out_image = src1.read(indexes=1)
-                                    dest.write_band(id, out_image)
-
-                        # return data in native format
-                        LOGGER.debug('Returning data in native format')
-                        return memfile.read()
-                else:
-                    LOGGER.debug('Serializing data in memory')
-                    with MemoryFile() as memfile:
-                        with memfile.open(**out_meta) as dest:
-                            dest.write(out_image)
+                LOGGER.debug('Serializing data in memory')
+                with MemoryFile() as memfile:
+                    with memfile.open(**out_meta) as dest:
+                        dest.write(out_image)
 
-                        # return data in native format
-                        LOGGER.debug('Returning data in native format')
-                        return memfile.read()
+                    # return data in native format
+                    LOGGER.debug('Returning data in native format')
+                    return memfile.read()
 
     # TODO: remove once pyproj is updated on bionic
-    def gen_covjson(self, metadata, shapes, data):
+    def gen_covjson(self, metadata, shapes, data, dataset=None):
         """
         Generate coverage as CoverageJSON representation
         :param metadata: coverage metadata
         :param shapes: bbox in the data projection
         :param data: rasterio DatasetReader object
+        :param dataset: opened rasterio DatasetReader object of the
+                        coverage (default: the provider dataset)
         :returns: dict of CoverageJSON representation
         """
 
+        if dataset is None:
+            dataset = self._data
+
         LOGGER.debug('Creating CoverageJSON domain')
 
         # in the file we have http://www.opengis.net/def/crs/OGC/1.3//3995
@@ -538,14 +573,14 @@ class CanGRDProvider(BaseProvider):
         }
 
         if metadata['bands'] is None:  # all bands
-            bands_select = range(1, len(self._data.dtypes) + 1)
+            bands_select = range(1, len(dataset.dtypes) + 1)
         else:
             bands_select = metadata['bands']
 
         LOGGER.debug(f'bands selected: {bands_select}')
         for bs in bands_select:
             pm = _get_parameter_metadata(
-                self._data.profile['driver'], self._data.tags(bs))
+                dataset.profile['driver'], dataset.tags(bs))
 
             parameter = {
                 'type': 'Parameter',
@@ -565,6 +600,7 @@ class CanGRDProvider(BaseProvider):
 
             cj['parameters'][pm['id']] = parameter
 
+        values = {}
         try:
             for key in cj['parameters'].keys():
                 cj['ranges'][key] = {
@@ -575,12 +611,60 @@ class CanGRDProvider(BaseProvider):
                     'shape': [metadata['height'], metadata['width']],
                 }
                 # TODO: deal with multi-band value output
-                cj['ranges'][key]['values'] = data.flatten().tolist()
+                values[key] = data
         except IndexError as err:
             LOGGER.warning(err)
             raise ProviderQueryError('Invalid query parameter')
 
-        return cj
+        return encode_covjson(cj, values, metadata.get('nodata'))
+
+    def gen_covjson_series(self, dataset, metadata, shapes, times, values):
+        """
+        Generate the timesteps of a coverage as CoverageJSON
+        :param dataset: rasterio DatasetReader object
+        :param metadata: coverage metadata
+        :param shapes: bbox in the data projection
+        :param times: list of times (one per timestep)
+        :param values: `numpy.ma.MaskedArray` of values (time, y, x)
+        :returns: dict of CoverageJSON representation
+        """
+
+        if shapes:
+            coordinates = shapes[0]['coordinates'][0]
+            bbox = [coordinates[0][0], coordinates[0][1],
+                    coordinates[2][0], coordinates[2][1]]
+        else:
+            bbox = metadata['bbox']
+
+        pm = _get_parameter_metadata(
+            dataset.profile['driver'], dataset.tags(1))
+
+        parameters = {
+            pm['id']: {
+                'type': 'Parameter',
+                'description': {
+                    'en': str(pm['description'])
+                },
+                'unit': {
+                    'symbol': str(pm['unit_label'])
+                },
+                'observedProperty': {
+                    'id': str(pm['observed_property_id']),
+                    'label': {
+                        'en': str(pm['observed_property_name'])
+                    }
+                }
+            }
+        }
+
+        # see gen_covjson for the CRS of the data
+        referencing = {
+            'type': self._coverage_properties['crs_type'],
+            'id': 'http://www.opengis.net/def/crs/EPSG/0/3995'
+        }
+
+        return gen_covjson_series(parameters, referencing, bbox, times,
+                                  values, metadata.get('nodata'))
 
     # TODO: remove once pyproj is updated on bionic
     def _get_coverage_properties(self):
@@ -635,23 +719,16 @@ class CanGRDProvider(BaseProvider):
         :returns: sorted list of files
         """
 
-        file_path = pathlib.Path(self.data).parent.resolve()
-        file_path_ = glob.glob(os.path.join(file_path, f'*{variable}*'))
-        file_path_.sort()
+        file_index = get_file_index(
+            pathlib.Path(self.data).parent.resolve(), 0, f'*{variable}*',
+            FILE_KEY_REGEX)
 
         if datetime_:
             begin, end = datetime_.split('/')
 
-            begin_file_idx = [file_path_.index(
-                i) for i in file_path_ if begin in i]
-            end_file_idx = [file_path_.index(
-                i) for i in file_path_ if end in i]
-
-            query_file = file_path_[begin_file_idx[0]:end_file_idx[0] + 1]
-
-            return query_file
+            return file_index.range(begin, end)
         else:
-            return file_path_
+            return file_index.files()
 
 
 # TODO: remove once pyproj is updated on bionic
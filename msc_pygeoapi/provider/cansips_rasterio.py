@@ -31,7 +31,6 @@
 # =================================================================
 
 from datetime import date, datetime
-import glob
 import logging
 import os
 from parse import search
@@ -45,8 +44,19 @@ import rasterio.mask
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError)
 
+from msc_pygeoapi.provider.coverage_metadata import (
+    LazyDataset, load_coverage_metadata)
+from msc_pygeoapi.provider.covjson import encode_covjson
+from msc_pygeoapi.provider.dataset_pool import DATASET_POOL
+from msc_pygeoapi.provider.file_index import get_file_index
+from msc_pygeoapi.provider.window_query import (
+    gen_covjson_series, get_window)
+
 LOGGER = logging.getLogger(__name__)
 
+# time key of CanSIPS file names
+FILE_KEY_REGEX = r'_(\d{4}-\d{2})_allmembers'
+
 
 # TODO: use RasterioProvider once pyproj is updated on bionic
 class CanSIPSProvider(BaseProvider):
@@ -66,9 +76,6 @@ class CanSIPSProvider(BaseProvider):
             self.member = []
 
             self.var = 'cansips_forecast_raw_latlon2.5x2.5_TMP_TGL_2m_'
-            self.get_file_list(self.var)
-
-            self.data = self.file_list[0]
 
             self.var_list = ['cansips_forecast_raw_latlon2.5x2.5_TMP_TGL_2m',
                              'cansips_forecast_raw_latlon2.5x2.5_HGT_ISBL_0500', # noqa
@@ -77,10 +84,28 @@ class CanSIPSProvider(BaseProvider):
                              'cansips_forecast_raw_latlon2.5x2.5_TMP_ISBL_0850', # noqa
                              'cansips_forecast_raw_latlon2.5x2.5_WTMP_SFC_0']
 
-            self._data = rasterio.open(self.data)
-            self._coverage_properties = self._get_coverage_properties()
-            self.axes = self._coverage_properties['axes']
-            self.axes.extend(['time', 'dim_reference_time', 'member'])
+            # precomputed metadata, see msc-pygeoapi metadata
+            # coverage-metadata generate
+            metadata = load_coverage_metadata(provider_def)
+
+            if metadata is not None:
+                self.data = metadata['data']
+                self._domainset = metadata['domainset']
+                self._rangetype = metadata['rangetype']
+                self._data = LazyDataset(self.data)
+                self._coverage_properties = metadata['coverage_properties']
+                self.axes = self._coverage_properties['axes']
+            else:
+                self._domainset = None
+                self._rangetype = None
+                self.get_file_list(self.var)
+
+                self.data = self.file_list[0]
+
+                self._data = rasterio.open(self.data)
+                self._coverage_properties = self._get_coverage_properties()
+                self.axes = self._coverage_properties['axes']
+                self.axes.extend(['time', 'dim_reference_time', 'member'])
             self.num_bands = self._coverage_properties['num_bands']
             self.crs = self._coverage_properties['bbox_crs']
             self.fields = [str(num) for num in range(1, self.num_bands+1)]
@@ -102,6 +127,9 @@ class CanSIPSProvider(BaseProvider):
         :returns: CIS JSON object of domainset metadata
         """
 
+        if self._domainset is not None:
+            return self._domainset
+
         domainset = {
             'type': 'DomainSet',
             'generalGrid': {
@@ -199,6 +227,9 @@ class CanSIPSProvider(BaseProvider):
         :returns: CIS JSON object of rangetype metadata
         """
 
+        if self._rangetype is not None:
+            return self._rangetype
+
         rangetype = {
             'type': 'DataRecord',
             'field': []
@@ -206,15 +237,18 @@ class CanSIPSProvider(BaseProvider):
 
         for var in self.var_list:
 
-            self._data = rasterio.open(self.data.replace(
-                'cansips_forecast_raw_latlon2.5x2.5_TMP_TGL_2m', var))
-
-            i, dtype, nodataval = self._data.indexes[0], \
-                self._data.dtypes[0], self._data.nodatavals[0]
+            with DATASET_POOL.open(self.data.replace(
+                    'cansips_forecast_raw_latlon2.5x2.5_TMP_TGL_2m',
+                    var)) as _data:
+                i, dtype, nodataval = _data.indexes[0], \
+                    _data.dtypes[0], _data.nodatavals[0]
+                band_units = _data.units[i-1]
+                driver = _data.profile['driver']
+                band_tags = _data.tags(i)
 
             LOGGER.debug(f'Determing rangetype for band {i}')
 
-            tags = self._data.tags(i)
+            tags = dict(band_tags)
             keys_to_remove = ['GRIB_FORECAST_SECONDS',
                               'GRIB_IDS',
                               'GRIB_PDS_TEMPLATE_ASSEMBLED_VALUES',
@@ -225,9 +259,8 @@ class CanSIPSProvider(BaseProvider):
                 tags.pop(keys)
 
             name, units = None, None
-            if self._data.units[i-1] is None:
-                parameter = _get_parameter_metadata(
-                    self._data.profile['driver'], self._data.tags(i))
+            if band_units is None:
+                parameter = _get_parameter_metadata(driver, band_tags)
                 name = parameter['description']
                 units = parameter['unit_label']
 
@@ -376,9 +409,37 @@ class CanSIPSProvider(BaseProvider):
             LOGGER.error(msg)
             raise ProviderQueryError(msg)
 
-        with rasterio.open(self.data) as self._data:
+        with DATASET_POOL.open(self.data) as self._data:
             LOGGER.debug('Creating output coverage metadata')
 
+            times = None
+            if format_ == 'json' and datetime_ and '/' in datetime_:
+                times = [self.get_time_from_dim(
+                    f'{year}-{month}', band - 12 * (self.member[0] - 1))
+                    for band in args['indexes']]
+
+            # date ranges of a point or small area are read from a window,
+            # in the same layout as larger areas
+            if shapes and times:
+                xs, ys = zip(*shapes[0]['coordinates'][0])
+                try:
+                    window = get_window(self._data.transform,
+                                        self._data.width, self._data.height,
+                                        xs, ys)
+                except ValueError as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError(err)
+
+                if window is not None:
+                    LOGGER.debug('Reading values of point or small area')
+                    if not bbox:
+                        bbox = [subsets[x][0], subsets[y][0],
+                                subsets[x][1], subsets[y][1]]
+                    values = self._data.read(indexes=args['indexes'],
+                                             window=window, masked=True)
+                    return self.gen_covjson_series(
+                        bbox, times, args['indexes'], values)
+
             out_meta = self._data.meta
 
             if self.options is not None:
@@ -426,16 +487,14 @@ class CanSIPSProvider(BaseProvider):
 
             self.filename = self.data.split('/')[-1]
 
-            # CovJSON output does not support multiple bands yet
-            # Only the first timestep is returned
             if format_ == 'json':
+                LOGGER.debug('Creating output in CoverageJSON')
 
-                if datetime_ and '/' in datetime_:
-                    err = 'Date range not yet supported for CovJSON output'
-                    LOGGER.error(err)
-                    raise ProviderQueryError(err)
+                if times:
+                    return self.gen_covjson_series(
+                        out_meta['bbox'], times, args['indexes'], out_image)
                 else:
-                    LOGGER.debug('Creating output in CoverageJSON')
+                    # Only the first timestep is returned
                     out_meta['bands'] = [1]
                     return self.gen_covjson(out_meta, out_image)
             else:
@@ -518,6 +577,7 @@ class CanSIPSProvider(BaseProvider):
 
             cj['parameters'][pm['id']] = parameter
 
+        values = {}
         try:
             for key in cj['parameters'].keys():
                 cj['ranges'][key] = {
@@ -528,12 +588,51 @@ class CanSIPSProvider(BaseProvider):
                     'shape': [metadata['height'], metadata['width']],
                 }
                 # TODO: deal with multi-band value output
-                cj['ranges'][key]['values'] = data.flatten().tolist()
+                values[key] = data
         except IndexError as err:
             LOGGER.warning(err)
             raise ProviderQueryError('Invalid query parameter')
 
-        return cj
+        return encode_covjson(cj, values, metadata.get('nodata'))
+
+    def gen_covjson_series(self, bbox, times, bands, values):
+        """
+        Generate the timesteps of a coverage as CoverageJSON
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param times: list of forecast times (one per band)
+        :param bands: list of band numbers
+        :param values: `numpy.ndarray` of values (time, y, x)
+        :returns: dict of CoverageJSON representation
+        """
+
+        pm = _get_parameter_metadata(
+            self._data.profile['driver'], self._data.tags(bands[0]))
+
+        parameters = {
+            pm['id']: {
+                'type': 'Parameter',
+                'description': {
+                    'en': pm['description']
+                },
+                'unit': {
+                    'symbol': pm['unit_label']
+                },
+                'observedProperty': {
+                    'id': pm['observed_property_id'],
+                    'label': {
+                        'en': pm['observed_property_name']
+                    }
+                }
+            }
+        }
+
+        referencing = {
+            'type': self._coverage_properties['crs_type'],
+            'id': self._coverage_properties['bbox_crs']
+        }
+
+        return gen_covjson_series(parameters, referencing, bbox, times,
+                                  values, self._data.nodata)
 
     # TODO: remove once pyproj is updated on bionic
     def _get_coverage_properties(self):
@@ -590,29 +689,18 @@ class CanSIPSProvider(BaseProvider):
         """
 
         try:
-            file_path = pathlib.Path(self.data).parent.resolve()
-
-            file_path = str(file_path).split('/')
-            file_path[-1] = '*'
-            file_path[-2] = '*'
-
-            file_path_ = glob.glob(os.path.join('/'.join(file_path),
-                                                f'{variable}*'))
-            file_path_.sort()
+            # files are organized in <root>/<year>/<month> directories
+            root = pathlib.Path(self.data).parent.resolve().parent.parent
+            file_index = get_file_index(
+                root, 2, f'{variable}*', FILE_KEY_REGEX)
 
             if datetime_:
                 begin, end = datetime_.split('/')
 
-                begin_file_idx = [file_path_.index(i) for i
-                                  in file_path_ if begin in i]
-                end_file_idx = [file_path_.index(i) for i
-                                in file_path_ if end in i]
-
-                self.file_list = file_path_[
-                    begin_file_idx[0]:end_file_idx[0] + 1]
+                self.file_list = file_index.range(begin, end)
                 return True
             else:
-                self.file_list = file_path_
+                self.file_list = file_index.files()
                 return True
 
         except ValueError as err:
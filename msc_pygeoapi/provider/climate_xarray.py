@@ -30,9 +30,14 @@
 # =================================================================
 
 import cftime
+from collections import OrderedDict
 from datetime import datetime
+import glob
 import logging
+import os
 import tempfile
+import threading
+import time
 
 import numpy as np
 import xarray
@@ -42,9 +47,14 @@ from pygeoapi.provider.base import (BaseProvider,
                                     ProviderNoDataError,
                                     ProviderQueryError)
 from pygeoapi.provider.xarray_ import (XarrayProvider,
-                                       _convert_float32_to_float64,
                                        _get_zarr_data)
 
+from msc_pygeoapi.env import (MSC_PYGEOAPI_XARRAY_CACHE_SIZE,
+                              MSC_PYGEOAPI_XARRAY_CACHE_TTL)
+from msc_pygeoapi.process.cccs.point_store import (get_store,
+                                                   is_point_subset)
+from msc_pygeoapi.provider.covjson import set_data_types
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -445,8 +455,10 @@ class ClimateProvider(XarrayProvider):
                 LOGGER.error(err)
                 msg = 'Not a valid properties value'
                 raise ProviderQueryError(msg)
-            data = xarray.open_dataset(cmip5_file)
+            source, opener = cmip5_file, xarray.open_dataset
+            data = DATASET_CACHE.get(source, opener)
         else:
+            source, opener = self.data, open_mfdataset
             data = self._data[[*properties_]]
 
         if any([self._coverage_properties['x_axis_label'] in subsets,
@@ -510,6 +522,15 @@ class ClimateProvider(XarrayProvider):
                         query_params[self.time_field] = datetime_
 
             LOGGER.debug(f'Query parameters: {query_params}')
+
+            store_path = get_store(source)
+            if store_path is not None:
+                store = DATASET_CACHE.get(store_path, opener)
+                if is_point_subset(store, query_params,
+                                   self.x_field, self.y_field):
+                    LOGGER.debug(f'Reading point subset from {store_path}')
+                    data = store[list(data.data_vars)]
+
             try:
                 data = data.loc[query_params]
             except Exception as err:
@@ -579,10 +600,175 @@ class ClimateProvider(XarrayProvider):
                 fp.seek(0)
                 return fp.read()
 
+    def gen_covjson(self, metadata, data, range_type):
+        """
+        Generate coverage as CoverageJSON representation, with the
+        dataType of each range derived from its NumPy dtype
 
-def open_data(data):
+        :param metadata: coverage metadata
+        :param data: xarray Dataset object
+        :param range_type: range type list
+
+        :returns: dict of CoverageJSON representation
+        """
+
+        cj = super().gen_covjson(metadata, data, range_type)
+
+        dtypes = {}
+        for variable in range_type:
+            pm = self._get_parameter_metadata(
+                variable, self._data[variable].attrs)
+            dtypes[pm['id']] = self._data[variable].dtype
+
+        return set_data_types(cj, dtypes)
+
+
+def get_files_signature(pattern):
+    """
+    Helper function to get the files matching a pattern and their
+    modification times
+    :param pattern: path or glob pattern of files
+
+    :returns: `tuple` of (path, modification time) tuples
+    """
+
+    signature = []
+
+    for path in sorted(glob.glob(pattern)):
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+
+    return tuple(signature)
+
+
+class DatasetCache:
+    """
+    Process-wide LRU cache of opened xarray datasets, keyed by resolved
+    file pattern, with size and time to live eviction. Entries are
+    invalidated when the files matching the pattern change.
     """
-    Convenience function to open multiple files with xarray
+
+    def __init__(self, size=MSC_PYGEOAPI_XARRAY_CACHE_SIZE,
+                 ttl=MSC_PYGEOAPI_XARRAY_CACHE_TTL):
+        """
+        Initialize object
+        :param size: maximum number of datasets (0 disables caching)
+        :param ttl: time to live of datasets in seconds
+
+        :returns: msc_pygeoapi.provider.climate_xarray.DatasetCache
+        """
+
+        self.size = size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pattern, opener):
+        """
+        Get an opened dataset, opening it on a cache miss
+        :param pattern: resolved path or glob pattern of files
+        :param opener: function opening the dataset from <pattern>
+
+        :returns: xarray dataset
+        """
+
+        if self.size <= 0:
+            return opener(pattern)
+
+        key = (opener.__name__, pattern)
+        signature = get_files_signature(pattern)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is not None:
+                dataset, opened, entry_signature = entry
+                if now - opened <= self.ttl and signature == entry_signature:
+                    self._datasets.move_to_end(key)
+                    self.hits += 1
+                    return dataset
+
+                # datasets still in use by a request are closed once
+                # garbage collected
+                del self._datasets[key]
+                self.invalidations += 1
+
+            self.misses += 1
+
+        LOGGER.debug(f'Opening {pattern} ({self.stats()})')
+        dataset = opener(pattern)
+
+        if dataset is not None:
+            with self._lock:
+                self._datasets[key] = (dataset, now, signature)
+                self._datasets.move_to_end(key)
+                while len(self._datasets) > self.size:
+                    self._datasets.popitem(last=False)
+                    self.evictions += 1
+
+        return dataset
+
+    def clear(self):
+        """
+        Remove all datasets from cache
+
+        :returns: None
+        """
+
+        with self._lock:
+            self._datasets.clear()
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        :returns: `dict` of cache hits, misses, evictions, invalidations
+                  and number of cached datasets
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'datasets': len(self._datasets)
+        }
+
+
+DATASET_CACHE = DatasetCache()
+
+
+def _convert_float32_coords_to_float64(data):
+    """
+    Converts float32 coordinates to float64, so that coordinate values
+    (bbox, resolution, CoverageJSON domain) are JSON serializable. Data
+    variables keep their native dtype.
+    :param data: xarray dataset
+
+    :returns: xarray dataset
+    """
+
+    coords = {
+        name: coord.astype('float64')
+        for name, coord in data.coords.items()
+        if coord.dtype == 'float32'
+    }
+
+    return data.assign_coords(coords) if coords else data
+
+
+def open_mfdataset(data):
+    """
+    Convenience function to open multiple files with xarray, lazily and
+    keeping the native (e.g. float32) dtype of data variables
     :param data: path to files
 
     :returns: xarray dataset
@@ -591,8 +777,20 @@ def open_data(data):
     try:
         open_func = xarray.open_mfdataset
         _data = open_func(data)
-        _data = _convert_float32_to_float64(_data)
+        _data = _convert_float32_coords_to_float64(_data)
 
         return _data
     except Exception as err:
         LOGGER.error(err)
+
+
+def open_data(data):
+    """
+    Convenience function to open multiple files with xarray, through the
+    process-wide dataset cache
+    :param data: path to files
+
+    :returns: xarray dataset
+    """
+
+    return DATASET_CACHE.get(data, open_mfdataset)
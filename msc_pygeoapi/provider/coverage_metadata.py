@@ -0,0 +1,231 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import copy
+import json
+import logging
+import os
+import re
+
+import click
+import rasterio
+
+from msc_pygeoapi.env import MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH
+from msc_pygeoapi.util import json_serial
+
+LOGGER = logging.getLogger(__name__)
+
+# coverage providers supporting metadata sidecars
+COVERAGE_PROVIDERS = [
+    'msc_pygeoapi.provider.cangrd_rasterio.CanGRDProvider',
+    'msc_pygeoapi.provider.cansips_rasterio.CanSIPSProvider',
+    'msc_pygeoapi.provider.rdpa_rasterio.RDPAProvider'
+]
+
+# sidecar filepath => (mtime, metadata)
+METADATA_CACHE = {}
+
+
+class LazyDataset:
+    """Proxy of a rasterio dataset, only opened when first used"""
+
+    def __init__(self, path, **attributes):
+        """
+        Initialize object
+
+        :param path: filepath of dataset
+        :param attributes: attributes to set on the dataset once opened
+
+        :returns: `msc_pygeoapi.provider.coverage_metadata.LazyDataset`
+        """
+
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_attributes', attributes)
+        object.__setattr__(self, '_dataset', None)
+
+    def _open(self):
+        if self._dataset is None:
+            LOGGER.debug(f'Opening {self._path}')
+            dataset = rasterio.open(self._path)
+            for key, value in self._attributes.items():
+                setattr(dataset, key, value)
+            object.__setattr__(self, '_dataset', dataset)
+
+        return self._dataset
+
+    def __getattr__(self, name):
+        return getattr(self._open(), name)
+
+    def __setattr__(self, name, value):
+        # attributes set before the dataset is opened are set once opened
+        if self._dataset is None:
+            self._attributes[name] = value
+        else:
+            setattr(self._dataset, name, value)
+
+
+def get_metadata_path(data, basepath=MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH):
+    """
+    Helper function to get the metadata sidecar filepath of a collection
+
+    :param data: provider data (filepath or glob pattern)
+    :param basepath: basepath of metadata sidecars
+
+    :returns: `str` of metadata sidecar filepath
+    """
+
+    name = re.sub(r'[^\w.-]+', '_', data.strip('/'))
+
+    return os.path.join(basepath, f'{name}.json')
+
+
+def load_coverage_metadata(provider_def,
+                           basepath=MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH):
+    """
+    Load the metadata sidecar of a collection, if any
+
+    :param provider_def: provider definition
+    :param basepath: basepath of metadata sidecars
+
+    :returns: `dict` of coverage metadata, or `None`
+    """
+
+    if basepath is None or not provider_def.get('coverage_metadata', True):
+        return None
+
+    path = get_metadata_path(provider_def['data'], basepath)
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        LOGGER.debug(f'No coverage metadata sidecar {path}')
+        return None
+
+    cached = METADATA_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        LOGGER.debug(f'Loading coverage metadata sidecar {path}')
+        with open(path, encoding='utf-8') as fh:
+            cached = (mtime, json.load(fh))
+        METADATA_CACHE[path] = cached
+
+    # providers update their metadata in place
+    return copy.deepcopy(cached[1])
+
+
+def generate_coverage_metadata(provider):
+    """
+    Generate the metadata sidecar of a coverage provider
+
+    :param provider: coverage provider
+
+    :returns: `dict` of coverage metadata
+    """
+
+    return {
+        'data': provider.data,
+        'coverage_properties': provider._coverage_properties,
+        'domainset': provider.get_coverage_domainset(),
+        'rangetype': provider.get_coverage_rangetype()
+    }
+
+
+def write_coverage_metadata(data, metadata,
+                            basepath=MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH):
+    """
+    Write the metadata sidecar of a collection
+
+    :param data: provider data (filepath or glob pattern)
+    :param metadata: `dict` of coverage metadata
+    :param basepath: basepath of metadata sidecars
+
+    :returns: `str` of metadata sidecar filepath
+    """
+
+    path = get_metadata_path(data, basepath)
+    os.makedirs(basepath, exist_ok=True)
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(metadata, fh, default=json_serial)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+@click.group('coverage-metadata')
+def coverage_metadata():
+    """Manage coverage metadata sidecars"""
+    pass
+
+
+@click.command()
+@click.pass_context
+@click.option('--config', '-c', 'config', envvar='PYGEOAPI_CONFIG',
+              type=click.File(encoding='utf-8'), required=True,
+              help='pygeoapi configuration file')
+@click.option('--collection', 'collections', multiple=True,
+              help='collection (default: all supported collections)')
+@click.option('--basepath', default=MSC_PYGEOAPI_COVERAGE_METADATA_BASEPATH,
+              help='basepath of metadata sidecars')
+def generate(ctx, config, collections, basepath):
+    """Generate coverage metadata sidecars"""
+
+    from pygeoapi.plugin import load_plugin
+    from pygeoapi.util import yaml_load
+
+    if basepath is None:
+        raise click.ClickException('Missing --basepath option')
+
+    resources = yaml_load(config)['resources']
+
+    for name, resource in resources.items():
+        if collections and name not in collections:
+            continue
+
+        for provider_def in resource.get('providers', []):
+            if provider_def.get('name') not in COVERAGE_PROVIDERS:
+                continue
+
+            click.echo(f'Generating coverage metadata of {name}')
+            try:
+                provider = load_plugin(
+                    'provider', dict(provider_def, coverage_metadata=False))
+                metadata = generate_coverage_metadata(provider)
+            except Exception as err:
+                LOGGER.error(f'Could not generate metadata of {name}: {err}')
+                continue
+
+            path = write_coverage_metadata(
+                provider_def['data'], metadata, basepath)
+            click.echo(f'Wrote {path}')
+
+    click.echo('Done')
+
+
+coverage_metadata.add_command(generate)
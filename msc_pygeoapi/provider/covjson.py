@@ -0,0 +1,129 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_data_type(dtype):
+    """
+    get the CoverageJSON NdArray dataType of a NumPy dtype
+
+    :param dtype: `numpy.dtype`
+
+    :returns: `str` of dataType (`float`, `integer` or `string`)
+    """
+
+    if np.issubdtype(dtype, np.floating):
+        return 'float'
+    elif np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.bool_):
+        return 'integer'
+    else:
+        return 'string'
+
+
+def set_data_types(coverage, dtypes):
+    """
+    set the NdArray dataType of the ranges of a CoverageJSON document
+
+    :param coverage: `dict` of CoverageJSON document
+    :param dtypes: `dict` of range names and `numpy.dtype`
+
+    :returns: `dict` of CoverageJSON document
+    """
+
+    for key, dtype in dtypes.items():
+        if key in coverage['ranges']:
+            coverage['ranges'][key]['dataType'] = get_data_type(dtype)
+
+    return coverage
+
+
+def _to_list(values, nodata=None):
+    """
+    helper function to convert a 1-d array of NdArray values to a `list`,
+    with masked, non-finite (NaN) and nodata values as `None`
+
+    :param values: 1-d `numpy.ndarray` or `numpy.ma.MaskedArray`
+    :param nodata: nodata value
+
+    :returns: `list` of values
+    """
+
+    data = np.ma.getdata(values)
+    mask = np.ma.getmaskarray(values)
+
+    if np.issubdtype(data.dtype, np.floating):
+        mask = mask | ~np.isfinite(data)
+    if nodata is not None and not np.isnan(nodata):
+        mask = mask | (data == nodata)
+
+    out = data.tolist()
+
+    # set nulls in place rather than through an object-dtype copy
+    for i in np.flatnonzero(mask).tolist():
+        out[i] = None
+
+    return out
+
+
+def get_values(array, nodata=None):
+    """
+    get the values of an NdArray range, flattened in row-major order.
+    pygeoapi serializes the CoverageJSON `dict` returned by providers, so
+    values are converted to Python objects.
+
+    :param array: `numpy.ndarray` or `numpy.ma.MaskedArray` of values
+    :param nodata: nodata value (encoded as null)
+
+    :returns: `list` of values
+    """
+
+    return _to_list(array.ravel(), nodata)
+
+
+def encode_covjson(coverage, values, nodata=None):
+    """
+    set the NdArray range values of a CoverageJSON document
+
+    :param coverage: `dict` of CoverageJSON document, whose ranges have
+                     no values
+    :param values: `dict` of range names and arrays of values
+    :param nodata: nodata value (encoded as null)
+
+    :returns: `dict` of CoverageJSON document
+    """
+
+    for key, array in values.items():
+        coverage['ranges'][key]['values'] = get_values(array, nodata)
+
+    return coverage
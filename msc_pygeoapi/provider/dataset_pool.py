@@ -0,0 +1,192 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import count
+import logging
+import os
+import threading
+
+import rasterio
+from rasterio.env import set_gdal_config
+
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_DATASET_POOL_SIZE,
+    MSC_PYGEOAPI_GDAL_CACHEMAX,
+    MSC_PYGEOAPI_GDAL_DISABLE_READDIR_ON_OPEN
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# GDAL block cache (in MB, or a percentage of memory) and directory
+# listing on open, applied before any dataset is read
+if MSC_PYGEOAPI_GDAL_CACHEMAX is not None:
+    set_gdal_config('GDAL_CACHEMAX', MSC_PYGEOAPI_GDAL_CACHEMAX)
+if MSC_PYGEOAPI_GDAL_DISABLE_READDIR_ON_OPEN is not None:
+    set_gdal_config('GDAL_DISABLE_READDIR_ON_OPEN',
+                    MSC_PYGEOAPI_GDAL_DISABLE_READDIR_ON_OPEN)
+
+
+class DatasetPool:
+    """
+    Thread-safe pool of open rasterio datasets, keyed by path
+
+    A dataset is only used by one thread at a time: it is checked out of
+    the pool when opened and returned to the pool once done with.  Idle
+    datasets are closed in LRU order beyond the pool size, or once their
+    file is replaced
+    """
+
+    def __init__(self, size=MSC_PYGEOAPI_DATASET_POOL_SIZE):
+        """
+        Initialize object
+
+        :param size: maximum number of idle open datasets (0 to disable)
+
+        :returns: `msc_pygeoapi.provider.dataset_pool.DatasetPool`
+        """
+
+        self.size = size
+        self._idle = OrderedDict()
+        self._tokens = count()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path):
+        """
+        Helper function to identify a version of a file
+
+        :param path: filepath of dataset
+
+        :returns: `tuple` of file inode, size and mtime
+        """
+
+        stat = os.stat(path)
+
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _checkout(self, path):
+        """
+        Helper function to take an idle dataset of an unchanged file out
+        of the pool, or open it
+
+        :param path: filepath of dataset
+
+        :returns: `tuple` of rasterio dataset and file stamp
+        """
+
+        stamp = self._stamp(path)
+        ds = None
+        stale = []
+
+        with self._lock:
+            for token, (path_, stamp_, ds_) in list(self._idle.items()):
+                if path_ != path:
+                    continue
+                # keep the other idle datasets of the file for
+                # concurrent requests, closing only replaced ones
+                del self._idle[token]
+                if stamp_ == stamp:
+                    ds = ds_
+                    break
+                stale.append(ds_)
+
+        for ds_ in stale:
+            LOGGER.debug(f'Closing replaced {path}')
+            ds_.close()
+
+        if ds is None:
+            LOGGER.debug(f'Opening {path}')
+            ds = rasterio.open(path)
+
+        return ds, stamp
+
+    def _checkin(self, path, stamp, ds):
+        """
+        Helper function to return a dataset to the pool
+
+        :param path: filepath of dataset
+        :param stamp: file stamp of dataset
+        :param ds: rasterio dataset
+
+        :returns: `None`
+        """
+
+        if ds.closed:
+            return
+
+        evicted = []
+
+        with self._lock:
+            self._idle[next(self._tokens)] = (path, stamp, ds)
+            while len(self._idle) > self.size:
+                evicted.append(self._idle.popitem(last=False)[1][2])
+
+        for ds_ in evicted:
+            ds_.close()
+
+    @contextmanager
+    def open(self, path):
+        """
+        Open a dataset, reusing an idle open dataset of an unchanged file
+
+        :param path: filepath of dataset
+
+        :returns: context manager of rasterio dataset object
+        """
+
+        if self.size <= 0:
+            with rasterio.open(path) as ds:
+                yield ds
+            return
+
+        ds, stamp = self._checkout(path)
+
+        try:
+            yield ds
+        finally:
+            self._checkin(path, stamp, ds)
+
+    def clear(self):
+        """
+        Close all idle datasets
+
+        :returns: `None`
+        """
+
+        with self._lock:
+            datasets = [ds for _, _, ds in self._idle.values()]
+            self._idle.clear()
+
+        for ds in datasets:
+            ds.close()
+
+
+DATASET_POOL = DatasetPool()
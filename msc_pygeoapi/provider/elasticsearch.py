@@ -29,16 +29,27 @@
 
 from datetime import datetime
 import logging
+import threading
+import time
 
+from elasticsearch import ApiError, TransportError
 from pygeoapi.provider.elasticsearch_ import (
     ElasticsearchProvider,
     ElasticsearchCatalogueProvider
 )
 
+from msc_pygeoapi.env import (
+    MSC_PYGEOAPI_ES_MAPPING_CACHE_TTL,
+    MSC_PYGEOAPI_ES_MAPPING_CACHE_WARM
+)
 from msc_pygeoapi.util import DATETIME_RFC3339_FMT
 
 LOGGER = logging.getLogger(__name__)
 
+# (ES host, index name, time_field) => (expiry, time_field format)
+TIMEFIELD_FORMATS = {}
+TIMEFIELD_FORMATS_LOCK = threading.Lock()
+
 
 class MSCElasticsearchProvider(ElasticsearchProvider):
     """MSC Elasticsearch Provider"""
@@ -54,22 +65,55 @@ class MSCElasticsearchProvider(ElasticsearchProvider):
 
         super().__init__(provider_def)
 
-    def _get_timefield_format(self):
+        if MSC_PYGEOAPI_ES_MAPPING_CACHE_WARM and self.time_field:
+            LOGGER.debug('Warming time_field format cache')
+            self._get_timefield_format()
+
+    def _get_timefield_format(self, refresh=False):
         """
-        Retrieve time_field format from ES index mapping
+        Retrieve time_field format from ES index mapping, cached across
+        provider instances
+
+        :param refresh: whether to bypass the cache
 
         :returns: `str` of time_field format
         """
-        mapping = self.es.indices.get_mapping(index=self.index_name)
-        p = mapping[self.index_name]['mappings']['properties']['properties']
 
-        format_ = p['properties'][self.time_field].get('format')
+        key = (self.es_host, self.index_name, self.time_field)
+        now = time.monotonic()
+
+        with TIMEFIELD_FORMATS_LOCK:
+            entry = TIMEFIELD_FORMATS.get(key)
+        if not refresh and entry is not None and entry[0] > now:
+            LOGGER.debug(f'time_field format (cached): {entry[1]}')
+            return entry[1]
+
+        try:
+            mapping = self.es.indices.get_mapping(index=self.index_name)
+        except (ApiError, TransportError) as err:
+            LOGGER.warning(f'Could not retrieve index mapping: {err}')
+            return None
+
+        # aliases and wildcards resolve to the mappings of their indexes,
+        # keyed by index name: use the latest index defining time_field
+        format_ = None
+        for index_name in sorted(mapping, reverse=True):
+            p = mapping[index_name]['mappings'].get('properties', {})
+            p = p.get('properties', {}).get('properties', {})
+
+            if self.time_field in p:
+                format_ = p[self.time_field].get('format')
+                break
 
         if format_ and '||' in format_:
             format_ = format_.split('||')[0]
 
         LOGGER.debug(f'time_field format: {format_}')
 
+        with TIMEFIELD_FORMATS_LOCK:
+            expiry = now + MSC_PYGEOAPI_ES_MAPPING_CACHE_TTL
+            TIMEFIELD_FORMATS[key] = (expiry, format_)
+
         return format_
 
     def _clamp_datetime(self, datetime_, timefield_format):
@@ -0,0 +1,314 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from bisect import bisect_left, bisect_right
+from fnmatch import fnmatch
+import logging
+import os
+import re
+import threading
+import time
+
+from msc_pygeoapi.env import MSC_PYGEOAPI_FILE_INDEX_TTL
+
+LOGGER = logging.getLogger(__name__)
+
+FILE_INDEXES = {}
+FILE_INDEXES_LOCK = threading.Lock()
+
+
+class FileIndex:
+    """
+    In-memory catalogue of the files of a collection, sorted by time
+
+    Files are found in the directories `depth` levels below `root`
+    matching `pattern`, and their time key (a fixed width datetime string
+    such as YYYYMMDDHH) is extracted with the first group of `key_regex`.
+    Files sharing the same name except for their time key form a series.
+
+    Directories are only listed again when their mtime changes, at most
+    every MSC_PYGEOAPI_FILE_INDEX_TTL seconds (or on `reload`)
+    """
+
+    def __init__(self, root, depth, pattern, key_regex):
+        """
+        Initialize object
+
+        :param root: root directory of the collection
+        :param depth: number of directory levels between root and files
+        :param pattern: `fnmatch` pattern of file names
+        :param key_regex: regular expression of the file name time key
+
+        :returns: `msc_pygeoapi.provider.file_index.FileIndex`
+        """
+
+        self.root = os.path.normpath(str(root))
+        self.depth = depth
+        self.pattern = pattern
+        self.key_regex = re.compile(key_regex)
+
+        self.paths = []
+        self.series = {}
+
+        self._dirs = {}
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def _list_dir(self, path, depth, dirs):
+        """
+        Helper function to list a directory (or reuse its listing if its
+        mtime did not change) and its subdirectories
+
+        :param path: directory path
+        :param depth: number of directory levels between path and files
+        :param dirs: `dict` of directory listings (mtime, depth and
+                     entries) to update
+
+        :returns: `bool` of whether any listing changed
+        """
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return True
+
+        cached = self._dirs.get(path)
+        changed = cached is None or cached[0] != mtime
+
+        if changed:
+            with os.scandir(path) as it:
+                if depth == 0:
+                    names = sorted(entry.path for entry in it
+                                   if fnmatch(entry.name, self.pattern))
+                else:
+                    names = sorted(entry.path for entry in it
+                                   if entry.is_dir())
+            dirs[path] = (mtime, depth, names)
+        else:
+            dirs[path] = cached
+
+        if depth > 0:
+            for subdir in dirs[path][2]:
+                changed |= self._list_dir(subdir, depth - 1, dirs)
+
+        return changed
+
+    def _build(self, dirs):
+        """
+        Helper function to build the sorted paths and series from
+        directory listings
+
+        :param dirs: `dict` of directory listings
+
+        :returns: `None`
+        """
+
+        paths = []
+        series = {}
+
+        for mtime, depth, names in dirs.values():
+            if depth == 0:
+                paths.extend(names)
+
+        paths.sort()
+
+        for path in paths:
+            name = os.path.basename(path)
+            match = self.key_regex.search(name)
+            if match is None:
+                continue
+            start, end = match.span(1)
+            keys, paths_ = series.setdefault(
+                name[:start] + name[end:], ([], []))
+            keys.append(match.group(1))
+            paths_.append(path)
+
+        for name, (keys, paths_) in series.items():
+            order = sorted(range(len(keys)), key=lambda i: keys[i])
+            series[name] = ([keys[i] for i in order],
+                            [paths_[i] for i in order])
+
+        self.paths = paths
+        self.series = series
+
+    def refresh(self, force=False):
+        """
+        Refresh the index from directory mtimes
+
+        :param force: whether to check directories regardless of the
+                      refresh interval
+
+        :returns: `None`
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if (not force and self._checked is not None and
+                    now - self._checked < MSC_PYGEOAPI_FILE_INDEX_TTL):
+                return
+
+            dirs = {}
+            changed = self._list_dir(self.root, self.depth, dirs)
+            changed |= dirs.keys() != self._dirs.keys()
+            self._dirs = dirs
+            self._checked = now
+
+            if changed:
+                LOGGER.debug(f'Rebuilding file index of {self.root}')
+                self._build(dirs)
+
+    def reload(self):
+        """
+        Reload the index, regardless of the refresh interval
+
+        :returns: `None`
+        """
+
+        self.refresh(force=True)
+
+    def files(self):
+        """
+        Get all files of the index
+
+        :returns: sorted `list` of file paths
+        """
+
+        self.refresh()
+        return list(self.paths)
+
+    @staticmethod
+    def _find(series, key):
+        """
+        Helper function to find the first file (in path order) of a
+        time key
+
+        :param series: `dict` of series (snapshot of `self.series`)
+        :param key: time key
+
+        :returns: `tuple` of path, series name and index in the series,
+                  or `None` if not found
+        """
+
+        found = []
+
+        for name, (keys, paths) in series.items():
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                found.append((paths[i], name, i))
+
+        if not found:
+            return None
+
+        return min(found)
+
+    def find(self, key):
+        """
+        Get the file of a time key
+
+        :param key: time key
+
+        :returns: file path
+
+        :raises: `IndexError` if no file matches the time key
+        """
+
+        self.refresh()
+
+        # the index may be rebuilt concurrently: read a single snapshot
+        found = self._find(self.series, key)
+        if found is None:
+            raise IndexError(f'No file found for {key}')
+
+        return found[0]
+
+    def range(self, begin, end):
+        """
+        Get the files between two time keys (inclusive), of the series
+        of the first file of the begin key
+
+        :param begin: begin time key
+        :param end: end time key
+
+        :returns: `list` of file paths sorted by time
+
+        :raises: `IndexError` if no file matches the begin or end key
+        """
+
+        self.refresh()
+
+        # the index may be rebuilt concurrently: read a single snapshot
+        series = self.series
+
+        found = self._find(series, begin)
+        if found is None:
+            raise IndexError(f'No file found for {begin}')
+
+        _, name, i = found
+        keys, paths = series[name]
+
+        j = bisect_right(keys, end)
+        if j == 0 or keys[j - 1] != end:
+            raise IndexError(f'No file found for {end}')
+
+        return paths[i:j]
+
+
+def get_file_index(root, depth, pattern, key_regex):
+    """
+    Get the file index of a collection, shared between providers
+
+    :param root: root directory of the collection
+    :param depth: number of directory levels between root and files
+    :param pattern: `fnmatch` pattern of file names
+    :param key_regex: regular expression of the file name time key
+
+    :returns: `msc_pygeoapi.provider.file_index.FileIndex`
+    """
+
+    key = (str(root), depth, pattern, key_regex)
+
+    with FILE_INDEXES_LOCK:
+        if key not in FILE_INDEXES:
+            FILE_INDEXES[key] = FileIndex(root, depth, pattern, key_regex)
+
+    return FILE_INDEXES[key]
+
+
+def reload_file_indexes():
+    """
+    Reload all file indexes, e.g. once new files are published
+
+    :returns: `None`
+    """
+
+    with FILE_INDEXES_LOCK:
+        indexes = list(FILE_INDEXES.values())
+
+    for index in indexes:
+        index.reload()
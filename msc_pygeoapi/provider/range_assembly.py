@@ -0,0 +1,192 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import numpy as np
+from rasterio.crs import CRS
+from rasterio.mask import raster_geometry_mask
+import xarray
+
+from msc_pygeoapi.env import (MSC_PYGEOAPI_COVERAGE_RANGE_MAX_VALUES,
+                              MSC_PYGEOAPI_COVERAGE_RANGE_WORKERS)
+from msc_pygeoapi.provider.dataset_pool import DATASET_POOL
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_range_window(dataset, shapes=None):
+    """
+    Helper function to get the window and mask of a spatial subset,
+    shared by all the timesteps of a range
+
+    :param dataset: rasterio DatasetReader object
+    :param shapes: list of GeoJSON geometries (raster CRS), or `None`
+                   for the whole raster
+
+    :returns: `tuple` of shape mask (`None` for the whole raster),
+              `affine.Affine` and `rasterio.windows.Window` of the subset
+
+    :raises: `ValueError` if the shapes are outside of the raster
+    """
+
+    if not shapes:
+        return None, dataset.transform, None
+
+    return raster_geometry_mask(dataset, shapes, crop=True)
+
+
+def read_range(dataset, files, band=1, window=None, shape_mask=None,
+               crs=None, transform=None,
+               workers=MSC_PYGEOAPI_COVERAGE_RANGE_WORKERS,
+               max_values=MSC_PYGEOAPI_COVERAGE_RANGE_MAX_VALUES):
+    """
+    Read the same window of a list of files (one per timestep)
+    concurrently, into a single preallocated array
+
+    :param dataset: rasterio DatasetReader object (of the same grid as
+                    the files)
+    :param files: list of files
+    :param band: band number
+    :param window: `rasterio.windows.Window` to read (`None` for the
+                   whole raster)
+    :param shape_mask: `numpy.ndarray` of pixels outside of the subset
+    :param crs: CRS to set on each dataset (if not read from the file)
+    :param transform: `affine.Affine` to set on each dataset (if not
+                      read from the file)
+    :param workers: number of threads reading files
+    :param max_values: maximum number of values (timesteps x pixels)
+                       of the range
+
+    :returns: `numpy.ma.MaskedArray` of values (time, y, x)
+
+    :raises: `ValueError` if the range has more than `max_values` values
+    """
+
+    if window is None:
+        shape = (len(files), dataset.height, dataset.width)
+    else:
+        shape = (len(files), window.height, window.width)
+
+    size = int(np.prod(shape))
+    if size > max_values:
+        raise ValueError(
+            f'Range of {size} values ({shape[0]} timesteps of '
+            f'{shape[1]}x{shape[2]} pixels) exceeds the limit of '
+            f'{max_values} values, reduce the time or spatial subset')
+
+    LOGGER.debug(f'Allocating array of shape {shape}')
+    data = np.empty(shape, dtype=dataset.dtypes[band - 1])
+    mask = np.zeros(shape, dtype=bool)
+
+    def read(index):
+        with DATASET_POOL.open(files[index]) as src:
+            if crs is not None:
+                src._crs = crs
+            if transform is not None:
+                src._transform = transform
+
+            src.read(band, window=window, out=data[index])
+            nodata = src.nodatavals[band - 1]
+
+        if nodata is not None:
+            mask[index] = data[index] == nodata
+        if shape_mask is not None:
+            mask[index] |= shape_mask
+
+    LOGGER.debug(f'Reading {len(files)} timesteps')
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        list(executor.map(read, range(len(files))))
+
+    return np.ma.MaskedArray(data, mask)
+
+
+def get_range_dataset(name, values, times, transform, crs, attrs={}):
+    """
+    Get the timesteps of a range as an xarray Dataset, with time, y and
+    x coordinates
+
+    :param name: variable name
+    :param values: `numpy.ma.MaskedArray` of values (time, y, x)
+    :param times: list of ISO 8601 times
+    :param transform: `affine.Affine` of the values
+    :param crs: CRS of the values
+    :param attrs: `dict` of variable attributes
+
+    :returns: `xarray.Dataset` of range
+    """
+
+    _, height, width = values.shape
+
+    attrs = {key: value for key, value in attrs.items() if value}
+    attrs['grid_mapping'] = 'crs'
+
+    x = transform.c + (np.arange(width) + 0.5) * transform.a
+    y = transform.f + (np.arange(height) + 0.5) * transform.e
+
+    return xarray.Dataset(
+        {
+            name: (
+                ['time', 'y', 'x'],
+                values.astype('float32').filled(np.nan),
+                attrs
+            ),
+            'crs': ((), 0, {
+                'crs_wkt': CRS.from_user_input(crs).to_wkt()
+            })
+        },
+        coords={
+            'time': np.array(
+                [np.datetime64(t.rstrip('Z')) for t in times],
+                dtype='datetime64[ns]'),
+            'y': ('y', y),
+            'x': ('x', x)
+        }
+    )
+
+
+def encode_netcdf(name, values, times, transform, crs, attrs={}):
+    """
+    Encode the timesteps of a range as NetCDF
+
+    :param name: variable name
+    :param values: `numpy.ma.MaskedArray` of values (time, y, x)
+    :param times: list of ISO 8601 times
+    :param transform: `affine.Affine` of the values
+    :param crs: CRS of the values
+    :param attrs: `dict` of variable attributes
+
+    :returns: `bytes` of NetCDF file
+    """
+
+    data = get_range_dataset(name, values, times, transform, crs, attrs)
+
+    LOGGER.debug('Returning data in NetCDF format')
+    return data.to_netcdf()
@@ -31,11 +31,10 @@
 # =================================================================
 
 from datetime import datetime
-import glob
 import logging
-import os
 from parse import search
 import pathlib
+import re
 
 import rasterio
 from rasterio.crs import CRS
@@ -45,8 +44,21 @@ import rasterio.mask
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError)
 
+from msc_pygeoapi.provider.coverage_metadata import (
+    LazyDataset, load_coverage_metadata)
+from msc_pygeoapi.provider.covjson import encode_covjson
+from msc_pygeoapi.provider.dataset_pool import DATASET_POOL
+from msc_pygeoapi.provider.file_index import get_file_index
+from msc_pygeoapi.provider.range_assembly import (
+    encode_netcdf, get_range_window, read_range)
+from msc_pygeoapi.provider.window_query import (
+    gen_covjson_series, get_window)
+
 LOGGER = logging.getLogger(__name__)
 
+# time key of RDPA file names
+FILE_KEY_REGEX = r'_(\d{10})_\d{3}\.grib2$'
+
 
 # TODO: use RasterioProvider once pyproj is updated on bionic
 class RDPAProvider(BaseProvider):
@@ -62,19 +74,43 @@ class RDPAProvider(BaseProvider):
         super().__init__(provider_def)
 
         try:
+            self.file_index = None
             self.file_list = []
 
             pattern = 'CMC_RDPA_{}cutoff'
             self.var = search(pattern, self.data)[0]
-            self.get_file_list(self.var)
 
-            if '*' in self.data:
-                self.data = self.file_list[-1]
+            # precomputed metadata, see msc-pygeoapi metadata
+            # coverage-metadata generate
+            metadata = load_coverage_metadata(provider_def)
+
+            if metadata is not None:
+                if '*' in self.data:
+                    # realtime data: the latest file and the time extent
+                    # change between sidecar generations, so keep
+                    # resolving them from the file index
+                    self.get_file_list(self.var)
+                    self.data = self.file_list[-1]
+                    self._domainset = None
+                else:
+                    self.data = metadata['data']
+                    self._domainset = metadata['domainset']
+                self._rangetype = metadata['rangetype']
+                self._data = LazyDataset(self.data)
+                self._coverage_properties = metadata['coverage_properties']
+                self.axes = self._coverage_properties['axes']
+            else:
+                self._domainset = None
+                self._rangetype = None
+                self.get_file_list(self.var)
 
-            self._data = rasterio.open(self.data)
-            self._coverage_properties = self._get_coverage_properties()
-            self.axes = self._coverage_properties['axes']
-            self.axes.append('time')
+                if '*' in self.data:
+                    self.data = self.file_list[-1]
+
+                self._data = rasterio.open(self.data)
+                self._coverage_properties = self._get_coverage_properties()
+                self.axes = self._coverage_properties['axes']
+                self.axes.append('time')
 
             # Rasterio does not read the crs and transform function
             # properly from the file, we have to set them manually
@@ -109,6 +145,9 @@ class RDPAProvider(BaseProvider):
         :returns: CIS JSON object of domainset metadata
         """
 
+        if self._domainset is not None:
+            return self._domainset
+
         domainset = {
             'type': 'DomainSet',
             'generalGrid': {
@@ -210,6 +249,9 @@ class RDPAProvider(BaseProvider):
         :returns: CIS JSON object of rangetype metadata
         """
 
+        if self._rangetype is not None:
+            return self._rangetype
+
         rangetype = {
             'type': 'DataRecord',
             'field': []
@@ -345,7 +387,9 @@ class RDPAProvider(BaseProvider):
                 try:
                     period = datetime.strptime(
                         datetime_, '%Y-%m-%dT%HZ').strftime('%Y%m%d%H')
-                    self.data = [v for v in self.file_list if period in v][0]
+                    if self.file_index is None:
+                        self.get_file_list(self.var)
+                    self.data = self.file_index.find(period)
                 except IndexError as err:
                     msg = 'Datetime value invalid or out of time domain'
                     LOGGER.error(err)
@@ -359,38 +403,43 @@ class RDPAProvider(BaseProvider):
             LOGGER.debug('Selecting bands')
             args['indexes'] = list(map(int, bands))
 
-        with rasterio.open(self.data) as _data:
+        with DATASET_POOL.open(self.data) as _data:
             LOGGER.debug('Creating output coverage metadata')
             _data._crs = self.crs
             _data._transform = self.transform
 
-            out_meta = _data.meta
-
-            if self.options is not None:
-                LOGGER.debug('Adding dataset options')
-                for key, value in self.options.items():
-                    out_meta[key] = value
+            files = date_file_list or [self.data]
+            band = (args['indexes'] or [1])[0]
 
-            if shapes:  # spatial subset
+            # date ranges of a point or small area are read from a window
+            # of each file, in the same layout as larger areas
+            if shapes and format_ == 'json' and date_file_list:
+                xs, ys = zip(*shapes[0]['coordinates'][0])
                 try:
-                    LOGGER.debug('Clipping data with bbox')
-                    out_image, out_transform = rasterio.mask.mask(
-                        _data,
-                        filled=False,
-                        shapes=shapes,
-                        crop=True,
-                        indexes=args['indexes'])
+                    window = get_window(_data.transform, _data.width,
+                                        _data.height, xs, ys)
                 except ValueError as err:
                     LOGGER.error(err)
                     raise ProviderQueryError(err)
 
-                out_meta.update({'driver': self.native_format,
-                                 'height': out_image.shape[1],
-                                 'width': out_image.shape[2],
-                                 'transform': out_transform})
-            else:  # no spatial subset
-                LOGGER.debug('Creating data in memory with band selection')
-                out_image = _data.read(indexes=args['indexes'])
+                if window is not None:
+                    LOGGER.debug('Reading values of point or small area')
+                    if not bbox:
+                        bbox = [subsets[x][0], subsets[y][0],
+                                subsets[x][1], subsets[y][1]]
+                    values = read_range(_data, files, band, window,
+                                        crs=self.crs,
+                                        transform=self.transform)
+                    return self.gen_covjson_series(
+                        _data, bbox, self.get_file_times(files), values,
+                        band)
+
+            out_meta = _data.meta
+
+            if self.options is not None:
+                LOGGER.debug('Adding dataset options')
+                for key, value in self.options.items():
+                    out_meta[key] = value
 
             if bbox:
                 out_meta['bbox'] = [bbox[0], bbox[1], bbox[2], bbox[3]]
@@ -412,72 +461,94 @@ class RDPAProvider(BaseProvider):
             self.filename = self.data.split('/')[-1].replace(
                 '*', '')
 
-            # CovJSON output does not support multiple bands yet
-            # Only the first timestep is returned
-            if format_ == 'json':
-
-                if date_file_list:
-                    err = 'Date range not yet supported for CovJSON output'
+            if date_file_list:
+                try:
+                    shape_mask, out_transform, window = get_range_window(
+                        _data, shapes)
+                    values = read_range(_data, files, band, window,
+                                        shape_mask, self.crs, self.transform)
+                except ValueError as err:
                     LOGGER.error(err)
                     raise ProviderQueryError(err)
-                else:
+
+                times = self.get_file_times(files)
+
+                if format_ == 'json':
                     LOGGER.debug('Creating output in CoverageJSON')
-                    out_meta['bands'] = [1]
-                    return self.gen_covjson(out_meta, out_image)
+                    return self.gen_covjson_series(
+                        _data, out_meta['bbox'], times, values, band)
+                elif format_.lower() == 'netcdf':
+                    return encode_netcdf(
+                        self.var, values, times, out_transform, _data.crs,
+                        {'units': _data.units[band - 1]})
+
+                out_meta.update(count=len(files))
+                if shapes:
+                    out_meta.update({'driver': self.native_format,
+                                     'height': values.shape[1],
+                                     'width': values.shape[2],
+                                     'transform': out_transform})
+
+                LOGGER.debug('Serializing data in memory')
+                with MemoryFile() as memfile:
+                    with memfile.open(**out_meta, nbits=nbits) as dest:
+                        dest.write(values)
+
+                    # return data in native format
+                    LOGGER.debug('Returning data in native format')
+                    return memfile.read()
+
+            if shapes:  # spatial subset
+                try:
+                    LOGGER.debug('Clipping data with bbox')
+                    out_image, out_transform = rasterio.mask.mask(
+                        _data,
+                        filled=False,
+                        shapes=shapes,
+                        crop=True,
+                        indexes=args['indexes'])
+                except ValueError as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError(err)
+
+                out_meta.update({'driver': self.native_format,
+                                 'height': out_image.shape[1],
+                                 'width': out_image.shape[2],
+                                 'transform': out_transform})
+            else:  # no spatial subset
+                LOGGER.debug('Creating data in memory with band selection')
+                out_image = _data.read(indexes=args['indexes'])
+
+            # CovJSON output does not support multiple bands yet
+            if format_ == 'json':
+                LOGGER.debug('Creating output in CoverageJSON')
+                out_meta['bands'] = [1]
+                return self.gen_covjson(out_meta, out_image, _data)
             else:
-                if date_file_list:
-                    out_meta.update(count=len(date_file_list))
-
-                    LOGGER.debug('Serializing data in memory')
-                    with MemoryFile() as memfile:
-                        with memfile.open(**out_meta, nbits=nbits) as dest:
-                            for id, layer in enumerate(date_file_list,
-                                                       start=1):
-                                with rasterio.open(layer) as src1:
-                                    src1._crs = self.crs
-                                    src1._transform = self.transform
-                                    if shapes:  # spatial subset
-                                        try:
-                                            LOGGER.debug('Clipping data')
-                                            out_image, out_transform = \
-                                                rasterio.mask.mask(
-                                                    src1,
-                                                    filled=False,
-                                                    shapes=shapes,
-                                                    crop=True,
-                                                    indexes=args['indexes'])
-                                        except ValueError as err:
-                                            LOGGER.error(err)
-                                            raise ProviderQueryError(err)
-                                    else:
-                                        out_image = src1.read(
-                                            indexes=args['indexes'])
-
-                                    dest.write_band(id, out_image[0])
-
-                        # return data in native format
-                        LOGGER.debug('Returning data in native format')
-                        return memfile.read()
-                else:
-                    LOGGER.debug('Serializing data in memory')
-                    out_meta.update(count=len(args['indexes']))
-                    with MemoryFile() as memfile:
-                        with memfile.open(**out_meta, nbits=nbits) as dest:
-                            dest.write(out_image)
+                LOGGER.debug('Serializing data in memory')
+                out_meta.update(count=len(args['indexes']))
+                with MemoryFile() as memfile:
+                    with memfile.open(**out_meta, nbits=nbits) as dest:
+                        dest.write(out_image)
 
-                        # return data in native format
-                        LOGGER.debug('Returning data in native format')
-                        return memfile.read()
+                    # return data in native format
+                    LOGGER.debug('Returning data in native format')
+                    return memfile.read()
 
     # TODO: remove once pyproj is updated on bionic
-    def gen_covjson(self, metadata, data):
+    def gen_covjson(self, metadata, data, dataset=None):
         """
         Generate coverage as CoverageJSON representation
         :param metadata: coverage metadata
         :param data: rasterio DatasetReader object
+        :param dataset: opened rasterio DatasetReader object of the
+                        coverage (default: the provider dataset)
         :returns: dict of CoverageJSON representation
         """
 
+        if dataset is None:
+            dataset = self._data
+
         LOGGER.debug('Creating CoverageJSON domain')
         minx, miny, maxx, maxy = metadata['bbox']
 
@@ -511,14 +582,14 @@ class RDPAProvider(BaseProvider):
         }
 
         if metadata['bands'] is None:  # all bands
-            bands_select = range(1, len(self._data.dtypes) + 1)
+            bands_select = range(1, len(dataset.dtypes) + 1)
         else:
             bands_select = metadata['bands']
 
         LOGGER.debug(f'bands selected: {bands_select}')
         for bs in bands_select:
             pm = _get_parameter_metadata(
-                self._data.profile['driver'], self._data.tags(bs))
+                dataset.profile['driver'], dataset.tags(bs))
 
             parameter = {
                 'type': 'Parameter',
@@ -538,6 +609,7 @@ class RDPAProvider(BaseProvider):
 
             cj['parameters'][pm['id']] = parameter
 
+        values = {}
         try:
             for key in cj['parameters'].keys():
                 cj['ranges'][key] = {
@@ -548,12 +620,52 @@ class RDPAProvider(BaseProvider):
                     'shape': [metadata['height'], metadata['width']],
                 }
                 # TODO: deal with multi-band value output
-                cj['ranges'][key]['values'] = data.flatten().tolist()
+                values[key] = data
         except IndexError as err:
             LOGGER.warning(err)
             raise ProviderQueryError('Invalid query parameter')
 
-        return cj
+        return encode_covjson(cj, values, metadata.get('nodata'))
+
+    def gen_covjson_series(self, dataset, bbox, times, values, band):
+        """
+        Generate the timesteps of a coverage as CoverageJSON
+        :param dataset: rasterio DatasetReader object
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param times: list of times (one per timestep)
+        :param values: `numpy.ma.MaskedArray` of values (time, y, x)
+        :param band: band number
+        :returns: dict of CoverageJSON representation
+        """
+
+        pm = _get_parameter_metadata(
+            dataset.profile['driver'], dataset.tags(band))
+
+        parameters = {
+            pm['id']: {
+                'type': 'Parameter',
+                'description': {
+                    'en': pm['description']
+                },
+                'unit': {
+                    'symbol': pm['unit_label']
+                },
+                'observedProperty': {
+                    'id': pm['observed_property_id'],
+                    'label': {
+                        'en': pm['observed_property_name']
+                    }
+                }
+            }
+        }
+
+        referencing = {
+            'type': self._coverage_properties['crs_type'],
+            'id': 'http://www.opengis.net/def/crs/OGC/1.3/CRS84'
+        }
+
+        return gen_covjson_series(parameters, referencing, bbox, times,
+                                  values, dataset.nodata)
 
     # TODO: remove once pyproj is updated on bionic
     def _get_coverage_properties(self):
@@ -608,14 +720,10 @@ class RDPAProvider(BaseProvider):
         """
 
         try:
-            file_path = pathlib.Path(self.data).parent.resolve()
-
-            file_path = str(file_path).split('/')
-            file_path[-1] = '*'
-            file_path[-2] = '*'
-
-            file_path_ = glob.glob(os.path.join('/'.join(file_path), f'*{variable}*'))  # noqa
-            file_path_.sort()
+            # files are organized in <root>/<year>/<month> directories
+            root = pathlib.Path(self.data).parent.resolve().parent.parent
+            self.file_index = get_file_index(
+                root, 2, f'*{variable}*', FILE_KEY_REGEX)
 
             if datetime_:
                 begin, end = datetime_.split('/')
@@ -625,16 +733,10 @@ class RDPAProvider(BaseProvider):
                 end = datetime.strptime(end, '%Y-%m-%dT%HZ').\
                     strftime('%Y%m%d%H')
 
-                begin_file_idx = [file_path_.index(i) for i
-                                  in file_path_ if begin in i]
-                end_file_idx = [file_path_.index(i) for i
-                                in file_path_ if end in i]
-
-                self.file_list = file_path_[
-                    begin_file_idx[0]:end_file_idx[0] + 1]
+                self.file_list = self.file_index.range(begin, end)
                 return True
             else:
-                self.file_list = file_path_
+                self.file_list = self.file_index.files()
                 return True
 
         except ValueError as err:
@@ -658,6 +760,21 @@ class RDPAProvider(BaseProvider):
 
         return [begin, end]
 
+    def get_file_times(self, files):
+        """
+        Get the time of each file from file name
+
+        :param files: list of files
+
+        :returns: list of times as string
+        """
+
+        return [
+            datetime.strptime(re.search(FILE_KEY_REGEX, file_).group(1),
+                              '%Y%m%d%H').strftime('%Y-%m-%dT%H:%M:%SZ')
+            for file_ in files
+        ]
+
 
 # TODO: remove once pyproj is updated on bionic
 def _get_parameter_metadata(driver, band):
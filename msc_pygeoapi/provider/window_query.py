@@ -0,0 +1,132 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+import math
+
+from rasterio.windows import Window
+
+from msc_pygeoapi.env import MSC_PYGEOAPI_COVERAGE_WINDOW_MAX_PIXELS
+from msc_pygeoapi.provider.covjson import encode_covjson
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_window(transform, width, height, xs, ys,
+               max_pixels=MSC_PYGEOAPI_COVERAGE_WINDOW_MAX_PIXELS):
+    """
+    Helper function to get the pixel window of a point or small area,
+    directly from the raster affine transform
+
+    :param transform: `affine.Affine` of raster
+    :param width: raster width
+    :param height: raster height
+    :param xs: x coordinates of the area (raster CRS)
+    :param ys: y coordinates of the area (raster CRS)
+    :param max_pixels: maximum number of pixels of a small area
+
+    :returns: `rasterio.windows.Window`, or `None` if the area is larger
+              than max_pixels
+
+    :raises: `ValueError` if the area is outside of the raster
+    """
+
+    cols, rows = zip(*[~transform * (x, y) for x, y in zip(xs, ys)])
+
+    col_off = max(math.floor(min(cols)), 0)
+    row_off = max(math.floor(min(rows)), 0)
+    col_end = min(max(math.ceil(max(cols)), math.floor(min(cols)) + 1),
+                  width)
+    row_end = min(max(math.ceil(max(rows)), math.floor(min(rows)) + 1),
+                  height)
+
+    if col_off >= col_end or row_off >= row_end:
+        raise ValueError('Input shapes do not overlap raster.')
+
+    if (col_end - col_off) * (row_end - row_off) > max_pixels:
+        return None
+
+    return Window(col_off, row_off, col_end - col_off, row_end - row_off)
+
+
+def gen_covjson_series(parameters, referencing, bbox, times, values,
+                       nodata=None):
+    """
+    Generate the timesteps of a coverage as CoverageJSON, as a grid
+    with a time axis whatever the size of the area
+
+    :param parameters: `dict` of CoverageJSON parameters
+    :param referencing: `dict` of horizontal CRS (type and id)
+    :param bbox: bounding box [minx,miny,maxx,maxy]
+    :param times: list of ISO 8601 times
+    :param values: `numpy.ndarray` of values (time, y, x)
+    :param nodata: nodata value
+
+    :returns: dict of CoverageJSON representation
+    """
+
+    minx, miny, maxx, maxy = bbox
+    _, height, width = values.shape
+
+    cj = {
+        'type': 'Coverage',
+        'domain': {
+            'type': 'Domain',
+            'domainType': 'Grid',
+            'axes': {
+                'x': {'start': minx, 'stop': maxx, 'num': width},
+                'y': {'start': maxy, 'stop': miny, 'num': height},
+                't': {'values': times}
+            },
+            'referencing': [{
+                'coordinates': ['x', 'y'],
+                'system': referencing
+            }, {
+                'coordinates': ['t'],
+                'system': {
+                    'type': 'TemporalRS',
+                    'calendar': 'Gregorian'
+                }
+            }]
+        },
+        'parameters': parameters,
+        'ranges': {}
+    }
+
+    ranges = {}
+    for key in parameters.keys():
+        cj['ranges'][key] = {
+            'type': 'NdArray',
+            'dataType': 'float',
+            'axisNames': ['t', 'y', 'x'],
+            'shape': [len(times), height, width]
+        }
+        ranges[key] = values
+
+    return encode_covjson(cj, ranges, nodata)
@@ -172,7 +172,8 @@ def check_es_indexes_to_delete(
     return to_delete
 
 
-def configure_es_connection(es, username, password, ignore_certs=False):
+def configure_es_connection(es, username, password, ignore_certs=False,
+                            bulk_workers=None):
     """
     helper function to create an ES connection configuration dictionnary with
     the relevant params passed via CLI.
@@ -182,6 +183,8 @@ def configure_es_connection(es, username, password, ignore_certs=False):
     :param password: `str` ES password for authentication
     :param ignore_certs: `bool` indicates whether to ignore certs when
                          connecting. Defaults to False.
+    :param bulk_workers: `int` number of concurrent in-flight bulk requests.
+                         Defaults to None (MSC_PYGEOAPI_ES_BULK_WORKERS).
 
     :returns: `dict` containing ES connection configuration
     """
@@ -195,4 +198,7 @@ def configure_es_connection(es, username, password, ignore_certs=False):
     # negate ignore_certs CLI flag value to get verify_certs value
     conn_config['verify_certs'] = not ignore_certs
 
+    if bulk_workers is not None:
+        conn_config['bulk_workers'] = bulk_workers
+
     return conn_config
@@ -0,0 +1,120 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import pytest
+
+from msc_pygeoapi.loader.checkpoint import Checkpoint
+
+
+def load(checkpoint, keys, fail_at=None):
+    """load one document per key, acknowledging each action"""
+
+    actions = ({'_id': key, 'key': key} for key in keys)
+
+    for action in checkpoint.track(actions, key=lambda a: a['key']):
+        checkpoint.ack(action['key'] != fail_at, {'index': action})
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return str(tmp_path / 'checkpoint.json')
+
+
+def test_loader_checkpoint_resume(filepath):
+    checkpoint = Checkpoint('test', meta={'date': '2024'},
+                            filepath=filepath)
+    assert not checkpoint.start('daily', [('A', 'C'), ('D', 'F')])
+
+    load(checkpoint, ['A', 'B', 'C', 'D', 'E'], fail_at='E')
+    assert not checkpoint.finish()
+
+    checkpoint = Checkpoint('test', resume=True, meta={'date': '2025'},
+                            filepath=filepath)
+    assert checkpoint.meta == {'date': '2024'}
+    assert not checkpoint.is_complete('daily')
+    assert checkpoint.start('daily')
+
+    # the last key of a range is only done once its range is finished
+    assert checkpoint.is_done('B')
+    assert not checkpoint.is_done('C')
+    assert not checkpoint.is_done('D')
+    assert checkpoint.get_ranges(list('ABCDEF')) == [('C', 'C'), ('D', 'F')]
+
+    load(checkpoint, ['C', 'D', 'E', 'F'])
+    assert checkpoint.finish()
+
+    checkpoint = Checkpoint('test', resume=True, filepath=filepath)
+    assert checkpoint.is_complete('daily')
+
+
+def test_loader_checkpoint_documents(filepath):
+    checkpoint = Checkpoint('test', filepath=filepath)
+    checkpoint.start('monthly')
+
+    actions = [{'_id': i} for i in range(5)]
+
+    package = checkpoint.track(iter(actions))
+    for _ in range(3):
+        action = next(package)
+        checkpoint.ack(True, {'index': action})
+    checkpoint.save(force=True)
+
+    checkpoint = Checkpoint('test', resume=True, filepath=filepath)
+    assert checkpoint.start('monthly')
+
+    # without a key function, acknowledged actions are skipped
+    assert list(checkpoint.track(iter(actions))) == actions[3:]
+
+
+def test_loader_checkpoint_mismatch(filepath):
+    checkpoint = Checkpoint('test', filepath=filepath)
+    checkpoint.start('daily')
+
+    package = checkpoint.track(({'_id': key} for key in 'AB'),
+                               key=lambda a: a['_id'])
+    list(package)
+
+    # a result reported out of order stops the checkpoint
+    checkpoint.ack(True, {'index': {'_id': 'B'}})
+
+    assert checkpoint.failed
+    assert not checkpoint.finish()
+
+
+def test_loader_checkpoint_new(filepath):
+    checkpoint = Checkpoint('test', resume=True, filepath=filepath)
+
+    assert not checkpoint.start('daily')
+    assert checkpoint.get_last_key() is None
+
+    checkpoint.set_done('B')
+
+    assert checkpoint.get_last_key() == 'B'
+    assert checkpoint.is_done('A')
+    assert not checkpoint.is_done('C')
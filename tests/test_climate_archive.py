@@ -0,0 +1,101 @@
+# =================================================================
+#
+# Author: Thinesh Sornalingam <thinesh.sornalingam@canada.ca>,
+#         Robert Westhaver <robert.westhaver.eccc@gccollaboration.ca>,
+#         Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2020 Thinesh Sornalingam
+# Copyright (c) 2020 Robert Westhaver
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+
+import threading
+
+import pytest
+
+from msc_pygeoapi.loader.climate_archive import ClimateArchiveLoader
+
+
+class FakeConnection:
+    def close(self):
+        pass
+
+
+@pytest.fixture()
+def loader():
+    loader = ClimateArchiveLoader.__new__(ClimateArchiveLoader)
+    loader.connect_db = lambda: (FakeConnection(), None)
+
+    def fetch_station_rows(cur, table, stn_range, where, params):
+        for i in range(100):
+            if stn_range == (3, 4) and i == 2:
+                raise RuntimeError('ORA-03113: end-of-file on channel')
+            yield ['STN_ID'], [(stn_range[0],)]
+
+    loader.fetch_station_rows = fetch_station_rows
+
+    return loader
+
+
+def consume(generator, stop_after=None):
+    """consume a generator in a thread, returning whether it finished"""
+
+    result = {}
+
+    def run():
+        try:
+            for i, batch in enumerate(generator):
+                if i == stop_after:
+                    generator.close()
+                    break
+        except Exception as err:
+            result['error'] = err
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    return not thread.is_alive(), result.get('error')
+
+
+def test_loader_partitioned_rows_error(loader):
+    """Test a failing partition stops the other partitions"""
+
+    rows = loader.fetch_partitioned_rows(
+        'STATION_DATA', {}, stn_ranges=[(1, 2), (3, 4), (5, 6)])
+
+    finished, error = consume(rows)
+
+    assert finished
+    assert isinstance(error, RuntimeError)
+
+
+def test_loader_partitioned_rows_closed(loader):
+    """Test closing the generator early stops the partitions"""
+
+    rows = loader.fetch_partitioned_rows(
+        'STATION_DATA', {}, stn_ranges=[(1, 2), (5, 6)])
+
+    finished, error = consume(rows, stop_after=1)
+
+    assert finished
+    assert error is None
@@ -0,0 +1,69 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import numpy as np
+
+from msc_pygeoapi.provider.covjson import (encode_covjson, get_data_type,
+                                           set_data_types)
+
+
+def test_covjson_data_type():
+    assert get_data_type(np.dtype('float32')) == 'float'
+    assert get_data_type(np.dtype('float64')) == 'float'
+    assert get_data_type(np.dtype('int16')) == 'integer'
+    assert get_data_type(np.dtype('uint8')) == 'integer'
+    assert get_data_type(np.dtype('U8')) == 'string'
+
+
+def test_covjson_set_data_types():
+    coverage = {'ranges': {'tas': {'dataType': 'float32'}}}
+
+    cj = set_data_types(coverage, {'tas': np.dtype('float32'),
+                                   'pr': np.dtype('float64')})
+
+    assert cj['ranges'] == {'tas': {'dataType': 'float'}}
+
+
+def test_covjson_encode_nulls():
+    values = np.ma.masked_array(
+        [[1.5, np.nan], [-9999., 2.]], mask=[[False, False], [False, True]])
+    coverage = {'type': 'Coverage', 'ranges': {'p': {'type': 'NdArray'}}}
+
+    cj = encode_covjson(coverage, {'p': values}, nodata=-9999.)
+
+    assert cj['ranges']['p']['values'] == [1.5, None, None, None]
+    assert isinstance(cj['ranges']['p']['values'][0], float)
+
+
+def test_covjson_encode_integer():
+    coverage = {'type': 'Coverage', 'ranges': {'p': {'type': 'NdArray'}}}
+
+    cj = encode_covjson(coverage, {'p': np.arange(4, dtype='int16')})
+
+    assert cj['ranges']['p']['values'] == [0, 1, 2, 3]
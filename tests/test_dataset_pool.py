@@ -0,0 +1,97 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import os
+
+import numpy as np
+import pytest
+import rasterio
+
+from msc_pygeoapi.provider.dataset_pool import DatasetPool
+
+
+def write_raster(path, value):
+    with rasterio.open(path, 'w', driver='GTiff', width=2, height=2,
+                       count=1, dtype='float32') as ds:
+        ds.write(np.full((1, 2, 2), value, dtype='float32'))
+
+
+@pytest.fixture
+def raster(tmp_path):
+    path = str(tmp_path / 'raster.tif')
+    write_raster(path, 1)
+
+    return path
+
+
+def test_dataset_pool_reuse(raster):
+    pool = DatasetPool(size=4)
+
+    with pool.open(raster) as ds1:
+        with pool.open(raster) as ds2:
+            assert ds1 is not ds2
+
+    with pool.open(raster) as ds3:
+        assert ds3 in (ds1, ds2)
+        with pool.open(raster) as ds4:
+            assert ds4 in (ds1, ds2)
+            assert ds4 is not ds3
+
+    assert not ds1.closed and not ds2.closed
+
+    pool.clear()
+
+    assert ds1.closed and ds2.closed
+
+
+def test_dataset_pool_replaced(raster):
+    pool = DatasetPool(size=4)
+
+    with pool.open(raster) as ds1:
+        pass
+
+    tmp = f'{raster}.tmp'
+    write_raster(tmp, 2)
+    os.replace(tmp, raster)
+
+    with pool.open(raster) as ds2:
+        assert ds2 is not ds1
+        assert ds2.read(1)[0, 0] == 2
+
+    assert ds1.closed
+
+
+def test_dataset_pool_size(raster):
+    pool = DatasetPool(size=1)
+
+    with pool.open(raster) as ds1:
+        with pool.open(raster) as ds2:
+            pass
+
+    assert ds1.closed != ds2.closed
@@ -0,0 +1,192 @@
+# =================================================================
+#
+# Author: Etienne <etienne.pelletier@canada.ca>
+#
+# Copyright (c) 2023 Etienne Pelletier
+# Copyright (c) 2022 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import json
+import threading
+import time
+
+from elastic_transport import JsonSerializer
+from elasticsearch import Elasticsearch
+
+from msc_pygeoapi.connector import elasticsearch_
+from msc_pygeoapi.connector.elasticsearch_ import (ElasticsearchConnector,
+                                                   chunk_actions,
+                                                   get_action_size,
+                                                   serialize_action)
+
+
+class FakeBulkClient:
+    """bulk API stub rejecting (HTTP 429) actions a number of times"""
+
+    def __init__(self, rejects={}, event=None):
+        self.rejects = dict(rejects)
+        self.event = event
+        self.requests = []
+
+    def bulk(self, operations, refresh=False):
+        if self.event is not None:
+            self.event.wait(5)
+
+        headers = [json.loads(line) for line in operations[::2]]
+        ids = [header['index']['_id'] for header in headers]
+        self.requests.append(ids)
+
+        items = []
+        for id_ in ids:
+            if self.rejects.get(id_, 0) > 0:
+                self.rejects[id_] -= 1
+                items.append({'index': {'_id': id_, 'status': 429}})
+            else:
+                items.append({'index': {'_id': id_, 'status': 201,
+                                        'result': 'created'}})
+
+        return {'items': items}
+
+
+def serialize(actions):
+    return [serialize_action(action, JsonSerializer()) for action in actions]
+
+
+def get_connector(monkeypatch, client):
+    monkeypatch.setattr(Elasticsearch, 'options', lambda self, **kw: client)
+
+    return ElasticsearchConnector({'url': 'http://localhost:9200'})
+
+
+def get_actions(count):
+    return [{'_index': 'test', '_id': i, 'value': i} for i in range(count)]
+
+
+def test_chunk_actions_docs():
+    actions = serialize({'_id': i} for i in range(5))
+
+    chunks = list(chunk_actions(actions, 2, 1024))
+
+    assert chunks == [actions[0:2], actions[2:4], actions[4:5]]
+
+
+def test_chunk_actions_bytes():
+    actions = serialize({'_id': i, 'value': 'x' * 100} for i in range(5))
+    size = get_action_size(actions[0])
+
+    chunks = list(chunk_actions(iter(actions), 100, size * 2 + 1))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_chunk_actions_large():
+    # an action larger than max_bytes gets its own chunk
+    actions = serialize([{'_id': 0}, {'_id': 1, 'value': 'x' * 100},
+                         {'_id': 2}])
+
+    chunks = list(chunk_actions(actions, 100, 50))
+
+    assert chunks == [[actions[0]], [actions[1]], [actions[2]]]
+    assert list(chunk_actions([], 100, 50)) == []
+
+
+def test_parallel_bulk_order(monkeypatch):
+    # rejected actions are retried without changing the result order
+    client = FakeBulkClient(rejects={0: 1, 5: 2})
+    conn = get_connector(monkeypatch, client)
+    monkeypatch.setattr(elasticsearch_.time, 'sleep', lambda delay: None)
+
+    results = list(conn._parallel_bulk(get_actions(10), 3, 2))
+
+    assert [response['index']['_id'] for ok, response in results] == \
+        list(range(10))
+    assert all(ok for ok, response in results)
+
+
+def test_parallel_bulk_backoff(monkeypatch):
+    client = FakeBulkClient(rejects={1: 5})
+    conn = get_connector(monkeypatch, client)
+    delays = []
+    monkeypatch.setattr(elasticsearch_.time, 'sleep', delays.append)
+    monkeypatch.setattr(elasticsearch_, 'MSC_PYGEOAPI_ES_BULK_MAX_RETRIES', 3)
+    monkeypatch.setattr(elasticsearch_,
+                        'MSC_PYGEOAPI_ES_BULK_INITIAL_BACKOFF', 2)
+    monkeypatch.setattr(elasticsearch_, 'MSC_PYGEOAPI_ES_BULK_MAX_BACKOFF', 5)
+
+    results = list(conn._parallel_bulk(get_actions(3), 3, 2))
+
+    # only the rejected action is resent, until retries are exhausted
+    assert client.requests == [[0, 1, 2], [1], [1], [1]]
+    assert delays == [2, 4, 5]
+    assert [ok for ok, response in results] == [True, False, True]
+    assert results[1][1]['index']['status'] == 429
+
+
+def test_parallel_bulk_backpressure(monkeypatch):
+    event = threading.Event()
+    conn = get_connector(monkeypatch, FakeBulkClient(event=event))
+    pulled = []
+
+    def package():
+        for action in get_actions(20):
+            pulled.append(action['_id'])
+            yield action
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.extend(conn._parallel_bulk(package(), 1, 2))
+    )
+    thread.start()
+    time.sleep(0.2)
+
+    # 2 chunks in flight, 1 waiting and 1 action read ahead by the chunker
+    assert len(pulled) == 4
+
+    event.set()
+    thread.join()
+
+    assert len(pulled) == 20
+    assert [response['index']['_id'] for ok, response in results] == \
+        list(range(20))
+
+
+def test_bulk_sink_order(monkeypatch):
+    # a retried action is reported to its own package
+    client = FakeBulkClient(rejects={'a1': 5})
+    conn = get_connector(monkeypatch, client)
+    monkeypatch.setattr(elasticsearch_.time, 'sleep', lambda delay: None)
+    sink = elasticsearch_.ElasticsearchBulkSink(conn, max_docs=100,
+                                                max_wait=60)
+
+    packages = {
+        key: [{'_index': 'test', '_id': f'{key}{i}'} for i in range(2)]
+        for key in ['a', 'b', 'c']
+    }
+    futures = {key: sink.submit(package, key)
+               for key, package in packages.items()}
+
+    assert sink.close() is False
+    assert {key: future.result() for key, future in futures.items()} == \
+        {'a': False, 'b': True, 'c': True}
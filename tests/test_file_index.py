@@ -0,0 +1,87 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import pytest
+
+from msc_pygeoapi.provider.file_index import FileIndex
+
+KEY_REGEX = '.*_(\\d{10})_000.grib2'
+
+
+@pytest.fixture
+def root(tmp_path):
+    for date in ['2024010100', '2024010112', '2024010200']:
+        run_dir = tmp_path / date[:8]
+        run_dir.mkdir(exist_ok=True)
+        for res in ['ps10km', 'ps15km']:
+            (run_dir / f'RDPA_{res}_{date}_000.grib2').touch()
+
+    return tmp_path
+
+
+def test_file_index_find(root):
+    index = FileIndex(root, 1, '*.grib2', KEY_REGEX)
+
+    assert len(index.files()) == 6
+    assert index.find('2024010112') == str(
+        root / '20240101' / 'RDPA_ps10km_2024010112_000.grib2')
+
+    with pytest.raises(IndexError):
+        index.find('2024010106')
+
+
+def test_file_index_range(root):
+    index = FileIndex(root, 1, '*.grib2', KEY_REGEX)
+
+    files = index.range('2024010100', '2024010200')
+
+    assert [f.split('/')[-1] for f in files] == [
+        'RDPA_ps10km_2024010100_000.grib2',
+        'RDPA_ps10km_2024010112_000.grib2',
+        'RDPA_ps10km_2024010200_000.grib2'
+    ]
+
+    with pytest.raises(IndexError):
+        index.range('2024010100', '2024010106')
+
+
+def test_file_index_reload(root):
+    index = FileIndex(root, 1, '*.grib2', KEY_REGEX)
+    index.refresh()
+
+    run_dir = root / '20240102'
+    (run_dir / 'RDPA_ps10km_2024010212_000.grib2').touch()
+
+    with pytest.raises(IndexError):
+        index.find('2024010212')
+
+    index.reload()
+
+    assert index.find('2024010212') == str(
+        run_dir / 'RDPA_ps10km_2024010212_000.grib2')
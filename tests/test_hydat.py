@@ -34,12 +34,69 @@ from random import randrange
 import pytest
 import requests
 
+from msc_pygeoapi.loader.hydat import HydatLoader
+
 
 @pytest.fixture()
 def url(pytestconfig):
     return pytestconfig.getoption('url')
 
 
+def test_loader_unpivot_obs():
+    """Test unpivoting monthly rows of daily discharge into daily obs"""
+
+    keys = ['STATION_NUMBER', 'YEAR', 'MONTH', 'NO_DAYS', 'MONTHLY_MEAN']
+    keys += [f'FLOW{i}' for i in range(1, 32)]
+    keys += [f'FLOW_SYMBOL{i}' for i in range(1, 32)]
+
+    flows = [float(i) for i in range(1, 30)] + [None, None]
+    flows[4] = None
+    flags = ['B', float('nan'), ' '] + [None] * 28
+
+    obs = [
+        ('01AA002', 2020, 2, 29, 15.0, *flows, *flags),
+        ('01AA002', 2020, 3, 0, None, *[None] * 62)
+    ]
+    symbols = {'B': ('Backwater', 'Remous')}
+
+    daily, monthly = HydatLoader.unpivot_obs(None, obs, keys, symbols)
+
+    assert len(daily) == 29
+    assert daily[0] == {
+        'STATION_NUMBER': '01AA002',
+        'DATE': '2020-02-01',
+        'DISCHARGE': 1.0,
+        'IDENTIFIER': '01AA002.2020-02-01',
+        'DISCHARGE_SYMBOL_EN': 'Backwater',
+        'DISCHARGE_SYMBOL_FR': 'Remous'
+    }
+    assert daily[1]['DISCHARGE_SYMBOL_EN'] is None
+    assert daily[2]['DISCHARGE_SYMBOL_FR'] is None
+    assert daily[4]['DISCHARGE'] is None
+    assert daily[-1]['DATE'] == '2020-02-29'
+
+    assert monthly == [{
+        'DATE': '2020-02',
+        'IDENTIFIER': '01AA002.2020-02',
+        'MONTHLY_MEAN_DISCHARGE': 15.0
+    }]
+
+
+def test_loader_merge_obs():
+    """Test merging discharge and level rows grouped by station"""
+
+    discharge = iter([('01AA002', ['d1']), ('01AD003', ['d2'])])
+    level = iter([('01AA002', ['l1']), ('01AB001', ['l2'])])
+
+    merged = list(HydatLoader.merge_obs(None, discharge, level))
+
+    assert merged == [
+        ('01AA002', ['d1'], ['l1']),
+        ('01AB001', [], ['l2']),
+        ('01AD003', ['d2'], [])
+    ]
+
+
 def test_api(url):
     """Test suite for hydat data API queries"""
 
@@ -0,0 +1,104 @@
+# =================================================================
+#
+# Author: Thinesh Sornalingam <thinesh.sornalingam@canada.ca>,
+#         Robert Westhaver <robert.westhaver.eccc@gccollaboration.ca>,
+#         Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2020 Thinesh Sornalingam
+# Copyright (c) 2020 Robert Westhaver
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+
+from concurrent.futures import Future
+
+import pytest
+
+from msc_pygeoapi.handler import pool
+
+
+PENDING = {}
+
+
+class FakeHandler:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.status = None
+
+    def handle(self):
+        if 'bad' in self.filepath:
+            raise RuntimeError('Plugin not found')
+        if 'buffered' in self.filepath:
+            self.status = PENDING[self.filepath] = Future()
+        return True
+
+
+@pytest.fixture(autouse=True)
+def fake_handler(monkeypatch):
+    monkeypatch.setattr(pool, 'CoreHandler', FakeHandler)
+
+
+def test_dispatcher_inline():
+    """Test inline loads raise their errors"""
+
+    dispatcher = pool.LoaderDispatcher(workers=0)
+
+    assert dispatcher.dispatch('good.xml')
+
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch('bad.xml')
+
+    assert dispatcher.stop() == []
+
+
+def test_dispatcher_pool():
+    """Test failures of queued loads are reported on stop"""
+
+    dispatcher = pool.LoaderDispatcher(workers=2, pool_type='thread')
+
+    for filepath in ['good1.xml', 'bad1.xml', 'good2.xml', 'bad2.xml']:
+        assert dispatcher.dispatch(filepath)
+
+    assert sorted(dispatcher.stop()) == ['bad1.xml', 'bad2.xml']
+
+
+def test_loader_pool_invalid():
+    """Test invalid pool settings"""
+
+    with pytest.raises(ValueError):
+        pool.LoaderPool(workers=0)
+
+    with pytest.raises(ValueError):
+        pool.LoaderPool(workers=1, pool_type='fork')
+
+
+def test_dispatcher_buffered():
+    """Test failures of actions buffered in a bulk sink are reported"""
+
+    dispatcher = pool.LoaderDispatcher(workers=0)
+
+    for filepath in ['buffered1.xml', 'buffered2.xml']:
+        assert dispatcher.dispatch(filepath)
+
+    PENDING['buffered1.xml'].set_result(True)
+    PENDING['buffered2.xml'].set_result(False)
+
+    assert dispatcher.stop() == ['buffered2.xml']
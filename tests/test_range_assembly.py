@@ -0,0 +1,100 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from msc_pygeoapi.provider.range_assembly import (get_range_dataset,
+                                                  get_range_window,
+                                                  read_range)
+
+TRANSFORM = from_origin(-140, 80, 1, 1)
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = []
+    for i in range(3):
+        path = str(tmp_path / f'CANGRD_hist_annual_anom_ps50km_TMEAN_195{i}.tif')  # noqa
+        with rasterio.open(path, 'w', driver='GTiff', width=30, height=20,
+                           count=1, dtype='float32', crs='EPSG:4326',
+                           transform=TRANSFORM, nodata=-999) as ds:
+            values = np.full((1, 20, 30), i, dtype='float32')
+            values[0, 5, 5] = -999
+            ds.write(values)
+        files.append(path)
+
+    return files
+
+
+def test_read_range(files):
+    shapes = [{
+        'type': 'Polygon',
+        'coordinates': [[
+            [-136, 76], [-136, 72], [-132, 72], [-132, 76], [-136, 76]
+        ]]
+    }]
+
+    with rasterio.open(files[0]) as dataset:
+        shape_mask, transform, window = get_range_window(dataset, shapes)
+        values = read_range(dataset, files, 1, window, shape_mask)
+
+    assert values.shape == (3, 4, 4)
+    assert transform == from_origin(-136, 76, 1, 1)
+    assert values[:, 0, 0].tolist() == [0, 1, 2]
+    # nodata pixel
+    assert values.mask[:, 1, 1].tolist() == [True, True, True]
+    assert values.count() == 3 * 15
+
+
+def test_range_dataset_time():
+    values = np.ma.masked_equal(np.zeros((2, 2, 3), dtype='float32'), 1)
+    times = ['2024-01-01T12:00:00Z', '2024-01-02T12:00:00Z']
+
+    data = get_range_dataset('APCP', values, times, TRANSFORM, 'EPSG:4326',
+                             {'units': 'mm'})
+
+    assert np.array_equal(data['time'].values, np.array(
+        ['2024-01-01T12:00:00', '2024-01-02T12:00:00'],
+        dtype='datetime64[ns]'))
+    assert data['APCP'].dims == ('time', 'y', 'x')
+    assert data['APCP'].attrs == {'units': 'mm', 'grid_mapping': 'crs'}
+    assert data['x'].values.tolist() == [-139.5, -138.5, -137.5]
+    assert data['y'].values.tolist() == [79.5, 78.5]
+
+
+def test_read_range_max_values(files):
+    with rasterio.open(files[0]) as dataset:
+        assert read_range(dataset, files, max_values=3 * 20 * 30).shape == (
+            3, 20, 30)
+
+        with pytest.raises(ValueError):
+            read_range(dataset, files, max_values=3 * 20 * 30 - 1)
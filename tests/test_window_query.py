@@ -0,0 +1,74 @@
+# =================================================================
+#
+# Author: Tom Kralidis <tom.kralidis@ec.gc.ca>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import numpy as np
+import pytest
+from rasterio.transform import from_origin
+from rasterio.windows import Window
+
+from msc_pygeoapi.provider.window_query import gen_covjson_series, get_window
+
+TRANSFORM = from_origin(-140, 80, 1, 1)
+
+
+def test_get_window():
+    assert get_window(TRANSFORM, 30, 20, [-130.3], [70.2]) == Window(
+        9, 9, 1, 1)
+    assert get_window(TRANSFORM, 30, 20, [-130.3, -128.1],
+                      [70.2, 69.1]) == Window(9, 9, 3, 2)
+
+    # larger than max_pixels
+    assert get_window(TRANSFORM, 30, 20, [-135, -125], [75, 65]) is None
+
+    with pytest.raises(ValueError):
+        get_window(TRANSFORM, 30, 20, [10], [10])
+
+
+def test_gen_covjson_series():
+    values = np.ma.masked_equal(
+        np.array([[[1., -999.]], [[3., 4.]]], dtype='float32'), -999.)
+    times = ['2024-01-01T00:00:00Z', '2024-01-01T06:00:00Z']
+
+    cj = gen_covjson_series({'APCP': {'type': 'Parameter'}},
+                            {'type': 'GeographicCRS'}, [0, 0, 2, 1],
+                            times, values)
+
+    assert cj['domain']['domainType'] == 'Grid'
+    assert cj['domain']['axes']['t'] == {'values': times}
+    assert cj['ranges']['APCP']['axisNames'] == ['t', 'y', 'x']
+    assert cj['ranges']['APCP']['shape'] == [2, 1, 2]
+    assert cj['ranges']['APCP']['values'] == [1., None, 3., 4.]
+
+    # a single pixel keeps the grid layout
+    cj = gen_covjson_series({'APCP': {'type': 'Parameter'}},
+                            {'type': 'GeographicCRS'}, [0, 0, 1, 1],
+                            times, values[:, :, :1])
+
+    assert cj['domain']['domainType'] == 'Grid'
+    assert cj['ranges']['APCP']['shape'] == [2, 1, 1]